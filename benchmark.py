@@ -0,0 +1,206 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Optional, Sequence
+
+from clock import VirtualClock
+from fixture_server import FixtureConfig, start_server
+from linkedin_matcher import process_linkedin_profiles
+
+logger = logging.getLogger(__name__)
+
+
+def write_benchmark_input(file_path: str, records: int, duplicate_rate: float = 0.0):
+    """
+    Write a synthetic input CSV.
+
+    Args:
+        file_path: Path of the CSV to create
+        records: Number of rows
+        duplicate_rate: Fraction of rows that repeat an earlier row
+    """
+    with open(file_path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Email", "Name"])
+        for index in range(records):
+            source = int(index * (1 - duplicate_rate)) if duplicate_rate else index
+            writer.writerow([f"person{source}@company{source % 7}.com", f"Person {source} Example"])
+
+
+def run_benchmark(records: int = 20, fixture_config: Optional[FixtureConfig] = None, headless: bool = True,
+                  extraction_mode: str = "script", duplicate_rate: float = 0.0,
+                  work_dir: Optional[str] = None, session_dir: Optional[str] = None, lean: bool = False,
+                  trace_file: Optional[str] = None) -> Dict:
+    """
+    Run process_linkedin_profiles end to end against the local stand-in server.
+
+    The rate limiter runs on a virtual clock, so its waits are counted but not
+    slept; records per hour therefore reflect the rate budget plus the real
+    browser and parsing work.
+
+    Args:
+        records: Number of input rows
+        fixture_config: Stand-in server behaviour
+        headless: Whether to run Chrome headless
+        extraction_mode: Page extraction strategy, see LinkedInMatcher
+        duplicate_rate: Fraction of input rows that repeat an earlier row
+        work_dir: Directory for input, output and cache files (a temporary one by default)
+        session_dir: Session directory to reuse between benchmark runs, to measure
+            warm startup (a fresh one inside the work directory by default)
+        lean: Run the matcher in lean page-load mode
+        trace_file: Path to write a Chrome trace of the run to
+
+    Returns:
+        Run summary from process_linkedin_profiles plus throughput figures
+    """
+    server = start_server(fixture_config)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    clock = VirtualClock()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = work_dir or temp_dir
+        input_file = os.path.join(directory, "benchmark_input.csv")
+        output_file = os.path.join(directory, "benchmark_results.csv")
+        write_benchmark_input(input_file, records, duplicate_rate)
+
+        os.environ.setdefault("LINKEDIN_EMAIL", "benchmark@example.com")
+        os.environ.setdefault("LINKEDIN_PASSWORD", "benchmark")
+
+        start_time = clock.time()
+        wall_start = time.perf_counter()
+        try:
+            summary = process_linkedin_profiles(
+                input_file, output_file, cache_file=None, extraction_mode=extraction_mode,
+                session_dir=session_dir or os.path.join(directory, "session"), trace_file=trace_file,
+                matcher_options={"headless": headless, "base_url": base_url, "clock": clock,
+                                 "lean": lean, "measure_transfer": True}
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+        elapsed = clock.time() - start_time
+        wall_elapsed = time.perf_counter() - wall_start
+
+    rows = summary.get("rows_written", 0)
+    summary["elapsed_seconds"] = elapsed
+    summary["wall_seconds"] = wall_elapsed
+    summary["records_per_hour"] = rows / elapsed * 3600 if elapsed else 0.0
+    summary["page_loads_per_record"] = summary.get("page_loads", 0) / rows if rows else 0.0
+    summary["server_requests"] = dict(server.RequestHandlerClass.counters)
+    return summary
+
+
+# Modules timed by --imports: the light core, the matcher entry point and the browser layer
+IMPORT_BENCHMARK_MODULES = ("matcher_io", "linkedin_matcher", "linkedin_browser")
+
+
+def measure_import(module: str, repeats: int = 5) -> Dict:
+    """
+    Time importing a module in fresh interpreters with python -X importtime.
+
+    Args:
+        module: Module name
+        repeats: Interpreters to start; the median is reported
+
+    Returns:
+        Dictionary with the median import seconds and whether Selenium was loaded
+    """
+    timings = []
+    loads_selenium = False
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import sys, {module}; print('selenium' in sys.modules)"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        loads_selenium = result.stdout.strip() == "True"
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                timings.append(int(fields[1]) / 1e6)
+    return {"seconds": statistics.median(timings), "loads_selenium": loads_selenium}
+
+
+def run_import_benchmark(modules: Sequence[str] = IMPORT_BENCHMARK_MODULES, repeats: int = 5) -> Dict[str, Dict]:
+    """Measure the import time of each module, see measure_import."""
+    return {module: measure_import(module, repeats) for module in modules}
+
+
+def format_import_report(results: Dict[str, Dict]) -> str:
+    """Render import benchmark results as a readable report."""
+    return "\n".join(
+        f"{module:<20} {result['seconds'] * 1000:7.1f} ms  "
+        f"({'loads' if result['loads_selenium'] else 'without'} Selenium)"
+        for module, result in results.items()
+    )
+
+
+def format_report(summary: Dict) -> str:
+    """Render a benchmark summary as a readable report."""
+    lines = [
+        f"Records written:        {summary.get('rows_written', 0)}",
+        f"Time to first search:   {summary.get('startup', {}).get('time_to_first_search', 0):.1f}s",
+        f"Searches:               {summary.get('searches', 0)}",
+        f"Elapsed (virtual):      {summary.get('elapsed_seconds', 0):.1f}s "
+        f"(wall {summary.get('wall_seconds', 0):.1f}s)",
+        f"Records per hour:       {summary.get('records_per_hour', 0):.0f}",
+        f"Page loads per record:  {summary.get('page_loads_per_record', 0):.2f}",
+        f"Bytes per page:         {summary.get('transfer_bytes', {}).get('mean', 0):.0f}",
+        "Per-stage latency (count / mean / total):"
+    ]
+    stages = {
+        "rate_limit_wait": summary.get("rate_limit_wait"),
+        "navigation": summary.get("navigation"),
+        **{f"readiness:{label}": timing for label, timing in summary.get("readiness", {}).items()},
+        **{f"extraction:{label}": timing for label, timing in summary.get("extraction", {}).items()}
+    }
+    for stage, timing in stages.items():
+        if timing:
+            lines.append(f"  {stage:<28} {timing['count']:>5} / {timing['mean']:.3f}s / {timing['total']:.1f}s")
+    lines.append(f"Server requests:        {json.dumps(summary.get('server_requests', {}))}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the matcher against a local LinkedIn stand-in")
+    parser.add_argument("--records", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Server latency per response in seconds")
+    parser.add_argument("--private-rate", type=float, default=0.1)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--empty-rate", type=float, default=0.1)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--extraction-mode", default="script", choices=["script", "html", "elements"])
+    parser.add_argument("--session-dir", help="Reuse this session directory to measure warm startup")
+    parser.add_argument("--lean", action="store_true", help="Block images, media, fonts and trackers")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome trace of the run")
+    parser.add_argument("--show-browser", action="store_true", help="Run Chrome with a visible window")
+    parser.add_argument("--json", action="store_true", help="Print the raw summary as JSON")
+    parser.add_argument("--imports", action="store_true", help="Only measure module import times")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.imports:
+        imports = run_import_benchmark()
+        print(json.dumps(imports, indent=2) if args.json else format_import_report(imports))
+        sys.exit(0)
+
+    result = run_benchmark(
+        records=args.records,
+        fixture_config=FixtureConfig(latency=args.latency, private_rate=args.private_rate,
+                                     failure_rate=args.failure_rate, empty_rate=args.empty_rate),
+        headless=not args.show_browser,
+        extraction_mode=args.extraction_mode,
+        duplicate_rate=args.duplicate_rate,
+        session_dir=args.session_dir,
+        lean=args.lean,
+        trace_file=args.trace
+    )
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
@@ -0,0 +1,343 @@
+import csv
+import hashlib
+import logging
+import os
+import sqlite3
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of leading input bytes hashed to recognize the same input file on resume
+FINGERPRINT_BYTES = 4096
+
+# Number of committed output bytes, ending at the commit marker, hashed to recognize the same output file
+TAIL_FINGERPRINT_BYTES = 4096
+
+
+def hash_email(email: str) -> bytes:
+    """
+    Hash an email address for the processed-email index.
+
+    Args:
+        email: Email address as written to the output file
+
+    Returns:
+        Compact 8-byte digest
+    """
+    return hashlib.blake2b(email.strip().encode('utf-8'), digest_size=8).digest()
+
+
+def fingerprint_file(file_path: str, length: int) -> str:
+    """
+    Hash the first bytes of a file.
+
+    Args:
+        file_path: Path to the file
+        length: Number of leading bytes to hash
+
+    Returns:
+        Hex digest of the leading bytes
+    """
+    with open(file_path, 'rb') as file:
+        return hashlib.blake2b(file.read(length), digest_size=16).hexdigest()
+
+
+def fingerprint_tail(file_path: str, end: int) -> str:
+    """
+    Hash the bytes of a file just before an offset.
+
+    Args:
+        file_path: Path to the file
+        end: Offset the hashed bytes end at
+
+    Returns:
+        Hex digest of up to TAIL_FINGERPRINT_BYTES bytes ending at end, or ""
+        when the file is shorter than end or the bytes do not end a line
+    """
+    start = max(0, end - TAIL_FINGERPRINT_BYTES)
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        tail = file.read(end - start)
+    if len(tail) < end - start or (tail and not tail.endswith(b'\n')):
+        return ""
+    return hashlib.blake2b(tail, digest_size=16).hexdigest()
+
+
+class ResumeCheckpoint:
+    def __init__(self, output_file: str, input_file: str):
+        """
+        Open the sidecar checkpoint that lets a run resume in constant time.
+
+        The checkpoint lives next to the output file as '<output>.ckpt'. It
+        stores the input byte offset and row number reached so far, the size of
+        the output file at that point, and a hashed index of processed emails,
+        so resuming does not need to rescan the output CSV. The committed output
+        size and a hash of the bytes just before it form the commit marker:
+        anything past a matching marker is discarded on open, while an output
+        file that no longer matches it (rewritten or replaced since) gets its
+        index rebuilt instead.
+
+        Args:
+            output_file: Path to the output CSV file (must already exist)
+            input_file: Path to the input CSV file being processed
+        """
+        self.output_file = output_file
+        self.input_file = input_file
+        self.path = f"{output_file}.ckpt"
+
+        is_new = not os.path.exists(self.path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS processed ("
+            "email_hash BLOB PRIMARY KEY, "
+            "run INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self.connection.commit()
+
+        output_size = self._get_meta("output_size")
+        if is_new or output_size is None:
+            # Missing sidecar: build the index once
+            self._rebuild()
+        elif not self._marker_matches(int(output_size)):
+            logger.warning(f"{output_file} changed since the last checkpoint; rebuilding the resume index")
+            self._rebuild()
+        else:
+            self._discard_uncommitted(int(output_size))
+
+        self.input_offset, self.row_number = self._resume_position()
+
+        # Emails written by this run stay eligible so duplicate rows still get their fan-out rows
+        self.run = self.connection.execute("SELECT COALESCE(MAX(run), 0) + 1 FROM processed").fetchone()[0]
+
+    def __contains__(self, email: str) -> bool:
+        """Check whether an email was written to the output file by an earlier run."""
+        row = self.connection.execute(
+            "SELECT 1 FROM processed WHERE email_hash = ? AND run < ?", (hash_email(email), self.run)
+        ).fetchone()
+        return row is not None
+
+    def processed_count(self) -> int:
+        """Number of distinct processed emails, including those written by this run."""
+        return self.connection.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+
+    def commit(self, emails: Iterable[str], input_offset: int, row_number: int, output_size: int):
+        """
+        Record newly written rows and the input position they correspond to.
+
+        Must be called only after the rows are written to the output file.
+
+        Args:
+            emails: Emails of the rows just written
+            input_offset: Input byte offset just past the last consumed row
+            row_number: Input row number of the last consumed row
+            output_size: Size of the output file after the write
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO processed (email_hash, run) VALUES (?, ?)",
+                [(hash_email(email), self.run) for email in emails]
+            )
+            self._set_meta("input_offset", input_offset)
+            self._set_meta("row_number", row_number)
+            self._set_meta("output_size", output_size)
+            self._set_meta("output_tail", fingerprint_tail(self.output_file, output_size))
+            if input_offset and self._get_meta("input_fingerprint_length") is None:
+                length = min(FINGERPRINT_BYTES, os.path.getsize(self.input_file))
+                self._set_meta("input_fingerprint_length", length)
+                self._set_meta("input_fingerprint", fingerprint_file(self.input_file, length))
+        self.input_offset = input_offset
+        self.row_number = row_number
+
+    def close(self):
+        """Close the checkpoint database."""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _marker_matches(self, output_size: int) -> bool:
+        """
+        Check that the output file still holds the committed bytes.
+
+        Args:
+            output_size: Output file size recorded by the last commit
+
+        Returns:
+            True if the file is at least that long and the bytes before that
+            size hash to the recorded tail fingerprint
+        """
+        if os.path.getsize(self.output_file) < output_size:
+            return False
+        tail = fingerprint_tail(self.output_file, output_size)
+        return bool(tail) and tail == self._get_meta("output_tail")
+
+    def _resume_position(self) -> tuple:
+        """
+        Return the stored input position if it still belongs to the same input file.
+
+        Returns:
+            Tuple of (input byte offset, row number), or (0, 1) to start over
+        """
+        offset = int(self._get_meta("input_offset") or 0)
+        row_number = int(self._get_meta("row_number") or 1)
+        if not offset or not os.path.exists(self.input_file):
+            return 0, 1
+
+        length = self._get_meta("input_fingerprint_length")
+        input_size = os.path.getsize(self.input_file)
+        if (length is None or input_size < offset or
+                fingerprint_file(self.input_file, int(length)) != self._get_meta("input_fingerprint")):
+            logger.info("Input file changed since the last checkpoint; rescanning it from the start")
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM meta WHERE key IN "
+                    "('input_offset', 'row_number', 'input_fingerprint', 'input_fingerprint_length')"
+                )
+            return 0, 1
+
+        logger.info(f"Resuming input at row {row_number} (byte offset {offset})")
+        return offset, row_number
+
+    def _truncate_torn_line(self, start: int) -> bytes:
+        """
+        Cut off a partially written final line and return the complete tail.
+
+        Args:
+            start: Output byte offset to read the tail from
+
+        Returns:
+            Bytes of the complete lines from start to the end of the file
+        """
+        with open(self.output_file, 'rb+') as file:
+            file.seek(start)
+            tail = file.read()
+            complete = tail[:tail.rfind(b'\n') + 1]
+            if len(complete) < len(tail):
+                logger.warning(f"Repairing torn final line in {self.output_file} "
+                               f"({len(tail) - len(complete)} bytes removed)")
+                file.truncate(start + len(complete))
+        return complete
+
+    def _discard_uncommitted(self, output_size: int):
+        """
+        Truncate output written after the last commit marker.
+
+        Rows past the committed size may be partial, or may not have reached the
+        disk, so they are dropped. The commit marker was checked first, so the
+        cut falls on the end of the last committed row. The stored input offset
+        still points before them, so those rows are simply processed again.
+
+        Args:
+            output_size: Output file size recorded by the last commit
+        """
+        current_size = os.path.getsize(self.output_file)
+        if current_size > output_size:
+            logger.warning(f"Discarding {current_size - output_size} uncommitted bytes "
+                           f"at the end of {self.output_file}")
+            with open(self.output_file, 'rb+') as file:
+                file.truncate(output_size)
+
+    def _rebuild(self):
+        """Rebuild the processed-email index from the full output file."""
+        logger.info(f"Building resume checkpoint from {self.output_file}")
+        self._truncate_torn_line(0)
+        with self.connection:
+            self.connection.execute("DELETE FROM processed")
+            self.connection.execute("DELETE FROM meta")
+            with open(self.output_file, 'r', newline='', encoding='utf-8') as file:
+                reader = csv.DictReader(file)
+                batch = []
+                for row in reader:
+                    if row.get('Email'):
+                        batch.append((hash_email(row['Email']),))
+                    if len(batch) >= 10000:
+                        self.connection.executemany("INSERT OR IGNORE INTO processed (email_hash) VALUES (?)", batch)
+                        batch = []
+                self.connection.executemany("INSERT OR IGNORE INTO processed (email_hash) VALUES (?)", batch)
+            output_size = os.path.getsize(self.output_file)
+            self._set_meta("output_size", output_size)
+            self._set_meta("output_tail", fingerprint_tail(self.output_file, output_size))
+        logger.info(f"Found {self.processed_count()} already processed emails")
+
+
+def _read_commit_marker(output_file: str) -> Optional[tuple]:
+    path = f"{output_file}.ckpt"
+    if not os.path.exists(path):
+        return None
+    connection = sqlite3.connect(path)
+    try:
+        rows = dict(connection.execute("SELECT key, value FROM meta WHERE key IN ('output_size', 'output_tail')"))
+    except sqlite3.DatabaseError:
+        return None
+    finally:
+        connection.close()
+    if "output_size" not in rows:
+        return None
+    return int(rows["output_size"]), rows.get("output_tail")
+
+
+def is_fully_committed(output_file: str) -> bool:
+    """
+    Check whether a checkpoint exists and covers the whole output file.
+
+    Args:
+        output_file: Path to the output CSV file
+
+    Returns:
+        True if '<output>.ckpt' exists and its commit marker matches the end
+        of the file, i.e. there are no uncommitted rows
+    """
+    marker = _read_commit_marker(output_file)
+    if marker is None or not os.path.exists(output_file):
+        return False
+    output_size, tail = marker
+    return os.path.getsize(output_file) == output_size and bool(tail) and \
+        fingerprint_tail(output_file, output_size) == tail
+
+
+def recommit_output(output_file: str):
+    """
+    Move the commit marker to the end of an output file rewritten row for row.
+
+    Only valid when the file holds the same rows, for the same emails and in
+    the same order, as when the checkpoint last covered all of it (see
+    is_fully_committed), e.g. after confidence levels were recomputed in
+    place. The processed-email index and input position are kept.
+
+    Args:
+        output_file: Path to the rewritten output CSV file
+    """
+    output_size = os.path.getsize(output_file)
+    connection = sqlite3.connect(f"{output_file}.ckpt")
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("output_size", str(output_size)), ("output_tail", fingerprint_tail(output_file, output_size))]
+            )
+    finally:
+        connection.close()
+
+
+def discard_checkpoint(output_file: str):
+    """
+    Delete the checkpoint of an output file, so the next run rebuilds it.
+
+    Args:
+        output_file: Path to the output CSV file
+    """
+    for suffix in (".ckpt", ".ckpt-wal", ".ckpt-shm"):
+        if os.path.exists(output_file + suffix):
+            os.remove(output_file + suffix)
@@ -0,0 +1,34 @@
+import threading
+import time
+
+
+class SystemClock:
+    """Wall clock backed by time.time() and time.sleep()."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock:
+    def __init__(self):
+        """
+        Clock whose sleeps return immediately and advance virtual time instead.
+
+        time() is the real time plus everything slept so far, so durations
+        measured with it include both real work and skipped waits. Used by
+        benchmarks to run the matcher under its rate budget without waiting.
+        """
+        self.offset = 0.0
+        self.lock = threading.Lock()
+
+    def time(self) -> float:
+        return time.time() + self.offset
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            with self.lock:
+                self.offset += seconds
@@ -0,0 +1,285 @@
+import argparse
+import csv
+import logging
+import os
+import re
+import sqlite3
+import sys
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default location of the persisted company-to-domain table
+DEFAULT_COMPANY_INDEX_FILE = "company_domains.db"
+
+# Bytes of the table SQLite may memory-map; lookups read the mapped file
+# directly, so every process opening it shares the same page-cache pages
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Domains whose lookup result each process keeps in memory
+LOOKUP_CACHE_SIZE = 65536
+
+# Consumer mailbox providers: their domains say nothing about the employer
+FREE_MAIL_DOMAINS = frozenset({
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'yahoo.co.uk', 'yahoo.fr', 'ymail.com', 'rocketmail.com',
+    'hotmail.com', 'hotmail.co.uk', 'hotmail.fr', 'outlook.com', 'live.com', 'msn.com', 'passport.com',
+    'icloud.com', 'me.com', 'mac.com', 'aol.com', 'aim.com', 'protonmail.com', 'proton.me', 'pm.me',
+    'gmx.com', 'gmx.net', 'gmx.de', 'web.de', 't-online.de', 'mail.com', 'email.com', 'zoho.com',
+    'yandex.com', 'yandex.ru', 'mail.ru', 'inbox.ru', 'bk.ru', 'list.ru', 'qq.com', '163.com', '126.com',
+    'sina.com', 'naver.com', 'daum.net', 'hanmail.net', 'rediffmail.com', 'fastmail.com', 'fastmail.fm',
+    'tutanota.com', 'tuta.io', 'hey.com', 'orange.fr', 'free.fr', 'laposte.net', 'libero.it', 'virgilio.it',
+    'comcast.net', 'verizon.net', 'att.net', 'sbcglobal.net', 'bellsouth.net', 'cox.net', 'charter.net',
+    'btinternet.com', 'sky.com', 'shaw.ca', 'rogers.com', 'bigpond.com', 'optusnet.com.au', 'seznam.cz',
+    'wp.pl', 'o2.pl', 'interia.pl', 'uol.com.br', 'bol.com.br', 'terra.com.br'
+})
+
+COMPANY_SUFFIX_PATTERN = re.compile(r'\b(inc|llc|ltd|corp|corporation|company|co|group|holdings|technologies|tech)\b')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+
+@lru_cache(maxsize=65536)
+def company_key(company: str) -> str:
+    """
+    Normalize a company name for lookups: lowercase, without legal suffixes or punctuation.
+
+    Args:
+        company: Company name as shown on a profile
+
+    Returns:
+        Normalized name, e.g. "acme robotics" for "Acme Robotics, Inc."
+    """
+    if not company:
+        return ""
+    company_clean = COMPANY_SUFFIX_PATTERN.sub('', company.lower())
+    company_clean = PUNCTUATION_PATTERN.sub('', company_clean)
+    return ' '.join(company_clean.split())
+
+
+class DomainTrie:
+    def __init__(self):
+        """
+        Trie over domain labels from the top level down, so "eu.acme.com"
+        finds an entry for "acme.com" in one walk of its labels.
+        """
+        # Each node is [children by label, companies, free-mail flag]
+        self.root = [{}, frozenset(), False]
+
+    def _node(self, domain: str):
+        node = self.root
+        for label in reversed(domain.split('.')):
+            node = node[0].setdefault(label, [{}, frozenset(), False])
+        return node
+
+    def add_company(self, domain: str, key: str):
+        """Record that a company uses this domain."""
+        node = self._node(domain)
+        node[1] = node[1] | {key}
+
+    def add_free_mail(self, domain: str):
+        """Mark a domain, and its subdomains, as a consumer mailbox provider."""
+        self._node(domain)[2] = True
+
+    def lookup(self, domain: str) -> Tuple[bool, FrozenSet[str]]:
+        """
+        Find the most specific entry covering a domain.
+
+        Args:
+            domain: Lowercase email domain
+
+        Returns:
+            Tuple of (whether the domain is free mail, companies of the closest
+            registered parent domain)
+        """
+        node = self.root
+        companies = frozenset()
+        for label in reversed(domain.split('.')):
+            node = node[0].get(label)
+            if node is None:
+                break
+            if node[2]:
+                return True, frozenset()
+            if node[1]:
+                companies = node[1]
+        return False, companies
+
+
+class CompanyIndex:
+    def __init__(self, path: Optional[str] = None):
+        """
+        Company-to-domain index used for the domain matching signal.
+
+        Known mappings stay in a persisted SQLite table (see import_mappings),
+        opened read-only with memory-mapped I/O. Each lookup queries the
+        table's primary key for the domain and its parents, so processes
+        share the mapped file instead of each holding a copy of the table;
+        only recent lookups are cached per process. Free-mail domains are
+        built in and kept in a DomainTrie. Without a table only free-mail
+        detection and the name-based heuristic apply.
+
+        Args:
+            path: Path to the table, or None for free-mail detection only
+        """
+        self.path = path
+        self.trie = DomainTrie()
+        self.connection = None
+        for domain in FREE_MAIL_DOMAINS:
+            self.trie.add_free_mail(domain)
+        if path and os.path.exists(path):
+            self._open(path)
+        self.companies = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._query_companies)
+
+    def _open(self, path: str):
+        try:
+            self.connection = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True,
+                                              check_same_thread=False)
+            self.connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            # Fail now rather than on the first lookup if this is not an index file
+            self.connection.execute("SELECT 1 FROM company_domains LIMIT 1").fetchall()
+            logger.info(f"Opened company index {path}")
+        except Exception as e:
+            logger.error(f"Error loading company index {path}: {str(e)}")
+            raise
+
+    def _query_companies(self, domain: str) -> FrozenSet[str]:
+        if self.connection is None:
+            return frozenset()
+        labels = domain.split('.')
+        # The domain and each parent domain, most specific first
+        candidates = ['.'.join(labels[index:]) for index in range(len(labels))]
+        rows = self.connection.execute(
+            f"SELECT domain, company_key FROM company_domains WHERE domain IN ({', '.join('?' * len(candidates))})",
+            candidates
+        ).fetchall()
+        for candidate in candidates:
+            companies = frozenset(key for row_domain, key in rows if row_domain == candidate)
+            if companies:
+                return companies
+        return frozenset()
+
+    def close(self):
+        """Close the table."""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def is_free_mail(self, domain: str) -> bool:
+        """Whether a domain belongs to a consumer mailbox provider."""
+        return self.trie.lookup(domain)[0]
+
+    def domain_matches(self, email_domain: str, company: str) -> bool:
+        """
+        Check whether an email domain belongs to a company.
+
+        Free-mail domains never match. A domain matches the companies mapped
+        to it or to a parent domain, and otherwise any company whose first
+        word starts one of the domain's labels (e.g. "Acme Robotics" and
+        "eu.acmerobotics.com").
+
+        Args:
+            email_domain: Lowercase email domain
+            company: Company name as shown on a profile
+
+        Returns:
+            True if the domain matches the company
+        """
+        key = company_key(company)
+        if not email_domain or not key:
+            return False
+        if self.is_free_mail(email_domain):
+            return False
+        if key in self.companies(email_domain):
+            return True
+        hint = key.split()[0]
+        labels = email_domain.split('.')
+        return any(label.startswith(hint) for label in labels[:-1] or labels)
+
+
+def import_mappings(path: str, mappings: Iterable[Tuple[str, str]]) -> int:
+    """
+    Add company-to-domain mappings to the persisted table.
+
+    Args:
+        path: Path to the table (created if missing)
+        mappings: (company, domain) pairs
+
+    Returns:
+        Number of mappings added
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS company_domains ("
+            "domain TEXT NOT NULL, "
+            "company_key TEXT NOT NULL, "
+            "PRIMARY KEY (domain, company_key)) WITHOUT ROWID"
+        )
+        rows = ((domain.strip().lower().lstrip('@'), company_key(company)) for company, domain in mappings)
+        before = connection.total_changes
+        connection.executemany("INSERT OR IGNORE INTO company_domains VALUES (?, ?)",
+                               (row for row in rows if row[0] and row[1]))
+        connection.commit()
+        return connection.total_changes - before
+    finally:
+        connection.close()
+
+
+# Table used by get_company_index(); switched with use_company_index()
+_index_file = DEFAULT_COMPANY_INDEX_FILE
+
+
+def use_company_index(path: Optional[str]):
+    """
+    Select the table the shared index is loaded from.
+
+    Also used as a worker-process initializer, so rescoring workers load the
+    same table.
+
+    Args:
+        path: Path to the table, or None for free-mail detection only
+    """
+    global _index_file
+    _index_file = path
+    get_company_index.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_company_index() -> CompanyIndex:
+    """Return the shared index, loading it on first use in each process."""
+    return CompanyIndex(_index_file)
+
+
+def read_mappings_csv(file_path: str) -> Iterable[Tuple[str, str]]:
+    """
+    Read (company, domain) pairs from a CSV with Company and Domain columns.
+
+    Args:
+        file_path: Path to the CSV file
+
+    Yields:
+        (company, domain) pairs
+    """
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as file:
+        reader = csv.DictReader(file)
+        if not reader.fieldnames or 'Company' not in reader.fieldnames or 'Domain' not in reader.fieldnames:
+            raise ValueError("Mappings CSV must contain 'Company' and 'Domain' columns")
+        for row in reader:
+            yield row['Company'] or '', row['Domain'] or ''
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Build the company-to-email-domain index used for domain matching")
+    parser.add_argument("mappings", help="CSV with Company and Domain columns to add to the index")
+    parser.add_argument("--index", default=DEFAULT_COMPANY_INDEX_FILE, help="Index file to create or extend")
+    args = parser.parse_args()
+
+    try:
+        added = import_mappings(args.index, read_mappings_csv(args.mappings))
+        logger.info(f"Added {added} mappings to {args.index}")
+    except Exception as e:
+        logger.error(f"Import failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,304 @@
+import argparse
+import hashlib
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Names, titles and companies used to populate generated search results
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie"]
+LAST_NAMES = ["Smith", "Johnson", "Lee", "Brown", "Garcia", "Miller", "Davis", "Wilson"]
+TITLES = ["Product Manager", "Software Engineer", "Head of Product", "Sales Director", "Designer"]
+COMPANIES = ["Acme Inc", "Globex", "Initech", "Umbrella Corp", "Hooli"]
+
+
+class FixtureConfig:
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, results_per_page: int = 5,
+                 private_rate: float = 0.1, failure_rate: float = 0.0, empty_rate: float = 0.1,
+                 seed: int = 0, asset_bytes: int = 20000):
+        """
+        Behaviour of the LinkedIn stand-in server.
+
+        Args:
+            latency: Seconds added to every response
+            jitter: Maximum extra random seconds added to every response
+            results_per_page: Candidates shown per people search
+            private_rate: Fraction of profiles rendered as private
+            failure_rate: Fraction of searches answered without a results container
+                (the matcher sees a timeout)
+            empty_rate: Fraction of searches with no results
+            seed: Seed for the generated people, so runs are reproducible
+            asset_bytes: Size of each image, font and video response, so lean mode
+                savings show up in transfer sizes
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.results_per_page = results_per_page
+        self.private_rate = private_rate
+        self.failure_rate = failure_rate
+        self.empty_rate = empty_rate
+        self.seed = seed
+        self.asset_bytes = asset_bytes
+
+
+def stable_fraction(*parts: str) -> float:
+    """Map strings to a reproducible number in [0, 1)."""
+    digest = hashlib.blake2b('|'.join(parts).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2 ** 64
+
+
+# Subresources every page pulls in, like LinkedIn's fonts, hero video and analytics
+PAGE_ASSETS = (
+    "<link rel='preload' as='font' type='font/woff2' href='/static/font.woff2' crossorigin>"
+    "<style>@font-face { font-family: 'Fixture'; src: url('/static/font.woff2'); } "
+    "body { font-family: 'Fixture', sans-serif; }</style>"
+    "<script async src='/static/analytics.js?googletagmanager.com'></script>"
+)
+PAGE_FOOTER = "<video autoplay muted src='/static/promo.mp4'></video>"
+
+# Content type for each kind of static asset
+ASSET_TYPES = {
+    ".png": "image/png",
+    ".woff2": "font/woff2",
+    ".mp4": "video/mp4",
+    ".js": "application/javascript"
+}
+
+
+def render_page(title: str, body: str) -> bytes:
+    """Wrap a body in a minimal HTML document with the usual heavy subresources."""
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+            f"{PAGE_ASSETS}</head><body>{body}{PAGE_FOOTER}</body></html>").encode('utf-8')
+
+
+def search_candidates(keywords: str, config: FixtureConfig) -> List[Dict[str, str]]:
+    """
+    Generate the people shown for a search.
+
+    The first candidate usually matches the searched name and email domain,
+    the rest are random people, so ranking and confidence scoring have real
+    work to do.
+
+    Args:
+        keywords: Search keywords as sent by the matcher ("name email" or "email")
+        config: Server configuration
+
+    Returns:
+        List of candidates with slug, name, title and company
+    """
+    rng = random.Random(f"{config.seed}|{keywords}")
+    words = keywords.split()
+    email = next((word for word in words if '@' in word), "")
+    name = ' '.join(word for word in words if '@' not in word)
+    domain = email.split('@')[1].split('.')[0] if '@' in email else ""
+
+    candidates = []
+    for index in range(config.results_per_page):
+        if index == 0 and name:
+            candidate_name = name.title()
+            company = domain.title() if domain and rng.random() < 0.6 else rng.choice(COMPANIES)
+        else:
+            candidate_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            company = rng.choice(COMPANIES)
+        title = rng.choice(TITLES)
+        slug = f"{candidate_name.lower().replace(' ', '-')}-{rng.randrange(10 ** 6):06d}"
+        candidates.append({"slug": slug, "name": candidate_name, "title": title, "company": company})
+    return candidates
+
+
+def render_search_page(keywords: str, config: FixtureConfig) -> bytes:
+    """Render a people search results page with the selectors the matcher reads."""
+    if stable_fraction(str(config.seed), "fail", keywords) < config.failure_rate:
+        return render_page("Search", "<div class='search-unavailable'>Something went wrong</div>")
+    if stable_fraction(str(config.seed), "empty", keywords) < config.empty_rate:
+        return render_page("Search", "<div class='search-results-container'>"
+                                     "<div class='search-reusable-search-no-results artdeco-empty-state'>"
+                                     "No results found</div></div>")
+
+    items = []
+    for candidate in search_candidates(keywords, config):
+        href = f"/in/{candidate['slug']}/?miniProfileUrn=urn"
+        items.append(
+            "<li class='reusable-search__result-container'><div class='entity-result__item'>"
+            f"<a class='app-aware-link' href='{href}'><img src='/static/avatar.png' alt=''></a>"
+            "<div class='entity-result__content'>"
+            f"<span class='entity-result__title-text t-16'><a class='app-aware-link' href='{href}'>"
+            f"<span aria-hidden='true'>{html.escape(candidate['name'])}</span></a></span>"
+            f"<div class='entity-result__primary-subtitle'>"
+            f"{html.escape(candidate['title'])} at {html.escape(candidate['company'])}</div>"
+            "</div></div></li>"
+        )
+    return render_page("Search", f"<div class='search-results-container'><ul>{''.join(items)}</ul></div>")
+
+
+def render_profile_page(slug: str, config: FixtureConfig) -> bytes:
+    """Render a profile page, or the unavailable page for private profiles."""
+    if stable_fraction(str(config.seed), "private", slug) < config.private_rate:
+        return render_page("Profile", "<section class='profile-unavailable'>This profile is not available</section>")
+
+    rng = random.Random(f"{config.seed}|{slug}")
+    name = ' '.join(part.title() for part in slug.split('-')[:-1])
+    return render_page("Profile", (
+        "<section class='pv-top-card'>"
+        "<img class='pv-top-card-profile-picture' src='/static/avatar.png' alt=''>"
+        f"<h1>{html.escape(name)}</h1>"
+        f"<div class='text-body-medium break-words'>{html.escape(rng.choice(TITLES))}</div>"
+        "<div class='pv-text-details__right-panel'>"
+        f"<div class='inline-show-more-text'>{html.escape(rng.choice(COMPANIES))}</div>"
+        "</div></section>"
+    ))
+
+
+LOGIN_PAGE = render_page("Login", (
+    "<form method='post' action='/login'>"
+    "<input id='username' name='session_key' type='text'>"
+    "<input id='password' name='session_password' type='password'>"
+    "<button type='submit'>Sign in</button>"
+    "</form>"
+))
+
+FEED_PAGE = render_page("Feed", "<main class='feed'>Welcome back</main>")
+
+# Cookie set by the login form; the feed requires it, so session reuse can be exercised
+SESSION_COOKIE = "li_at"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    # Set by make_server
+    config = FixtureConfig()
+    counters = {}
+    counters_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    def count(self, name: str):
+        with self.counters_lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def delay(self):
+        config = self.config
+        seconds = config.latency + (random.uniform(0, config.jitter) if config.jitter else 0)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def respond(self, body: bytes, status: int = 200, headers: Optional[Dict[str, str]] = None,
+                content_type: str = "text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def redirect(self, location: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(303)
+        self.send_header("Location", location)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self.delay()
+        parts = urlsplit(self.path)
+        path = parts.path
+
+        if path == "/login":
+            self.count("login")
+            self.respond(LOGIN_PAGE)
+        elif path.startswith("/feed"):
+            self.count("feed")
+            if SESSION_COOKIE in (self.headers.get("Cookie") or ""):
+                self.respond(FEED_PAGE)
+            else:
+                # Signed-out visitors are sent to the login page, as on LinkedIn
+                self.redirect("/login")
+        elif path.startswith("/search/results/people"):
+            self.count("search")
+            keywords = unquote(parse_qs(parts.query).get("keywords", [""])[0])
+            self.respond(render_search_page(keywords, self.config))
+        elif path.startswith("/in/"):
+            self.count("profile")
+            slug = path[len("/in/"):].strip('/')
+            self.respond(render_profile_page(slug, self.config))
+        elif path.startswith("/static/"):
+            self.count("static")
+            content_type = ASSET_TYPES.get(path[path.rfind('.'):], "application/octet-stream")
+            body = b"" if content_type == "application/javascript" else b"\0" * self.config.asset_bytes
+            self.respond(body, headers={"Timing-Allow-Origin": "*"}, content_type=content_type)
+        else:
+            self.respond(render_page("Not found", "Not found"), status=404)
+
+    def do_POST(self):
+        self.delay()
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        if urlsplit(self.path).path == "/login":
+            self.count("login_submit")
+            self.redirect("/feed/", {"Set-Cookie": f"{SESSION_COOKIE}=fixture; Path=/; Max-Age=86400"})
+        else:
+            self.respond(render_page("Not found", "Not found"), status=404)
+
+
+def make_server(config: Optional[FixtureConfig] = None, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    Create a LinkedIn stand-in server.
+
+    Args:
+        config: Server behaviour (defaults to FixtureConfig())
+        host: Interface to bind
+        port: Port to bind, 0 picks a free one
+
+    Returns:
+        Server whose RequestHandlerClass exposes per-endpoint request counters
+    """
+    handler = type("ConfiguredFixtureHandler", (FixtureHandler,), {
+        "config": config or FixtureConfig(),
+        "counters": {},
+        "counters_lock": threading.Lock()
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_server(config: Optional[FixtureConfig] = None, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start a stand-in server on a background thread.
+
+    Returns:
+        Running server; its base URL is f"http://{host}:{server.server_port}"
+    """
+    server = make_server(config, host, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local LinkedIn stand-in for tests and benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra random latency")
+    parser.add_argument("--results", type=int, default=5, help="Candidates per search")
+    parser.add_argument("--private-rate", type=float, default=0.1)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--empty-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fixture_config = FixtureConfig(args.latency, args.jitter, args.results, args.private_rate,
+                                   args.failure_rate, args.empty_rate, args.seed)
+    fixture_server = make_server(fixture_config, args.host, args.port)
+    print(f"Serving LinkedIn stand-in on http://{args.host}:{fixture_server.server_port}")
+    try:
+        fixture_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,94 @@
+import csv
+from typing import Dict, Iterable, List, Optional, TextIO
+
+# Column every input CSV must have
+REQUIRED_COLUMN = "Email"
+
+# Columns written to normalized input files
+INPUT_COLUMNS = ["Email", "Name"]
+
+# Rejected rows listed individually in an upload report; the rest are only counted
+MAX_REPORTED_REJECTS = 100
+
+
+def validate_header(fieldnames: Optional[List[str]]) -> List[str]:
+    """
+    Check the header row of an input CSV.
+
+    Args:
+        fieldnames: Header row, or None for an empty file
+
+    Returns:
+        The header row
+
+    Raises:
+        ValueError: If the CSV format is invalid
+    """
+    # Check if required 'Email' column exists
+    if not fieldnames or REQUIRED_COLUMN not in fieldnames:
+        raise ValueError("Input CSV must contain an 'Email' column")
+    return fieldnames
+
+
+def clean_row(fieldnames: List[str], values: List[str]) -> Optional[Dict[str, str]]:
+    """
+    Turn one input row into a record.
+
+    Args:
+        fieldnames: Header row
+        values: Row values
+
+    Returns:
+        Dictionary with 'Email' and 'Name' keys, or None if the email is empty
+    """
+    row = dict(zip(fieldnames, values))
+    email = (row.get('Email') or '').strip()
+    if not email:
+        return None
+    return {
+        'Email': email,
+        'Name': row.get('Name', '').strip() if row.get('Name') else ''
+    }
+
+
+def copy_validated_rows(lines: Iterable[str], output: TextIO, max_reported: int = MAX_REPORTED_REJECTS) -> Dict:
+    """
+    Validate input CSV text row by row and write accepted rows as a normalized CSV.
+
+    Applies the same rules as reading an input file, without holding more
+    than one row in memory.
+
+    Args:
+        lines: Source text, e.g. a text stream over an upload
+        output: Text file the normalized CSV is written to
+        max_reported: Number of rejected rows listed individually
+
+    Returns:
+        Dictionary with rows_accepted, rows_rejected and rejects (row number and reason)
+
+    Raises:
+        ValueError: If the header is invalid
+    """
+    reader = csv.reader(lines)
+    fieldnames = validate_header(next(reader, None))
+    writer = csv.writer(output)
+    writer.writerow(INPUT_COLUMNS)
+
+    accepted = 0
+    rejected = 0
+    rejects = []
+    row_number = 1
+    for values in reader:
+        if not values:
+            continue
+        row_number += 1
+        record = clean_row(fieldnames, values)
+        if record is None:
+            rejected += 1
+            if len(rejects) < max_reported:
+                rejects.append({"row": row_number, "reason": "Empty email"})
+            continue
+        writer.writerow([record['Email'], record['Name']])
+        accepted += 1
+
+    return {"rows_accepted": accepted, "rows_rejected": rejected, "rejects": rejects}
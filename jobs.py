@@ -0,0 +1,486 @@
+import json
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from matcher_io import PROGRESS_FD_ENV
+
+logger = logging.getLogger(__name__)
+
+# Each job gets jobs/<id>/ holding its input, output, checkpoint, log and job.json
+DEFAULT_JOBS_DIR = "jobs"
+JOB_FILE = "job.json"
+JOB_INPUT_FILE = "input.csv"
+JOB_OUTPUT_FILE = "results.csv"
+JOB_LOG_FILE = "matcher.log"
+
+# Jobs run one at a time by default: they share one LinkedIn account and its rate budget
+DEFAULT_JOB_WORKERS = 1
+DEFAULT_MAX_QUEUED_JOBS = 20
+
+# Seconds a cancelled worker gets to flush its output and close the browser before it is killed
+CANCEL_GRACE_SECONDS = 30
+
+# Seconds between checks whether an orphaned worker has exited, and how long to wait after SIGKILL
+ORPHAN_POLL_INTERVAL = 0.5
+ORPHAN_KILL_WAIT_SECONDS = 10
+
+# Minimum seconds between job.json writes caused by per-record progress
+SAVE_INTERVAL = 2.0
+
+JOB_STATES = ("uploading", "queued", "running", "completed", "failed", "cancelled")
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    def __init__(self, job_id: str, directory: str, status: str = "queued", **fields):
+        """
+        One matching run with its own input and output files.
+
+        Args:
+            job_id: Unique job identifier
+            directory: Directory holding the job's files
+            status: One of JOB_STATES
+            fields: Persisted progress fields, see to_dict
+        """
+        self.id = job_id
+        self.directory = directory
+        self.status = status
+        self.created_at = fields.get("created_at", time.time())
+        self.started_at = fields.get("started_at")
+        self.finished_at = fields.get("finished_at")
+        self.total_records = fields.get("total_records", 0)
+        self.processed_records = fields.get("processed_records", 0)
+        self.progress = fields.get("progress", 0)
+        self.current_email = fields.get("current_email", "")
+        self.estimated_finish = fields.get("estimated_finish")
+        self.rows_written = fields.get("rows_written", 0)
+        self.error = fields.get("error", "")
+        self.pid = fields.get("pid")
+        self.process = None
+        self.cancel_requested = False
+        self.last_saved = 0.0
+        # Latest metrics snapshot from the worker; kept in memory only
+        self.metrics = None
+
+    @property
+    def input_file(self) -> str:
+        return os.path.join(self.directory, JOB_INPUT_FILE)
+
+    @property
+    def output_file(self) -> str:
+        return os.path.join(self.directory, JOB_OUTPUT_FILE)
+
+    @property
+    def log_file(self) -> str:
+        return os.path.join(self.directory, JOB_LOG_FILE)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job's persisted and reported fields."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "total_records": self.total_records,
+            "processed_records": self.processed_records,
+            "progress": self.progress,
+            "current_email": self.current_email,
+            "estimated_finish": self.estimated_finish,
+            "rows_written": self.rows_written,
+            "error": self.error,
+            "pid": self.pid
+        }
+
+    def save(self):
+        """Atomically write job.json."""
+        path = os.path.join(self.directory, JOB_FILE)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file)
+        os.replace(temp_path, path)
+        self.last_saved = time.time()
+
+    @classmethod
+    def load(cls, directory: str) -> "Job":
+        """Load a job from its directory's job.json."""
+        with open(os.path.join(directory, JOB_FILE), 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(data.pop("id"), directory, data.pop("status"), **data)
+
+
+def _process_command(pid: int) -> Optional[str]:
+    """Return a process's command line, or None if there is no such process."""
+    try:
+        with open(f"/proc/{pid}/cmdline", 'rb') as file:
+            return file.read().replace(b'\0', b' ').decode('utf-8', 'replace')
+    except FileNotFoundError:
+        if os.path.isdir("/proc"):
+            return None
+    except OSError:
+        return None
+    # No procfs (e.g. macOS): ask ps instead
+    result = subprocess.run(["ps", "-p", str(pid), "-o", "command="], capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def _is_job_worker(job: Job) -> bool:
+    """
+    Check whether the job's recorded pid still belongs to its matcher process.
+
+    A pid recorded before a crash or reboot may since have been reused by an
+    unrelated process, so the command line must name this job's output file.
+    """
+    if not job.pid:
+        return False
+    command = _process_command(job.pid)
+    return bool(command) and os.path.join(job.id, JOB_OUTPUT_FILE) in command
+
+
+def _wait_for_exit(job: Job, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while _is_job_worker(job):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(ORPHAN_POLL_INTERVAL)
+    return True
+
+
+def _stop_orphan(job: Job):
+    """
+    Stop a worker left running by a previous server process.
+
+    The worker gets SIGTERM and CANCEL_GRACE_SECONDS to flush its output and
+    close the browser, then SIGKILL. Returns once it is gone, so a rerun never
+    appends to the output file or opens the browser profile alongside it.
+    """
+    for sig, timeout in ((signal.SIGTERM, CANCEL_GRACE_SECONDS), (signal.SIGKILL, ORPHAN_KILL_WAIT_SECONDS)):
+        if not _is_job_worker(job):
+            return
+        logger.warning(f"Stopping orphaned worker {job.pid} of job {job.id} with {sig.name}")
+        try:
+            os.kill(job.pid, sig)
+        except ProcessLookupError:
+            return
+        except OSError as e:
+            raise RuntimeError(f"Cannot stop orphaned worker {job.pid} of job {job.id}: {str(e)}")
+        if _wait_for_exit(job, timeout):
+            return
+    raise RuntimeError(f"Orphaned worker {job.pid} of job {job.id} did not exit")
+
+
+class JobManager:
+    def __init__(self, jobs_dir: str = DEFAULT_JOBS_DIR, workers: int = DEFAULT_JOB_WORKERS,
+                 max_queued: int = DEFAULT_MAX_QUEUED_JOBS,
+                 on_event: Optional[Callable[[Job, Dict[str, Any]], None]] = None,
+                 matcher_script: str = "linkedin_matcher.py"):
+        """
+        Queue of matching jobs run by a fixed pool of worker threads.
+
+        Each worker runs one job at a time as a linkedin_matcher.py child
+        process and follows it through the progress pipe. Job state is kept in
+        jobs/<id>/job.json, so queued jobs survive a server restart and jobs
+        that were running are queued again once their old worker has exited;
+        the matcher's checkpoint makes the rerun pick up where it stopped.
+
+        Args:
+            jobs_dir: Directory holding one subdirectory per job
+            workers: Number of jobs run concurrently
+            max_queued: Maximum number of jobs waiting to run
+            on_event: Called with the job and each event (progress events and
+                job status changes)
+            matcher_script: Script run for each job
+        """
+        self.jobs_dir = jobs_dir
+        self.max_queued = max_queued
+        self.on_event = on_event
+        self.matcher_script = matcher_script
+        self.jobs: Dict[str, Job] = {}
+        self.pending = deque()
+        self.condition = threading.Condition()
+        os.makedirs(jobs_dir, exist_ok=True)
+
+        self._recover()
+
+        self.workers = []
+        for index in range(workers):
+            worker = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def submit(self, input_file: str, move: bool = False) -> Job:
+        """
+        Create a job for an input CSV and queue it.
+
+        Args:
+            input_file: CSV with Email and Name columns
+            move: Move the file into the job directory instead of copying it
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already waiting
+        """
+        job = self.create()
+        try:
+            if move:
+                shutil.move(input_file, job.input_file)
+            else:
+                shutil.copyfile(input_file, job.input_file)
+        except Exception:
+            self.discard(job)
+            raise
+        self.enqueue(job)
+        return job
+
+    def create(self) -> Job:
+        """
+        Create a job whose input is still being written.
+
+        The job counts against the queue limit from now on; pass it to
+        enqueue once job.input_file is complete, or to discard.
+
+        Returns:
+            New job in the "uploading" state
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already waiting
+        """
+        with self.condition:
+            waiting = len(self.pending) + sum(1 for job in self.jobs.values() if job.status == "uploading")
+            if waiting >= self.max_queued:
+                raise JobQueueFull(f"{waiting} jobs are already queued")
+
+            job_id = uuid.uuid4().hex[:12]
+            job = Job(job_id, os.path.join(self.jobs_dir, job_id), "uploading")
+            os.makedirs(job.directory)
+            job.save()
+            self.jobs[job_id] = job
+        return job
+
+    def enqueue(self, job: Job):
+        """Queue a job created with create."""
+        with self.condition:
+            if job.cancel_requested:
+                self._finish(job, "cancelled")
+                return
+            job.status = "queued"
+            job.save()
+            self.pending.append(job)
+            self.condition.notify()
+
+        logger.info(f"Queued job {job.id} ({len(self.pending)} waiting)")
+        self._publish(job, {"event": "job", **job.to_dict()})
+
+    def discard(self, job: Job):
+        """Delete a job created with create that will not be queued, with its files."""
+        with self.condition:
+            self.jobs.pop(job.id, None)
+        shutil.rmtree(job.directory, ignore_errors=True)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None."""
+        return self.jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        """Return every known job, newest first."""
+        return sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def current(self) -> Optional[Job]:
+        """Return the earliest-started running job, else the most recently created job, or None."""
+        running = [job for job in self.jobs.values() if job.status == "running"]
+        if running:
+            return min(running, key=lambda job: job.started_at or 0)
+        jobs = self.list()
+        return jobs[0] if jobs else None
+
+    def active(self) -> bool:
+        """Check whether any job is queued or running."""
+        return any(job.status in ("uploading", "queued", "running") for job in self.jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job.
+
+        A queued job is dropped from the queue. A running job's worker gets
+        SIGTERM, which makes it flush its output and close the browser; it is
+        killed if it has not exited after CANCEL_GRACE_SECONDS.
+
+        Args:
+            job_id: Job to cancel
+
+        Returns:
+            The job, or None if there is no such job
+        """
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            job.cancel_requested = True
+            if job.status == "queued":
+                self.pending.remove(job)
+                self._finish(job, "cancelled")
+                return job
+            process = job.process
+
+        if process is not None and process.poll() is None:
+            logger.info(f"Cancelling job {job_id} (pid {process.pid})")
+            process.terminate()
+            threading.Thread(target=self._kill_after_grace, args=(process,), daemon=True).start()
+        return job
+
+    def _kill_after_grace(self, process: subprocess.Popen):
+        try:
+            process.wait(timeout=CANCEL_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Worker {process.pid} ignored SIGTERM; killing it")
+            process.kill()
+
+    def _recover(self):
+        """Load persisted jobs and queue again those that had not finished."""
+        for entry in sorted(os.listdir(self.jobs_dir)):
+            directory = os.path.join(self.jobs_dir, entry)
+            try:
+                job = Job.load(directory)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable job directory {directory}: {str(e)}")
+                continue
+
+            if job.status == "running":
+                # The server stopped while this job ran; make sure its worker is gone before rerunning it
+                try:
+                    _stop_orphan(job)
+                except RuntimeError as e:
+                    logger.error(str(e))
+                    job.status = "failed"
+                    job.error = str(e)
+                    job.finished_at = time.time()
+                else:
+                    job.status = "queued"
+                    job.pid = None
+                    logger.info(f"Requeued job {job.id} interrupted by a server restart")
+                job.save()
+
+            if job.status == "uploading":
+                job.status = "failed"
+                job.error = "Upload interrupted by a server restart"
+                job.save()
+
+            self.jobs[job.id] = job
+            if job.status == "queued":
+                self.pending.append(job)
+
+        self.pending = deque(sorted(self.pending, key=lambda job: job.created_at))
+
+    def _work(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                job = self.pending.popleft()
+                job.status = "running"
+                job.started_at = time.time()
+                job.error = ""
+            self._run(job)
+
+    def _run(self, job: Job):
+        """Run one job in a child process and follow its progress events."""
+        try:
+            read_fd, write_fd = os.pipe()
+            try:
+                with self.condition:
+                    if job.cancel_requested:
+                        os.close(read_fd)
+                        self._finish(job, "cancelled")
+                        return
+                    job.process = subprocess.Popen(
+                        [sys.executable, self.matcher_script, job.input_file, job.output_file,
+                         "--log-file", job.log_file],
+                        pass_fds=(write_fd,),
+                        env={**os.environ, PROGRESS_FD_ENV: str(write_fd)}
+                    )
+                    job.pid = job.process.pid
+            finally:
+                os.close(write_fd)
+
+            job.save()
+            self._publish(job, {"event": "job", **job.to_dict()})
+
+            with os.fdopen(read_fd, 'r', encoding='utf-8') as events:
+                for line in events:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._apply_event(job, event)
+
+            returncode = job.process.wait()
+            if job.cancel_requested:
+                self._finish(job, "cancelled")
+            elif returncode == 0:
+                self._finish(job, "completed")
+            else:
+                self._finish(job, "failed", job.error or f"Worker exited with code {returncode}")
+
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            self._finish(job, "failed", str(e))
+        finally:
+            job.process = None
+
+    def _apply_event(self, job: Job, event: Dict[str, Any]):
+        """Update a job from a progress event and pass the event on."""
+        kind = event.get("event")
+
+        if kind == "plan":
+            job.total_records = event.get("searches", 0)
+            job.processed_records = 0
+            job.progress = 0
+            job.estimated_finish = event.get("finish_time")
+        elif kind == "searching":
+            job.current_email = event.get("email", "")
+        elif kind == "record":
+            job.processed_records = event.get("processed", 0)
+            job.total_records = event.get("total", 0)
+            job.progress = event.get("progress", 0)
+        elif kind == "complete":
+            job.rows_written = event.get("rows_written", 0)
+            job.progress = 100
+        elif kind == "error":
+            job.error = event.get("message", "")
+        elif kind == "metrics":
+            # Snapshots are cumulative for the run and too large to broadcast
+            job.metrics = event.get("metrics")
+            return
+
+        if kind != "record" or time.time() - job.last_saved >= SAVE_INTERVAL:
+            job.save()
+        self._publish(job, event)
+
+    def _finish(self, job: Job, status: str, error: str = ""):
+        job.status = status
+        job.finished_at = time.time()
+        job.current_email = ""
+        if error:
+            job.error = error
+        job.save()
+        logger.info(f"Job {job.id} {status}")
+        self._publish(job, {"event": "job", **job.to_dict()})
+
+    def _publish(self, job: Job, event: Dict[str, Any]):
+        if self.on_event:
+            self.on_event(job, {**event, "job_id": job.id})
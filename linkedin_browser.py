@@ -0,0 +1,962 @@
+import logging
+import time
+from urllib.parse import urlsplit
+from typing import List, Dict, Optional
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+import scoring
+from page_parser import split_subtitle, parse_search_results, parse_profile_page
+from linkedin_cache import LookupCache, ProfileCache
+from clock import SystemClock
+from metrics import MatcherMetrics
+from tracing import NULL_TRACER
+from session_store import SessionStore
+from rate_limit import RateLimitScheduler
+
+# Browser layer of linkedin_matcher: Selenium and webdriver_manager are only
+# imported once a matcher is created. Logs under linkedin_matcher so log
+# levels set for the matcher and its stages still apply.
+logger = logging.getLogger("linkedin_matcher")
+search_logger = logging.getLogger("linkedin_matcher.search")
+profile_logger = logging.getLogger("linkedin_matcher.profile")
+extraction_logger = logging.getLogger("linkedin_matcher.extraction")
+scoring_logger = logging.getLogger("linkedin_matcher.scoring")
+
+# Selectors that signal a people search with no results
+NO_RESULTS_SELECTORS = ".search-reusable-search-no-results, .artdeco-empty-state"
+
+# Profile top-card nodes holding the headline and the current company
+PROFILE_TITLE_SELECTOR = ".text-body-medium"
+PROFILE_COMPANY_SELECTOR = ".pv-text-details__right-panel"
+
+# Seconds a readiness wait may add once the page container is already there;
+# pages that never settle (no headline, unknown empty-state markup) are
+# extracted as they are after this, rather than after the full page timeout
+DEFAULT_READINESS_TIMEOUT = 2.5
+
+def summarize_timings(values: List[float]) -> Dict[str, float]:
+    """
+    Summarize a list of durations.
+    
+    Args:
+        values: Durations in seconds
+        
+    Returns:
+        Dictionary with count, total and mean seconds
+    """
+    total = sum(values)
+    return {"count": len(values), "total": total, "mean": total / len(values) if values else 0.0}
+
+class PageReadiness:
+    def __init__(self, driver, timeout: float = DEFAULT_READINESS_TIMEOUT, poll_interval: float = 0.25,
+                 metrics: Optional[MatcherMetrics] = None, tracer=NULL_TRACER):
+        """
+        Wait on concrete DOM conditions instead of fixed sleeps, and time each wait.
+        
+        Args:
+            driver: Selenium WebDriver
+            timeout: Maximum seconds to wait for a condition, kept short since
+                the page container has already loaded when these waits start
+            poll_interval: Seconds between condition checks
+            metrics: Optional metrics to record each wait in as the readiness stage
+            tracer: Tracer recording a span per wait
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.metrics = metrics
+        self.tracer = tracer
+        self.timings = {}
+    
+    def wait(self, label: str, condition) -> bool:
+        """
+        Wait until a condition holds and record how long it took.
+        
+        Args:
+            label: Name the wait is recorded under
+            condition: Callable taking the driver and returning a truthy value when ready
+            
+        Returns:
+            True if the condition held, False on timeout
+        """
+        start_time = time.perf_counter()
+        with self.tracer.span(f"wait:{label}") as span:
+            try:
+                WebDriverWait(self.driver, self.timeout, poll_frequency=self.poll_interval).until(condition)
+                return True
+            except TimeoutException:
+                logger.info("Readiness wait '%s' timed out after %ss; extracting the page as it is",
+                            label, self.timeout)
+                span.set(timed_out=True)
+                return False
+            finally:
+                elapsed = time.perf_counter() - start_time
+                self.timings.setdefault(label, []).append(elapsed)
+                if self.metrics:
+                    self.metrics.observe("readiness", elapsed, page=label)
+    
+    def search_results_ready(self, stable_polls: int = 2):
+        """
+        Condition: the number of search results has stopped changing.
+        
+        Holds once the result count is non-zero and unchanged for
+        stable_polls consecutive checks, or as soon as the page shows its
+        no-results state.
+        
+        Args:
+            stable_polls: Consecutive identical counts required
+            
+        Returns:
+            Condition callable for wait()
+        """
+        state = {"count": -1, "stable": 0}
+        
+        def condition(driver) -> bool:
+            count = len(driver.find_elements(By.CSS_SELECTOR, ".entity-result__item"))
+            if count == 0:
+                return bool(driver.find_elements(By.CSS_SELECTOR, NO_RESULTS_SELECTORS))
+            state["stable"] = state["stable"] + 1 if count == state["count"] else 0
+            state["count"] = count
+            return state["stable"] >= stable_polls - 1
+        
+        return condition
+    
+    @staticmethod
+    def profile_ready(driver) -> bool:
+        """
+        Condition: the profile top card is rendered.
+        
+        Holds once the headline has text, or once both the headline and the
+        company nodes exist, since profiles without a headline or current
+        company leave those nodes empty.
+        """
+        titles = driver.find_elements(By.CSS_SELECTOR, PROFILE_TITLE_SELECTOR)
+        if not titles:
+            return False
+        return bool(titles[0].text.strip() or driver.find_elements(By.CSS_SELECTOR, PROFILE_COMPANY_SELECTOR))
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize recorded waits.
+        
+        Returns:
+            Mapping of label to count, total and mean seconds
+        """
+        return {label: summarize_timings(values) for label, values in self.timings.items()}
+
+EXTRACTION_MODES = ("script", "html", "elements")
+
+# Collects every search result in one round trip; mirrors _collect_search_results_by_element
+SEARCH_RESULTS_SCRIPT = """
+return Array.from(document.querySelectorAll('.entity-result__item')).map(function (result) {
+    var link = result.querySelector('a.app-aware-link');
+    var name = result.querySelector('.entity-result__title-text a');
+    var subtitle = result.querySelector('.entity-result__primary-subtitle');
+    if (!link || !name || !subtitle) {
+        return null;
+    }
+    return {url: link.href, name: name.innerText.trim(), subtitle: subtitle.innerText.trim()};
+}).filter(Boolean);
+"""
+
+# Collects the profile fields in one round trip; mirrors _collect_profile_fields_by_element
+PROFILE_FIELDS_SCRIPT = """
+var title = document.querySelector('.text-body-medium');
+var company = document.querySelector('.pv-text-details__right-panel .inline-show-more-text');
+return {
+    title: title ? title.innerText.trim() : '',
+    company: company ? company.innerText.trim() : ''
+};
+"""
+
+# Sums bytes transferred by the current page: the document plus every subresource.
+# Cross-origin resources without Timing-Allow-Origin report 0, so this is a lower bound.
+TRANSFER_SIZE_SCRIPT = """
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .reduce(function (total, entry) { return total + (entry.transferSize || 0); }, 0);
+"""
+
+# Lean mode: Chrome content settings that stop images and media from loading
+LEAN_CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.default_content_setting_values.notifications": 2
+}
+
+# Lean mode: requests dropped by the browser before they leave it (fonts, video and trackers
+# that content settings do not cover, plus images referenced from CSS)
+LEAN_BLOCKED_URLS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*bat.bing.com*", "*connect.facebook.net*"
+]
+
+# Log explanations for each confidence level
+CONFIDENCE_REASONS = {
+    "HIGH": "Domain matches, name matches, product role found",
+    "MEDIUM": "Name+Product or Domain match",
+    "LOW": "Name matches only",
+    "NO": "No reasonable match"
+}
+
+# Root of the LinkedIn site; tests and benchmarks point this at a local stand-in
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+
+class LinkedInMatcher:
+    def __init__(self, headless: bool = True, lookup_cache: Optional[LookupCache] = None,
+                 profile_cache: Optional[ProfileCache] = None, extraction_mode: str = "script",
+                 base_url: str = LINKEDIN_BASE_URL, clock=None,
+                 rate_limiter: Optional[RateLimitScheduler] = None,
+                 session_store: Optional[SessionStore] = None, lean: bool = False,
+                 measure_transfer: bool = False, metrics: Optional[MatcherMetrics] = None,
+                 tracer=NULL_TRACER):
+        """
+        Initialize the LinkedIn matcher with Selenium WebDriver.
+        
+        Args:
+            headless: Whether to run browser in headless mode
+            lookup_cache: Optional persistent cache consulted before each search
+            profile_cache: Optional cache of extracted profile pages keyed by canonical URL
+            extraction_mode: "script" to read each page with one injected script,
+                "html" to fetch page_source once and parse it with page_parser, or
+                "elements" to query elements one WebDriver call at a time
+            base_url: Site root, overridable to point at a local stand-in server
+            clock: Object with time() and sleep() used for rate limiting
+                (defaults to the system clock)
+            rate_limiter: Search and profile-view budgets (defaults to
+                RateLimitScheduler.from_budgets() on the same clock)
+            session_store: Optional store for the cached driver path, a persistent
+                browser profile and saved cookies, so later runs can skip the login form
+            lean: Block images, media, fonts and trackers and return from navigation
+                once the DOM is ready, since only a few text nodes are read
+            measure_transfer: Record the bytes each page transferred (one extra
+                script call per page)
+            metrics: Per-stage latency and result metrics to record into
+                (a private set by default)
+            tracer: Tracer recording spans for page loads, waits, extraction
+                and scoring (a no-op tracer by default)
+        """
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"extraction_mode must be one of {EXTRACTION_MODES}")
+        
+        self.driver = None
+        self.readiness = None
+        self.headless = headless
+        self.lookup_cache = lookup_cache
+        self.profile_cache = profile_cache
+        self.is_logged_in = False
+        self.search_count = 0
+        self.last_search_time = 0
+        self.page_loads = 0
+        self.detail_visits_skipped = 0
+        self.extraction_mode = extraction_mode
+        self.extraction_timings = {}
+        self.navigation_timings = []
+        self.rate_limit_waits = []
+        self.base_url = base_url.rstrip('/')
+        self.clock = clock or SystemClock()
+        self.rate_limiter = rate_limiter or RateLimitScheduler.from_budgets(clock=self.clock)
+        self.session_store = session_store
+        self.startup_timings = {}
+        self.lean = lean
+        self.measure_transfer = measure_transfer
+        self.transfer_sizes = []
+        self.metrics = metrics or MatcherMetrics()
+        self.tracer = tracer
+        for kind, limiter in self.rate_limiter.limiters.items():
+            self.metrics.rate_budget.set(limiter.per_hour, kind=kind)
+        
+    def setup_driver(self):
+        """Set up Chrome WebDriver with appropriate options."""
+        try:
+            start = time.perf_counter()
+            chrome_options = Options()
+            if self.headless:
+                chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            
+            # Set user agent to avoid detection
+            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+            
+            if self.lean:
+                # Return from driver.get at DOMContentLoaded; readiness waits cover the rest
+                chrome_options.page_load_strategy = "eager"
+                chrome_options.add_experimental_option("prefs", LEAN_CHROME_PREFS)
+                chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            
+            # Reuse the browser profile so cookies and cache survive between runs
+            if self.session_store:
+                chrome_options.add_argument(f"--user-data-dir={self.session_store.profile_dir}")
+                driver_path = self.session_store.driver_path()
+            else:
+                driver_path = ChromeDriverManager().install()
+            self.startup_timings["driver_path"] = time.perf_counter() - start
+            
+            service = Service(driver_path)
+            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            
+            # Remove navigator.webdriver flag
+            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            
+            if self.lean:
+                self._block_urls(LEAN_BLOCKED_URLS)
+            
+            self.readiness = PageReadiness(self.driver, metrics=self.metrics, tracer=self.tracer)
+            self.startup_timings["driver"] = time.perf_counter() - start
+            
+            logger.info("WebDriver setup completed successfully")
+            
+        except Exception as e:
+            logger.error("Failed to setup WebDriver: %s", e)
+            raise
+
+    def enforce_rate_limit(self, kind: str = "search"):
+        """
+        Wait until the next page load of this kind fits its hourly budget.
+        
+        Args:
+            kind: "search" or "profile"; each kind has its own budget
+        """
+        with self.tracer.span("enforce_rate_limit", kind=kind) as span:
+            waited = self.rate_limiter.acquire(kind)
+            span.set(waited=round(waited, 3))
+        self.metrics.observe("rate_limit_wait", waited, page=kind)
+        if waited:
+            self.rate_limit_waits.append(waited)
+        
+        self.last_search_time = self.clock.time()
+        self.search_count += 1
+
+    def _block_urls(self, patterns: List[str]):
+        """
+        Make the browser drop requests matching URL patterns.
+        
+        Args:
+            patterns: Wildcard URL patterns for Network.setBlockedURLs
+        """
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            logger.info("Lean mode: blocking %s URL patterns", len(patterns))
+        except Exception as e:
+            # Content settings still block images if the DevTools protocol is unavailable
+            logger.warning("Lean mode: could not block URLs: %s", e)
+
+    def _record_transfer_size(self):
+        """Record the bytes transferred by the page currently loaded, before leaving it."""
+        if not self.measure_transfer or not self.driver or not self.page_loads:
+            return
+        try:
+            self.transfer_sizes.append(int(self.driver.execute_script(TRANSFER_SIZE_SCRIPT) or 0))
+        except WebDriverException as e:
+            logger.debug("Could not measure transfer size: %s", e)
+
+    def _load_page(self, url: str, page: str = "other"):
+        """
+        Navigate to a URL, counting the page load and timing the navigation.
+        
+        With measure_transfer the outgoing page is measured first, so late
+        subresources loaded while it was being read are included.
+        
+        Args:
+            url: URL to load
+            page: Kind of page, e.g. "search" or "profile", for metrics
+        """
+        self._record_transfer_size()
+        start_time = time.perf_counter()
+        try:
+            with self.tracer.span("driver.get", page=page):
+                self.driver.get(url)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.page_loads += 1
+            self.navigation_timings.append(elapsed)
+            self.metrics.page_loads.inc(page=page)
+            self.metrics.observe("navigation", elapsed, page=page)
+
+    def login_to_linkedin(self, email: str, password: str) -> bool:
+        """
+        Log in to LinkedIn with provided credentials.
+        
+        Args:
+            email: LinkedIn email/username
+            password: LinkedIn password
+            
+        Returns:
+            bool: True if login successful, False otherwise
+        """
+        try:
+            logger.info("Attempting to login to LinkedIn...")
+            
+            # Navigate to LinkedIn login page
+            self._load_page(f"{self.base_url}/login", "login")
+            
+            # Wait for login form to load
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.ID, "username"))
+            )
+            
+            # Enter credentials
+            username_field = self.driver.find_element(By.ID, "username")
+            password_field = self.driver.find_element(By.ID, "password")
+            
+            username_field.clear()
+            username_field.send_keys(email)
+            
+            password_field.clear()
+            password_field.send_keys(password)
+            
+            # Click login button
+            login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
+            login_button.click()
+            
+            # Wait for login to complete - check for either success or error
+            try:
+                # Check for successful login (wait for feed page)
+                WebDriverWait(self.driver, 15).until(
+                    EC.url_contains(f"{urlsplit(self.base_url).netloc}/feed")
+                )
+                logger.info("Login successful!")
+                self.is_logged_in = True
+                self.save_session()
+                return True
+                
+            except TimeoutException:
+                # Check for login errors
+                try:
+                    error_element = self.driver.find_element(By.ID, "error-for-password")
+                    error_message = error_element.text
+                    logger.error("Login failed: %s", error_message)
+                    return False
+                    
+                except NoSuchElementException:
+                    # Check for other error messages
+                    try:
+                        error_element = self.driver.find_element(By.CLASS_NAME, "alert-error")
+                        error_message = error_element.text
+                        logger.error("Login failed: %s", error_message)
+                        return False
+                    except NoSuchElementException:
+                        logger.error("Login failed: Unknown error occurred")
+                        return False
+            
+        except Exception as e:
+            logger.error("Login error: %s", e)
+            return False
+
+    def check_session(self) -> bool:
+        """
+        Check whether the browser is already signed in by opening the feed.
+        
+        LinkedIn redirects signed-out visitors away from the feed, so landing
+        on it means the session is valid.
+        
+        Returns:
+            bool: True if the session is authenticated
+        """
+        self._load_page(f"{self.base_url}/feed/", "session")
+        self.is_logged_in = urlsplit(self.driver.current_url).path.startswith("/feed")
+        return self.is_logged_in
+
+    def restore_session(self) -> bool:
+        """
+        Reuse the session from an earlier run instead of submitting the login form.
+        
+        The persistent browser profile is tried first; saved cookies are
+        applied if the profile is signed out, e.g. because it was recreated.
+        
+        Returns:
+            bool: True if the browser is signed in
+        """
+        if not self.session_store:
+            return False
+        
+        start = time.perf_counter()
+        try:
+            if self.check_session():
+                logger.info("Reusing signed-in browser profile")
+                return True
+            
+            cookies = self.session_store.load_cookies()
+            if not cookies:
+                return False
+            
+            # The redirect left the browser on the site's domain, where the cookies belong
+            for cookie in cookies:
+                try:
+                    self.driver.add_cookie(cookie)
+                except WebDriverException as e:
+                    logger.debug("Skipping saved cookie %s: %s", cookie.get('name'), e)
+            if self.check_session():
+                logger.info("Restored LinkedIn session from saved cookies")
+                return True
+            
+            logger.info("Saved LinkedIn session has expired")
+            self.session_store.clear_cookies()
+            return False
+            
+        except Exception as e:
+            logger.warning("Could not restore LinkedIn session: %s", e)
+            return False
+        finally:
+            self.startup_timings["session"] = time.perf_counter() - start
+
+    def save_session(self):
+        """Save the session cookies so the next run can skip the login form."""
+        if not self.session_store:
+            return
+        try:
+            self.session_store.save_cookies(self.driver.get_cookies())
+        except Exception as e:
+            logger.warning("Could not save LinkedIn session: %s", e)
+
+    def search_linkedin_profile(self, email: str, name: str) -> Optional[Dict[str, str]]:
+        """
+        Search for LinkedIn profile based on email and name.
+        
+        Args:
+            email: Email address to search
+            name: Name to search (optional)
+            
+        Returns:
+            Dictionary with profile information or None if not found
+        """
+        with self.tracer.span("search_linkedin_profile") as span:
+            # Serve repeated lookups from the cache without spending rate-limit budget
+            if self.lookup_cache:
+                cached_result = self.lookup_cache.get(email, name)
+                if cached_result:
+                    search_logger.info("Cache hit for %s", email)
+                    self.metrics.searches.inc(source="cache")
+                    span.set(cache_hit=True)
+                    return cached_result
+            span.set(cache_hit=False)
+            
+            if not self.is_logged_in:
+                search_logger.error("Not logged in to LinkedIn")
+                return None
+                
+            result = self._search_linkedin_profile(email, name)
+            self.metrics.searches.inc(source="live")
+            span.set(status=result["Status"])
+            
+            if self.lookup_cache:
+                self.lookup_cache.put(email, name, result)
+            
+            return result
+
+    def _search_linkedin_profile(self, email: str, name: str) -> Dict[str, str]:
+        """
+        Run a live LinkedIn search for the given email and name.
+        
+        Args:
+            email: Email address to search
+            name: Name to search (optional)
+            
+        Returns:
+            Dictionary with profile information and search status
+        """
+        try:
+            # Enforce rate limiting
+            self.enforce_rate_limit()
+            
+            # Construct search query
+            search_query = f"{name} {email}" if name else email
+            
+            # Navigate to search page
+            search_url = f"{self.base_url}/search/results/people/?keywords={search_query.replace(' ', '%20')}"
+            self._load_page(search_url, "search")
+            
+            # Wait for search results to load with timeout
+            try:
+                with self.tracer.span("wait:search_results_container"):
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((By.CLASS_NAME, "search-results-container"))
+                    )
+            except TimeoutException:
+                search_logger.warning("Timeout waiting for search results for %s", email)
+                return {
+                    "LinkedIn_URL": "",
+                    "LinkedIn_Name": "",
+                    "Job_Title": "",
+                    "Company": "",
+                    "Confidence_Level": "NO",
+                    "Status": "Timeout"
+                }
+            
+            # Wait until the result list stops growing instead of sleeping a fixed time
+            self.readiness.wait("search_results", self.readiness.search_results_ready())
+            
+            # Extract profile results
+            with self.tracer.span("extract_search_results") as span:
+                profiles = self.extract_search_results()
+                span.set(candidates=len(profiles))
+            
+            if profiles:
+                # Rank every candidate on its snippet and take the best one
+                with self.metrics.time("scoring", "candidates"), \
+                        self.tracer.span("rank_candidates", candidates=len(profiles)) as span:
+                    ranked = scoring.rank_candidates(email, name, profiles)
+                    detail_visit_needed = scoring.needs_detail_visit(ranked)
+                    span.set(detail_visit=detail_visit_needed)
+                best_profile = ranked[0][1]
+                
+                # Visit the profile page only when the snippet leaves the result open
+                if detail_visit_needed:
+                    detailed_info = self.extract_detailed_profile_info(best_profile["url"])
+                    
+                    if detailed_info:
+                        best_profile.update(detailed_info)
+                else:
+                    self.detail_visits_skipped += 1
+                    self.metrics.detail_visits_skipped.inc()
+                
+                # Calculate confidence level based on matching criteria
+                confidence_level = self.calculate_confidence_level(email, name, best_profile)
+                
+                return {
+                    "LinkedIn_URL": best_profile.get("url", ""),
+                    "LinkedIn_Name": best_profile.get("name", ""),
+                    "Job_Title": best_profile.get("title", ""),
+                    "Company": best_profile.get("company", ""),
+                    "Confidence_Level": confidence_level,
+                    "Status": "Found"
+                }
+            else:
+                return {
+                    "LinkedIn_URL": "",
+                    "LinkedIn_Name": "",
+                    "Job_Title": "",
+                    "Company": "",
+                    "Confidence_Level": "NO",
+                    "Status": "Not Found"
+                }
+                
+        except Exception as e:
+            search_logger.error("Search error for %s: %s", email, e)
+            return {
+                "LinkedIn_URL": "",
+                "LinkedIn_Name": "",
+                "Job_Title": "",
+                "Company": "",
+                "Confidence_Level": "NO",
+                "Status": f"Error: {str(e)}"
+            }
+
+    def extract_search_results(self) -> List[Dict[str, str]]:
+        """
+        Extract profile information from search results.
+        
+        In "script" mode everything is collected by one injected script, i.e.
+        a single WebDriver round trip per page; "html" mode fetches the page
+        source once and parses it in Python; "elements" mode keeps the
+        per-element lookups for comparison.
+        
+        Returns:
+            List of dictionaries with profile information
+        """
+        start_time = time.perf_counter()
+        try:
+            profiles = self._extract_search_profiles()
+        except Exception as e:
+            extraction_logger.error("Error extracting search results: %s", e)
+            profiles = []
+        
+        self._record_extraction("search_results", time.perf_counter() - start_time)
+        return profiles
+
+    def _extract_search_profiles(self) -> List[Dict[str, str]]:
+        """
+        Collect the search results of the current page with the configured extraction mode.
+        
+        Parsing runs in this process: one page per search is too little work
+        to hand to the process pool parse_saved_pages uses for saved pages.
+        
+        Returns:
+            List of dictionaries with url, name, title and company
+        """
+        if self.extraction_mode == "html":
+            return parse_search_results(self.driver.page_source, self.driver.current_url)
+        
+        if self.extraction_mode == "script":
+            results = self.driver.execute_script(SEARCH_RESULTS_SCRIPT) or []
+        else:
+            results = self._collect_search_results_by_element()
+        
+        profiles = []
+        for result in results:
+            # Simple parsing for title and company
+            job_title, company = split_subtitle(result["subtitle"])
+            profiles.append({
+                "url": result["url"],
+                "name": result["name"],
+                "title": job_title,
+                "company": company
+            })
+        return profiles
+
+    def _collect_search_results_by_element(self) -> List[Dict[str, str]]:
+        """
+        Collect raw search results with one WebDriver call per field.
+        
+        Returns:
+            List of dictionaries with url, name and subtitle
+        """
+        results = []
+        
+        # Find all profile result elements
+        result_elements = self.driver.find_elements(By.CSS_SELECTOR, ".entity-result__item")
+        
+        for result in result_elements:
+            try:
+                # Extract profile URL
+                link_element = result.find_element(By.CSS_SELECTOR, "a.app-aware-link")
+                
+                # Extract name
+                name_element = result.find_element(By.CSS_SELECTOR, ".entity-result__title-text a")
+                
+                # Extract job title and company
+                subtitle_element = result.find_element(By.CSS_SELECTOR, ".entity-result__primary-subtitle")
+                
+                results.append({
+                    "url": link_element.get_attribute("href"),
+                    "name": name_element.text.strip(),
+                    "subtitle": subtitle_element.text.strip()
+                })
+                
+            except NoSuchElementException:
+                continue
+        
+        return results
+
+    def _record_extraction(self, label: str, seconds: float):
+        """Record how long one page extraction took."""
+        self.extraction_timings.setdefault(label, []).append(seconds)
+        self.metrics.observe("extraction", seconds, page=label)
+
+    def extract_detailed_profile_info(self, profile_url: str) -> Optional[Dict[str, str]]:
+        """
+        Extract detailed information from individual profile page.
+        
+        Args:
+            profile_url: URL of the LinkedIn profile
+            
+        Returns:
+            Dictionary with detailed profile information or None if failed
+        """
+        with self.tracer.span("extract_detailed_profile_info") as span:
+            # Profiles reached from several input rows are only loaded once per freshness window
+            if self.profile_cache:
+                cached_info = self.profile_cache.get(profile_url)
+                if cached_info:
+                    profile_logger.info("Profile cache hit: %s", profile_url)
+                    span.set(cache_hit=True)
+                    return cached_info
+            span.set(cache_hit=False)
+            
+            # Wait outside the timed visit so the detail_visit stage excludes rate limiting
+            self.enforce_rate_limit("profile")
+            with self.metrics.time("detail_visit", "profile"):
+                detailed_info = self._extract_detailed_profile_info(profile_url)
+            
+            if self.profile_cache and detailed_info:
+                self.profile_cache.put(profile_url, detailed_info)
+            
+            return detailed_info
+
+    def _extract_detailed_profile_info(self, profile_url: str) -> Optional[Dict[str, str]]:
+        """
+        Load a profile page and extract its title, company and private status.
+        
+        Args:
+            profile_url: URL of the LinkedIn profile
+            
+        Returns:
+            Dictionary with detailed profile information or None if failed
+        """
+        try:
+            profile_logger.info("Visiting profile: %s", profile_url)
+            self._load_page(profile_url, "profile")
+            
+            # Wait for profile to load
+            try:
+                with self.tracer.span("wait:profile_picture"):
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, ".pv-top-card-profile-picture"))
+                    )
+            except TimeoutException:
+                # Check if profile is private
+                try:
+                    private_check = self.driver.find_element(By.CSS_SELECTOR, ".profile-unavailable")
+                    if private_check:
+                        profile_logger.info("Profile is private")
+                        return {"title": "Private Profile", "company": "Private", "status": "Private"}
+                except NoSuchElementException:
+                    profile_logger.warning("Timeout loading profile page")
+                    return None
+            
+            # Wait for the top-card fields rather than a fixed sleep
+            self.readiness.wait("profile_top_card", PageReadiness.profile_ready)
+            
+            start_time = time.perf_counter()
+            if self.extraction_mode == "html":
+                detailed_info = parse_profile_page(self.driver.page_source) or {"title": "", "company": ""}
+            elif self.extraction_mode == "script":
+                fields = self.driver.execute_script(PROFILE_FIELDS_SCRIPT) or {}
+                detailed_info = {"title": fields.get("title", ""), "company": fields.get("company", "")}
+            else:
+                detailed_info = self._collect_profile_fields_by_element()
+            self._record_extraction("profile", time.perf_counter() - start_time)
+            
+            return detailed_info
+            
+        except Exception as e:
+            profile_logger.error("Error extracting detailed profile info: %s", e)
+            return None
+
+    def _collect_profile_fields_by_element(self) -> Dict[str, str]:
+        """
+        Collect the profile title and company with one WebDriver call per field.
+        
+        Returns:
+            Dictionary with title and company
+        """
+        detailed_info = {}
+        
+        # Extract job title
+        try:
+            job_title_element = self.driver.find_element(By.CSS_SELECTOR, ".text-body-medium")
+            detailed_info["title"] = job_title_element.text.strip()
+        except NoSuchElementException:
+            detailed_info["title"] = ""
+        
+        # Extract company
+        try:
+            company_element = self.driver.find_element(By.CSS_SELECTOR, ".pv-text-details__right-panel .inline-show-more-text")
+            detailed_info["company"] = company_element.text.strip()
+        except NoSuchElementException:
+            detailed_info["company"] = ""
+        
+        return detailed_info
+
+    def normalize_name(self, name: str) -> str:
+        """
+        Normalize names for comparison by removing extra spaces and converting to lowercase.
+        
+        Args:
+            name: Name to normalize
+            
+        Returns:
+            Normalized name string
+        """
+        return scoring.normalize_name(name)
+
+    def extract_email_domain(self, email: str) -> str:
+        """
+        Extract domain from email address.
+        
+        Args:
+            email: Email address
+            
+        Returns:
+            Domain part of email (lowercase)
+        """
+        return scoring.extract_email_domain(email)
+
+    def extract_company_domain_hint(self, company: str) -> str:
+        """
+        Extract potential domain hint from company name.
+        
+        Args:
+            company: Company name
+            
+        Returns:
+            Potential domain hint (lowercase)
+        """
+        return scoring.extract_company_domain_hint(company)
+
+    def is_product_role(self, job_title: str) -> bool:
+        """
+        Check if job title contains product-related terms.
+        
+        Args:
+            job_title: Job title to check
+            
+        Returns:
+            True if job title contains product-related terms
+        """
+        return scoring.is_product_role(job_title)
+
+    def names_match(self, search_name: str, profile_name: str) -> bool:
+        """
+        Check if names match reasonably well.
+        
+        Args:
+            search_name: Name from search input
+            profile_name: Name from LinkedIn profile
+            
+        Returns:
+            True if names match reasonably well
+        """
+        return scoring.names_match(search_name, profile_name)
+
+    def calculate_confidence_level(self, email: str, search_name: str, profile: Dict[str, str]) -> str:
+        """
+        Calculate confidence level based on matching criteria.
+        
+        The rules live in scoring.score_confidence so that offline rescoring
+        (rescore.py) applies exactly the same criteria.
+        
+        Args:
+            email: Original email
+            search_name: Original name from search
+            profile: Extracted profile information
+            
+        Returns:
+            Confidence level: "HIGH", "MEDIUM", "LOW", or "NO"
+        """
+        with self.metrics.time("scoring", "best_match"), \
+                self.tracer.span("calculate_confidence_level") as span:
+            confidence_level = scoring.score_confidence(
+                email, search_name, profile.get("name", ""), profile.get("title", ""), profile.get("company", "")
+            )
+            span.set(level=confidence_level)
+        scoring_logger.info("%s confidence: %s for %s", confidence_level, CONFIDENCE_REASONS[confidence_level], email)
+        return confidence_level
+
+    def stats(self) -> Dict:
+        """
+        Summarize page loads and per-stage timings for this matcher.
+        
+        Returns:
+            Dictionary with counts and count/total/mean seconds per stage
+        """
+        return {
+            "page_loads": self.page_loads,
+            "detail_visits_skipped": self.detail_visits_skipped,
+            "rate_limit_wait": summarize_timings(self.rate_limit_waits),
+            "navigation": summarize_timings(self.navigation_timings),
+            "transfer_bytes": summarize_timings(self.transfer_sizes),
+            "readiness": self.readiness.summary() if self.readiness else {},
+            "extraction": {label: summarize_timings(values) for label, values in self.extraction_timings.items()}
+        }
+
+    def close(self):
+        """Close the WebDriver."""
+        if self.driver:
+            self._record_transfer_size()
+            self.driver.quit()
+            logger.info("WebDriver closed")
+
@@ -0,0 +1,293 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Default location and freshness of the persistent lookup cache
+DEFAULT_CACHE_FILE = "linkedin_cache.db"
+DEFAULT_CACHE_TTL = 7 * 24 * 3600  # One week, matching our weekly lead list re-runs
+DEFAULT_CACHE_MAX_ENTRIES = 100000
+# Share of max_entries freed by one eviction pass, so a full cache is not trimmed on every put
+EVICTION_BATCH_FRACTION = 0.1
+DEFAULT_PROFILE_TTL = 30 * 24 * 3600  # Titles and companies change slowly
+DEFAULT_PROFILE_MEMORY_ENTRIES = 1024
+
+# Only definitive outcomes are cached; timeouts and errors should be retried
+CACHEABLE_STATUSES = ("Found", "Not Found")
+
+
+def make_lookup_key(email: str, name: str) -> str:
+    """
+    Build the normalized cache key for an email/name pair.
+
+    Args:
+        email: Email address from the input row
+        name: Name from the input row (optional)
+
+    Returns:
+        Key string that ignores casing and whitespace differences
+    """
+    email_key = (email or "").strip().lower()
+    name_key = ' '.join((name or "").split()).lower()
+    return f"{email_key}|{name_key}"
+
+
+def canonicalize_profile_url(profile_url: str) -> str:
+    """
+    Canonicalize a LinkedIn profile URL so aliases of one profile share a key.
+
+    Drops the query string and fragment, lowercases the host and slug, and
+    normalizes regional hosts to www.linkedin.com.
+
+    Args:
+        profile_url: Profile URL as found in search results
+
+    Returns:
+        Canonical profile URL, or the stripped input if it is not a LinkedIn URL
+    """
+    if not profile_url:
+        return ""
+    parts = urlsplit(profile_url.strip())
+    host = parts.netloc.lower()
+    if not host.endswith("linkedin.com"):
+        return profile_url.strip()
+    path = parts.path.rstrip('/').lower()
+    return f"https://www.linkedin.com{path}/"
+
+
+def _open_database(path: str) -> sqlite3.Connection:
+    """
+    Open a cache database, creating its directory if needed.
+
+    Args:
+        path: Path to the SQLite database file
+
+    Returns:
+        Open SQLite connection
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
+
+
+class LookupCache:
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, ttl_seconds: float = DEFAULT_CACHE_TTL,
+                 max_entries: int = DEFAULT_CACHE_MAX_ENTRIES):
+        """
+        Initialize the persistent search result cache backed by SQLite.
+
+        Args:
+            path: Path to the SQLite database file
+            ttl_seconds: How long a cached result stays valid
+            max_entries: Maximum number of cached results before the least
+                recently used entries are evicted, in batches of
+                EVICTION_BATCH_FRACTION of max_entries
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = _open_database(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            "key TEXT PRIMARY KEY, "
+            "result TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS lookups_accessed_at ON lookups (accessed_at)")
+        self.connection.commit()
+        # Counted once here and kept up to date, so put() does not need a COUNT(*)
+        self.entries = self.connection.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+
+    def get(self, email: str, name: str) -> Optional[Dict[str, str]]:
+        """
+        Look up a stored search result.
+
+        Args:
+            email: Email address that was searched
+            name: Name that was searched (optional)
+
+        Returns:
+            Copy of the stored result dictionary, or None on a miss or expired entry
+        """
+        key = make_lookup_key(email, name)
+        now = time.time()
+        row = self.connection.execute(
+            "SELECT result, stored_at FROM lookups WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or now - row[1] > self.ttl_seconds:
+            if row is not None:
+                self.connection.execute("DELETE FROM lookups WHERE key = ?", (key,))
+                self.connection.commit()
+                self.entries -= 1
+            self.misses += 1
+            return None
+
+        self.connection.execute("UPDATE lookups SET accessed_at = ? WHERE key = ?", (now, key))
+        self.connection.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, email: str, name: str, result: Dict[str, str]):
+        """
+        Store a search result if its status is definitive.
+
+        Args:
+            email: Email address that was searched
+            name: Name that was searched (optional)
+            result: Result dictionary returned by the search
+        """
+        if not result or result.get("Status") not in CACHEABLE_STATUSES:
+            return
+
+        key = make_lookup_key(email, name)
+        now = time.time()
+        exists = self.connection.execute("SELECT 1 FROM lookups WHERE key = ?", (key,)).fetchone()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO lookups (key, result, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(result), now, now)
+        )
+        if exists is None:
+            self.entries += 1
+        if self.entries > self.max_entries:
+            self.evict()
+        self.connection.commit()
+
+    def evict(self):
+        """
+        Remove expired entries and trim the cache below max_entries.
+
+        Called only once the counted entries exceed max_entries; trims
+        EVICTION_BATCH_FRACTION of max_entries below the limit so the next
+        pass is that many new entries away.
+        """
+        expired = self.connection.execute(
+            "DELETE FROM lookups WHERE stored_at < ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        self.entries -= expired
+        target = self.max_entries - max(1, int(self.max_entries * EVICTION_BATCH_FRACTION))
+        overflow = self.entries - max(0, target)
+        evicted = 0
+        if overflow > 0:
+            evicted = self.connection.execute(
+                "DELETE FROM lookups WHERE key IN "
+                "(SELECT key FROM lookups ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            ).rowcount
+            self.entries -= evicted
+        logger.debug("Lookup cache: removed %s expired and %s least recently used entries", expired, evicted)
+
+    def close(self):
+        """Close the cache database."""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+class ProfileCache:
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, ttl_seconds: float = DEFAULT_PROFILE_TTL,
+                 memory_entries: int = DEFAULT_PROFILE_MEMORY_ENTRIES):
+        """
+        Initialize the profile page cache: an in-memory LRU backed by SQLite.
+
+        Args:
+            path: Path to the SQLite database file (may be shared with LookupCache)
+            ttl_seconds: Freshness window for a cached profile
+            memory_entries: Number of profiles kept in the in-memory LRU
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = _open_database(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "url TEXT PRIMARY KEY, "
+            "info TEXT NOT NULL, "
+            "stored_at REAL NOT NULL)"
+        )
+        self.connection.commit()
+
+    def get(self, profile_url: str) -> Optional[Dict[str, str]]:
+        """
+        Look up extracted details for a profile.
+
+        Args:
+            profile_url: Profile URL in any form
+
+        Returns:
+            Copy of the stored profile details, or None on a miss or stale entry
+        """
+        url = canonicalize_profile_url(profile_url)
+        now = time.time()
+
+        entry = self.memory.get(url)
+        if entry is None:
+            row = self.connection.execute(
+                "SELECT info, stored_at FROM profiles WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None:
+                entry = (json.loads(row[0]), row[1])
+
+        if entry is None or now - entry[1] > self.ttl_seconds:
+            if entry is not None:
+                self.memory.pop(url, None)
+                self.connection.execute("DELETE FROM profiles WHERE url = ?", (url,))
+                self.connection.commit()
+            self.misses += 1
+            return None
+
+        self._remember(url, entry)
+        self.hits += 1
+        return dict(entry[0])
+
+    def put(self, profile_url: str, info: Dict[str, str]):
+        """
+        Store extracted details for a profile.
+
+        Args:
+            profile_url: Profile URL in any form
+            info: Extracted title, company and private status
+        """
+        if not info:
+            return
+
+        url = canonicalize_profile_url(profile_url)
+        entry = (dict(info), time.time())
+        self._remember(url, entry)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO profiles (url, info, stored_at) VALUES (?, ?, ?)",
+            (url, json.dumps(entry[0]), entry[1])
+        )
+        self.connection.execute("DELETE FROM profiles WHERE stored_at < ?", (entry[1] - self.ttl_seconds,))
+        self.connection.commit()
+
+    def _remember(self, url: str, entry: tuple):
+        """Insert an entry into the in-memory LRU, evicting the oldest if full."""
+        self.memory[url] = entry
+        self.memory.move_to_end(url)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def close(self):
+        """Close the cache database."""
+        self.memory.clear()
+        if self.connection:
+            self.connection.close()
+            self.connection = None
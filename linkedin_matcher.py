@@ -1,631 +1,44 @@
-import csv
+import argparse
 import os
 import logging
 import time
-import random
-import re
-from typing import List, Dict, Set, Optional, Tuple
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("linkedin_matcher.log"),
-        logging.StreamHandler()
-    ]
+import signal
+from typing import Dict, Optional
+from company_index import DEFAULT_COMPANY_INDEX_FILE, use_company_index
+from checkpoint import ResumeCheckpoint, hash_email
+from metrics import MatcherMetrics
+from tracing import make_tracer
+from log_config import DEFAULT_LOG_FILE, configure_logging, parse_stage_levels
+from session_store import SessionStore, DEFAULT_SESSION_DIR
+from rate_limit import (RateLimitScheduler, DEFAULT_SEARCHES_PER_HOUR, DEFAULT_PROFILE_VIEWS_PER_HOUR,
+                        DEFAULT_PAGE_LOADS_PER_HOUR)
+from linkedin_cache import LookupCache, ProfileCache, DEFAULT_CACHE_FILE, DEFAULT_CACHE_TTL, DEFAULT_PROFILE_TTL
+# The light core is re-exported here; the Selenium-backed browser layer lives in
+# linkedin_browser and is only imported once a driver is about to be created
+from matcher_io import (
+    OUTPUT_COLUMNS, DEFAULT_WRITE_BATCH_SIZE, DEFAULT_FLUSH_INTERVAL, FSYNC_POLICIES, PROGRESS_FD_ENV,
+    ProgressReporter, InputReader, iter_input_csv, read_input_csv, get_processed_emails,
+    initialize_output_file, update_output_file, ResultWriter, SearchPlan, build_output_record
 )
-logger = logging.getLogger(__name__)
-
-# Define the output CSV columns
-OUTPUT_COLUMNS = [
-    "Email", 
-    "Name", 
-    "LinkedIn_URL", 
-    "LinkedIn_Name", 
-    "Job_Title", 
-    "Company", 
-    "Confidence_Level", 
-    "Status"
-]
-
-class LinkedInMatcher:
-    def __init__(self, headless: bool = True):
-        """
-        Initialize the LinkedIn matcher with Selenium WebDriver.
-        
-        Args:
-            headless: Whether to run browser in headless mode
-        """
-        self.driver = None
-        self.headless = headless
-        self.is_logged_in = False
-        self.search_count = 0
-        self.last_search_time = 0
-        
-    def setup_driver(self):
-        """Set up Chrome WebDriver with appropriate options."""
-        try:
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Set user agent to avoid detection
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Remove navigator.webdriver flag
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            logger.info("WebDriver setup completed successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to setup WebDriver: {str(e)}")
-            raise
-
-    def enforce_rate_limit(self):
-        """
-        Enforce rate limiting to stay within 200 searches/hour.
-        Adds random delay between 18-25 seconds between searches.
-        """
-        if self.search_count > 0:
-            # Base delay of 18 seconds + random 0-7 seconds
-            delay = 18 + random.uniform(0, 7)
-            current_time = time.time()
-            time_since_last_search = current_time - self.last_search_time
-            
-            if time_since_last_search < delay:
-                remaining_delay = delay - time_since_last_search
-                logger.info(f"Rate limiting: Waiting {remaining_delay:.1f} seconds before next search")
-                time.sleep(remaining_delay)
-        
-        self.last_search_time = time.time()
-        self.search_count += 1
-
-    def login_to_linkedin(self, email: str, password: str) -> bool:
-        """
-        Log in to LinkedIn with provided credentials.
-        
-        Args:
-            email: LinkedIn email/username
-            password: LinkedIn password
-            
-        Returns:
-            bool: True if login successful, False otherwise
-        """
-        try:
-            logger.info("Attempting to login to LinkedIn...")
-            
-            # Navigate to LinkedIn login page
-            self.driver.get("https://www.linkedin.com/login")
-            
-            # Wait for login form to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "username"))
-            )
-            
-            # Enter credentials
-            username_field = self.driver.find_element(By.ID, "username")
-            password_field = self.driver.find_element(By.ID, "password")
-            
-            username_field.clear()
-            username_field.send_keys(email)
-            
-            password_field.clear()
-            password_field.send_keys(password)
-            
-            # Click login button
-            login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
-            login_button.click()
-            
-            # Wait for login to complete - check for either success or error
-            try:
-                # Check for successful login (wait for feed page)
-                WebDriverWait(self.driver, 15).until(
-                    EC.url_contains("linkedin.com/feed")
-                )
-                logger.info("Login successful!")
-                self.is_logged_in = True
-                return True
-                
-            except TimeoutException:
-                # Check for login errors
-                try:
-                    error_element = self.driver.find_element(By.ID, "error-for-password")
-                    error_message = error_element.text
-                    logger.error(f"Login failed: {error_message}")
-                    return False
-                    
-                except NoSuchElementException:
-                    # Check for other error messages
-                    try:
-                        error_element = self.driver.find_element(By.CLASS_NAME, "alert-error")
-                        error_message = error_element.text
-                        logger.error(f"Login failed: {error_message}")
-                        return False
-                    except NoSuchElementException:
-                        logger.error("Login failed: Unknown error occurred")
-                        return False
-            
-        except Exception as e:
-            logger.error(f"Login error: {str(e)}")
-            return False
-
-    def search_linkedin_profile(self, email: str, name: str) -> Optional[Dict[str, str]]:
-        """
-        Search for LinkedIn profile based on email and name.
-        
-        Args:
-            email: Email address to search
-            name: Name to search (optional)
-            
-        Returns:
-            Dictionary with profile information or None if not found
-        """
-        if not self.is_logged_in:
-            logger.error("Not logged in to LinkedIn")
-            return None
-            
-        try:
-            # Enforce rate limiting
-            self.enforce_rate_limit()
-            
-            # Construct search query
-            search_query = f"{name} {email}" if name else email
-            
-            # Navigate to search page
-            search_url = f"https://www.linkedin.com/search/results/people/?keywords={search_query.replace(' ', '%20')}"
-            self.driver.get(search_url)
-            
-            # Wait for search results to load with timeout
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "search-results-container"))
-                )
-            except TimeoutException:
-                logger.warning(f"Timeout waiting for search results for {email}")
-                return {
-                    "LinkedIn_URL": "",
-                    "LinkedIn_Name": "",
-                    "Job_Title": "",
-                    "Company": "",
-                    "Confidence_Level": "NO",
-                    "Status": "Timeout"
-                }
-            
-            # Give some time for results to populate
-            time.sleep(2)
-            
-            # Extract profile results
-            profiles = self.extract_search_results()
-            
-            if profiles:
-                # Get the best match (first result for now)
-                best_profile = profiles[0]
-                
-                # Try to visit profile page for more detailed information
-                detailed_info = self.extract_detailed_profile_info(best_profile["url"])
-                
-                if detailed_info:
-                    best_profile.update(detailed_info)
-                
-                # Calculate confidence level based on matching criteria
-                confidence_level = self.calculate_confidence_level(email, name, best_profile)
-                
-                return {
-                    "LinkedIn_URL": best_profile.get("url", ""),
-                    "LinkedIn_Name": best_profile.get("name", ""),
-                    "Job_Title": best_profile.get("title", ""),
-                    "Company": best_profile.get("company", ""),
-                    "Confidence_Level": confidence_level,
-                    "Status": "Found"
-                }
-            else:
-                return {
-                    "LinkedIn_URL": "",
-                    "LinkedIn_Name": "",
-                    "Job_Title": "",
-                    "Company": "",
-                    "Confidence_Level": "NO",
-                    "Status": "Not Found"
-                }
-                
-        except Exception as e:
-            logger.error(f"Search error for {email}: {str(e)}")
-            return {
-                "LinkedIn_URL": "",
-                "LinkedIn_Name": "",
-                "Job_Title": "",
-                "Company": "",
-                "Confidence_Level": "NO",
-                "Status": f"Error: {str(e)}"
-            }
-
-    def extract_search_results(self) -> List[Dict[str, str]]:
-        """
-        Extract profile information from search results.
-        
-        Returns:
-            List of dictionaries with profile information
-        """
-        profiles = []
-        try:
-            # Find all profile result elements
-            result_elements = self.driver.find_elements(By.CSS_SELECTOR, ".entity-result__item")
-            
-            for result in result_elements:
-                try:
-                    # Extract profile URL
-                    link_element = result.find_element(By.CSS_SELECTOR, "a.app-aware-link")
-                    profile_url = link_element.get_attribute("href")
-                    
-                    # Extract name
-                    name_element = result.find_element(By.CSS_SELECTOR, ".entity-result__title-text a")
-                    name = name_element.text.strip()
-                    
-                    # Extract job title and company
-                    subtitle_element = result.find_element(By.CSS_SELECTOR, ".entity-result__primary-subtitle")
-                    subtitle_text = subtitle_element.text.strip()
-                    
-                    # Simple parsing for title and company
-                    title_parts = subtitle_text.split(' at ')
-                    job_title = title_parts[0] if title_parts else ""
-                    company = title_parts[1] if len(title_parts) > 1 else ""
-                    
-                    profiles.append({
-                        "url": profile_url,
-                        "name": name,
-                        "title": job_title,
-                        "company": company
-                    })
-                    
-                except NoSuchElementException:
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"Error extracting search results: {str(e)}")
-            
-        return profiles
-
-    def extract_detailed_profile_info(self, profile_url: str) -> Optional[Dict[str, str]]:
-        """
-        Extract detailed information from individual profile page.
-        
-        Args:
-            profile_url: URL of the LinkedIn profile
-            
-        Returns:
-            Dictionary with detailed profile information or None if failed
-        """
-        try:
-            # Enforce rate limiting before visiting profile
-            self.enforce_rate_limit()
-            
-            logger.info(f"Visiting profile: {profile_url}")
-            self.driver.get(profile_url)
-            
-            # Wait for profile to load
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".pv-top-card-profile-picture"))
-                )
-            except TimeoutException:
-                # Check if profile is private
-                try:
-                    private_check = self.driver.find_element(By.CSS_SELECTOR, ".profile-unavailable")
-                    if private_check:
-                        logger.info("Profile is private")
-                        return {"title": "Private Profile", "company": "Private", "status": "Private"}
-                except NoSuchElementException:
-                    logger.warning("Timeout loading profile page")
-                    return None
-            
-            time.sleep(2)  # Allow page to fully load
-            
-            detailed_info = {}
-            
-            # Extract job title
-            try:
-                job_title_element = self.driver.find_element(By.CSS_SELECTOR, ".text-body-medium")
-                detailed_info["title"] = job_title_element.text.strip()
-            except NoSuchElementException:
-                detailed_info["title"] = ""
-            
-            # Extract company
-            try:
-                company_element = self.driver.find_element(By.CSS_SELECTOR, ".pv-text-details__right-panel .inline-show-more-text")
-                detailed_info["company"] = company_element.text.strip()
-            except NoSuchElementException:
-                detailed_info["company"] = ""
-            
-            return detailed_info
-            
-        except Exception as e:
-            logger.error(f"Error extracting detailed profile info: {str(e)}")
-            return None
-
-    def normalize_name(self, name: str) -> str:
-        """
-        Normalize names for comparison by removing extra spaces and converting to lowercase.
-        
-        Args:
-            name: Name to normalize
-            
-        Returns:
-            Normalized name string
-        """
-        if not name:
-            return ""
-        # Remove extra spaces and convert to lowercase
-        return ' '.join(name.split()).lower()
-
-    def extract_email_domain(self, email: str) -> str:
-        """
-        Extract domain from email address.
-        
-        Args:
-            email: Email address
-            
-        Returns:
-            Domain part of email (lowercase)
-        """
-        if '@' not in email:
-            return ""
-        return email.split('@')[1].lower()
-
-    def extract_company_domain_hint(self, company: str) -> str:
-        """
-        Extract potential domain hint from company name.
-        
-        Args:
-            company: Company name
-            
-        Returns:
-            Potential domain hint (lowercase)
-        """
-        if not company:
-            return ""
-        
-        # Remove common company suffixes and get first word
-        company_lower = company.lower()
-        company_clean = re.sub(r'\b(inc|llc|ltd|corp|corporation|company|co|group|holdings|technologies|tech)\b', '', company_lower)
-        company_clean = re.sub(r'[^\w\s]', '', company_clean)  # Remove punctuation
-        company_clean = ' '.join(company_clean.split())  # Remove extra spaces
-        
-        # Get first meaningful word as domain hint
-        words = company_clean.split()
-        return words[0] if words else ""
-
-    def is_product_role(self, job_title: str) -> bool:
-        """
-        Check if job title contains product-related terms.
-        
-        Args:
-            job_title: Job title to check
-            
-        Returns:
-            True if job title contains product-related terms
-        """
-        if not job_title:
-            return False
-        
-        product_keywords = [
-            'product', 'pm', 'product manager', 'product owner', 
-            'product lead', 'product director', 'head of product',
-            'vp product', 'product marketing', 'product management'
-        ]
-        
-        job_lower = job_title.lower()
-        return any(keyword in job_lower for keyword in product_keywords)
-
-    def names_match(self, search_name: str, profile_name: str) -> bool:
-        """
-        Check if names match reasonably well.
-        
-        Args:
-            search_name: Name from search input
-            profile_name: Name from LinkedIn profile
-            
-        Returns:
-            True if names match reasonably well
-        """
-        if not search_name or not profile_name:
-            return False
-        
-        search_normalized = self.normalize_name(search_name)
-        profile_normalized = self.normalize_name(profile_name)
-        
-        # Exact match
-        if search_normalized == profile_normalized:
-            return True
-        
-        # Check if search name is contained in profile name or vice versa
-        if search_normalized in profile_normalized or profile_normalized in search_normalized:
-            return True
-        
-        # Check for common name variations (first name match)
-        search_first = search_normalized.split()[0] if search_normalized else ""
-        profile_first = profile_normalized.split()[0] if profile_normalized else ""
-        
-        return search_first == profile_first
-
-    def calculate_confidence_level(self, email: str, search_name: str, profile: Dict[str, str]) -> str:
-        """
-        Calculate confidence level based on matching criteria.
-        
-        Confidence Criteria:
-        HIGH: Email domain matches company AND name matches AND job title contains "Product"
-        MEDIUM: Name matches AND job contains "Product" OR email domain matches company
-        LOW: Name matches only OR partial match with product role
-        NO: No reasonable match
-        
-        Args:
-            email: Original email
-            search_name: Original name from search
-            profile: Extracted profile information
-            
-        Returns:
-            Confidence level: "HIGH", "MEDIUM", "LOW", or "NO"
-        """
-        profile_name = profile.get("name", "")
-        job_title = profile.get("title", "")
-        company = profile.get("company", "")
-        
-        # Extract domain information
-        email_domain = self.extract_email_domain(email)
-        company_domain_hint = self.extract_company_domain_hint(company)
-        
-        # Check domain match
-        domain_matches = email_domain and company_domain_hint and email_domain.startswith(company_domain_hint)
-        
-        # Check name match
-        name_matches = self.names_match(search_name, profile_name)
-        
-        # Check product role
-        has_product_role = self.is_product_role(job_title)
-        
-        # Apply confidence criteria
-        if domain_matches and name_matches and has_product_role:
-            logger.info(f"HIGH confidence: Domain matches, name matches, product role found for {email}")
-            return "HIGH"
-        
-        elif (name_matches and has_product_role) or domain_matches:
-            logger.info(f"MEDIUM confidence: Name+Product or Domain match for {email}")
-            return "MEDIUM"
-        
-        elif name_matches:
-            logger.info(f"LOW confidence: Name matches only for {email}")
-            return "LOW"
-        
-        else:
-            logger.info(f"NO confidence: No reasonable match for {email}")
-            return "NO"
 
-    def close(self):
-        """Close the WebDriver."""
-        if self.driver:
-            self.driver.quit()
-            logger.info("WebDriver closed")
+# Handlers are set up by configure_logging() when run as a script, not on import.
+# Named explicitly so stage levels also apply when this file runs as __main__.
+logger = logging.getLogger("linkedin_matcher")
+progress_logger = logging.getLogger("linkedin_matcher.progress")
 
-def read_input_csv(file_path: str) -> List[Dict[str, str]]:
-    """
-    Read the input CSV file containing email addresses and optional names.
-    
-    Args:
-        file_path: Path to the input CSV file
-        
-    Returns:
-        List of dictionaries representing each row in the CSV
-        
-    Raises:
-        FileNotFoundError: If the input file doesn't exist
-        ValueError: If the CSV format is invalid
-    """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Input file not found: {file_path}")
-    
-    data = []
-    try:
-        with open(file_path, 'r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            # Check if required 'Email' column exists
-            if 'Email' not in reader.fieldnames:
-                raise ValueError("Input CSV must contain an 'Email' column")
-            
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 since header is row 1
-                if not row['Email'].strip():
-                    logger.warning(f"Empty email found in row {row_num}, skipping")
-                    continue
-                    
-                data.append({
-                    'Email': row['Email'].strip(),
-                    'Name': row.get('Name', '').strip() if row.get('Name') else ''
-                })
-                
-        logger.info(f"Successfully read {len(data)} records from {file_path}")
-        return data
-    
-    except Exception as e:
-        logger.error(f"Error reading input CSV: {str(e)}")
-        raise
-
-def get_processed_emails(output_file: str) -> Set[str]:
-    """
-    Get set of already processed emails from output file.
-    
-    Args:
-        output_file: Path to the output CSV file
-        
-    Returns:
-        Set of email addresses that have already been processed
-    """
-    if not os.path.exists(output_file):
-        return set()
-    
-    processed_emails = set()
-    try:
-        with open(output_file, 'r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if 'Email' in row and row['Email']:
-                    processed_emails.add(row['Email'].strip())
-                    
-        logger.info(f"Found {len(processed_emails)} already processed emails")
-        return processed_emails
-    
-    except Exception as e:
-        logger.error(f"Error reading output CSV for resume capability: {str(e)}")
-        return set()
+# Names served from linkedin_browser on first access, see __getattr__
+BROWSER_NAMES = ("LinkedInMatcher", "PageReadiness", "EXTRACTION_MODES", "LINKEDIN_BASE_URL",
+                 "CONFIDENCE_REASONS", "summarize_timings")
 
-def initialize_output_file(output_file: str):
-    """
-    Create output CSV file with headers if it doesn't exist.
-    
-    Args:
-        output_file: Path to the output CSV file
-    """
-    if not os.path.exists(output_file):
-        try:
-            with open(output_file, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS)
-                writer.writeheader()
-            logger.info(f"Created new output file: {output_file}")
-        except Exception as e:
-            logger.error(f"Error creating output file: {str(e)}")
-            raise
+def __getattr__(name: str):
+    """Import the browser layer only when one of its names is first used."""
+    if name in BROWSER_NAMES:
+        import linkedin_browser
+        return getattr(linkedin_browser, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def update_output_file(output_file: str, data: List[Dict[str, str]]):
-    """
-    Append data to the output CSV file.
-    
-    Args:
-        output_file: Path to the output CSV file
-        data: List of dictionaries to write to the file
-    """
-    try:
-        with open(output_file, 'a', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS)
-            writer.writerows(data)
-        logger.info(f"Successfully wrote {len(data)} records to {output_file}")
-    except Exception as e:
-        logger.error(f"Error writing to output file: {str(e)}")
-        raise
+# Seconds between metrics snapshots sent as progress events
+METRICS_INTERVAL = 10.0
 
 def get_linkedin_credentials() -> tuple:
     """
@@ -641,7 +54,8 @@ def get_linkedin_credentials() -> tuple:
     if not linkedin_email or not linkedin_password:
         print("\n=== LinkedIn Credentials Required ===")
         print("Please enter your LinkedIn login credentials")
-        print("(Credentials are only used for this session and not stored)")
+        print("(Your password is not stored, but the signed-in session - cookies and Chrome profile -")
+        print(f" is saved in {DEFAULT_SESSION_DIR}/ between runs; delete that directory to sign out)")
         print("======================================")
         
         linkedin_email = input("LinkedIn Email: ").strip()
@@ -649,101 +63,265 @@ def get_linkedin_credentials() -> tuple:
     
     return linkedin_email, linkedin_password
 
-def process_linkedin_profiles(input_file: str, output_file: str):
+def process_linkedin_profiles(input_file: str, output_file: str, cache_file: Optional[str] = DEFAULT_CACHE_FILE,
+                              cache_ttl: float = DEFAULT_CACHE_TTL, profile_ttl: float = DEFAULT_PROFILE_TTL,
+                              fsync_policy: str = "batch", progress: Optional[ProgressReporter] = None,
+                              extraction_mode: str = "script", matcher_options: Optional[Dict] = None,
+                              searches_per_hour: float = DEFAULT_SEARCHES_PER_HOUR,
+                              profile_views_per_hour: float = DEFAULT_PROFILE_VIEWS_PER_HOUR,
+                              page_loads_per_hour: Optional[float] = DEFAULT_PAGE_LOADS_PER_HOUR,
+                              rate_limit_strategy: str = "token_bucket",
+                              session_dir: Optional[str] = DEFAULT_SESSION_DIR,
+                              trace_file: Optional[str] = None) -> Dict:
     """
     Main function to process LinkedIn profile matching.
     
     Args:
         input_file: Path to the input CSV file
         output_file: Path to the output CSV file
+        cache_file: Path to the persistent lookup cache, or None to disable caching
+        cache_ttl: Seconds a cached search result stays valid
+        profile_ttl: Seconds a cached profile page stays valid
+        fsync_policy: Output durability policy, see ResultWriter
+        progress: Optional reporter for machine-readable progress events
+        extraction_mode: Page extraction strategy, see LinkedInMatcher
+        matcher_options: Extra LinkedInMatcher keyword arguments, e.g. headless,
+            base_url or clock
+        searches_per_hour: Budget for people searches
+        profile_views_per_hour: Budget for profile page visits
+        page_loads_per_hour: Combined budget for both, or None for no combined limit
+        rate_limit_strategy: "token_bucket" or "sliding_window", see rate_limit
+        session_dir: Directory for the cached driver path, browser profile and
+            saved cookies, or None to resolve the driver and log in every run
+        trace_file: Path to write per-record spans to as a Chrome trace, or
+            None to leave tracing off
+        
+    Returns:
+        Run summary with row, search and page-load counts, per-stage timings
+        and, when caching is on, lookup and profile cache hits and misses
     """
+    run_start = time.perf_counter()
+    progress = progress or ProgressReporter()
+    metrics = (matcher_options or {}).get("metrics") or MatcherMetrics()
+    # Trace on the matcher's clock so a virtual clock's skipped waits keep their length
+    clock = (matcher_options or {}).get("clock")
+    tracer = make_tracer(bool(trace_file), clock.time if clock else None)
+    summary = {"rows_written": 0, "searches": 0}
     matcher = None
+    plan = None
+    checkpoint = None
+    lookup_cache = None
+    profile_cache = None
     try:
-        # Read input data
-        input_data = read_input_csv(input_file)
-        
         # Initialize output file if needed
         initialize_output_file(output_file)
         
-        # Get already processed emails for resume capability
-        processed_emails = get_processed_emails(output_file)
+        # Open the resume checkpoint: input position plus an index of processed emails
+        checkpoint = ResumeCheckpoint(output_file, input_file)
         
-        # Filter out already processed emails
-        pending_data = [row for row in input_data if row['Email'] not in processed_emails]
+        # Plan searches in one streaming pass before the browser starts so
+        # duplicate rows share one search
+        plan = SearchPlan(InputReader(input_file, checkpoint, start_offset=checkpoint.input_offset,
+                                      start_row=checkpoint.row_number))
         
-        if not pending_data:
+        if not plan.total_rows:
             logger.info("All emails have already been processed. Nothing to do.")
-            return
-        
-        logger.info(f"Processing {len(pending_data)} new records (skipping {len(input_data) - len(pending_data)} already processed)")
-        
-        # Get LinkedIn credentials
-        linkedin_email, linkedin_password = get_linkedin_credentials()
-        
-        if not linkedin_email or not linkedin_password:
-            logger.error("LinkedIn credentials are required")
-            return
+            progress.emit("complete", rows_written=0)
+            return summary
+        
+        logger.info("Processing %s new records (skipping %s already processed emails)",
+                    plan.total_rows, checkpoint.processed_count())
+        logger.info("Search plan: %s searches for %s rows (%s searches saved by deduplication)",
+                    plan.search_count, plan.total_rows, plan.saved_searches)
+        
+        # Estimate the run under the rate budgets before any page is loaded
+        options = {
+            "headless": False,  # Set to False for debugging, True for production
+            "extraction_mode": extraction_mode,
+            **(matcher_options or {}),
+            "metrics": metrics,
+            "tracer": tracer
+        }
+        if not options.get("rate_limiter"):
+            options["rate_limiter"] = RateLimitScheduler.from_budgets(
+                searches_per_hour, profile_views_per_hour, strategy=rate_limit_strategy, clock=options.get("clock"),
+                page_loads_per_hour=page_loads_per_hour
+            )
+        estimate = options["rate_limiter"].plan(plan.search_count)
+        summary["estimate"] = estimate
+        logger.info("Estimated completion in %.1f hours (%s searches, ~%s profile views, "
+                    "limited by %s); cached searches finish sooner", estimate['seconds'] / 3600,
+                    estimate['searches'], estimate['profile_views'], estimate['bottleneck'])
+        progress.emit("plan", total_rows=plan.total_rows, searches=plan.search_count,
+                      saved_searches=plan.saved_searches, estimated_seconds=estimate["seconds"],
+                      finish_time=estimate["finish_time"])
+        
+        # Open the persistent lookup and profile caches shared across runs
+        if cache_file:
+            lookup_cache = LookupCache(cache_file, ttl_seconds=cache_ttl)
+            profile_cache = ProfileCache(cache_file, ttl_seconds=profile_ttl)
         
         # Initialize LinkedIn matcher
-        matcher = LinkedInMatcher(headless=False)  # Set to False for debugging, True for production
+        options.setdefault("lookup_cache", lookup_cache)
+        options.setdefault("profile_cache", profile_cache)
+        if session_dir and not options.get("session_store"):
+            options["session_store"] = SessionStore(session_dir)
+        # Selenium is only imported now that there is work for the browser
+        from linkedin_browser import LinkedInMatcher
+        matcher = LinkedInMatcher(**options)
         matcher.setup_driver()
         
-        # Login to LinkedIn
-        if not matcher.login_to_linkedin(linkedin_email, linkedin_password):
-            logger.error("Failed to login to LinkedIn. Exiting.")
-            return
-        
-        # Process each pending record
-        for i, record in enumerate(pending_data, start=1):
-            email = record['Email']
-            name = record['Name']
-            
-            logger.info(f"Processing {i}/{len(pending_data)}: {email}")
-            
-            # Search for LinkedIn profile
-            profile_info = matcher.search_linkedin_profile(email, name)
-            
-            if profile_info:
-                output_record = {
-                    "Email": email,
-                    "Name": name,
-                    **profile_info
-                }
-            else:
-                output_record = {
-                    "Email": email,
-                    "Name": name,
-                    "LinkedIn_URL": "",
-                    "LinkedIn_Name": "",
-                    "Job_Title": "",
-                    "Company": "",
-                    "Confidence_Level": "NO",
-                    "Status": "Search Failed"
-                }
-            
-            # Update output file with this record
-            update_output_file(output_file, [output_record])
-            
-            # Log progress
-            progress = (i / len(pending_data)) * 100
-            logger.info(f"Progress: {progress:.1f}% ({i}/{len(pending_data)})")
-        
+        # Reuse the previous session; credentials are only needed when it has expired
+        if not matcher.restore_session():
+            linkedin_email, linkedin_password = get_linkedin_credentials()
+            
+            if not linkedin_email or not linkedin_password:
+                logger.error("LinkedIn credentials are required")
+                progress.emit("error", message="LinkedIn credentials are required")
+                return summary
+            
+            # Login to LinkedIn
+            login_start = time.perf_counter()
+            logged_in = matcher.login_to_linkedin(linkedin_email, linkedin_password)
+            matcher.startup_timings["login"] = time.perf_counter() - login_start
+            if not logged_in:
+                logger.error("Failed to login to LinkedIn. Exiting.")
+                progress.emit("error", message="Failed to login to LinkedIn")
+                return summary
+        
+        stages = ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in matcher.startup_timings.items())
+        startup = {stage: round(seconds, 3) for stage, seconds in matcher.startup_timings.items()}
+        startup["time_to_first_search"] = round(time.perf_counter() - run_start, 3)
+        summary["startup"] = startup
+        logger.info("Time to first search: %.1fs (%s)", startup['time_to_first_search'], stages)
+        progress.emit("ready", **startup)
+        
+        # Stream the input again, searching each planned key once and fanning
+        # the result out to every matching row
+        searches_done = 0
+        reader = InputReader(input_file, checkpoint, warn_empty=False, start_offset=checkpoint.input_offset,
+                             start_row=checkpoint.row_number)
+        last_metrics_time = time.time()
+        with ResultWriter(output_file, checkpoint, fsync_policy=fsync_policy, metrics=metrics) as writer:
+            for record in reader:
+                with tracer.span("record", row_number=reader.row_number) as span:
+                    email = record['Email']
+                    name = record['Name']
+                    if tracer.enabled:
+                        # Identify the row by its hash so traces can be shared without the address
+                        span.set(email_hash=hash_email(email).hex())
+                    
+                    already_searched, profile_info = plan.take_result(record)
+                    span.set(deduplicated=already_searched)
+                    if not already_searched:
+                        searches_done += 1
+                        summary["searches"] = searches_done
+                        progress_logger.info("Processing %s/%s: %s", searches_done, plan.search_count, email)
+                        progress.emit("searching", processed=searches_done - 1, total=plan.search_count, email=email)
+                        
+                        # Search for LinkedIn profile
+                        profile_info = matcher.search_linkedin_profile(email, name)
+                        plan.store_result(record, profile_info)
+                    else:
+                        metrics.searches.inc(source="deduplicated")
+                    
+                    # Buffer this record; the writer commits the checkpoint when it flushes
+                    output_record = build_output_record(record, profile_info)
+                    with tracer.span("output_write"):
+                        writer.write(output_record, reader.offset, reader.row_number)
+                    metrics.record_result(output_record["Status"], output_record["Confidence_Level"])
+                    
+                    if time.time() - last_metrics_time >= METRICS_INTERVAL:
+                        progress.emit("metrics", metrics=metrics.snapshot())
+                        last_metrics_time = time.time()
+                    
+                    if not already_searched:
+                        # Log progress
+                        percent = (searches_done / plan.search_count) * 100
+                        progress_logger.info("Progress: %.1f%% (%s/%s)", percent, searches_done, plan.search_count)
+                        progress.emit("record", processed=searches_done, total=plan.search_count, email=email,
+                                      status=profile_info.get("Status", "") if profile_info else "Search Failed",
+                                      confidence=profile_info.get("Confidence_Level", "NO") if profile_info else "NO",
+                                      progress=percent)
+        
+        summary["rows_written"] = writer.rows_written
+        logger.info("Wrote %s records to %s", writer.rows_written, output_file)
+        progress.emit("complete", rows_written=writer.rows_written)
         logger.info("Processing complete!")
+        return summary
         
     except Exception as e:
-        logger.error(f"Error during processing: {str(e)}")
+        logger.error("Error during processing: %s", e)
+        progress.emit("error", message=str(e))
         raise
     finally:
+        progress.emit("metrics", metrics=metrics.snapshot())
+        progress.close()
+        if trace_file:
+            tracer.export(trace_file)
+            logger.info("Wrote trace to %s", trace_file)
+        if plan:
+            plan.close()
+        if checkpoint:
+            checkpoint.close()
+        if lookup_cache:
+            summary["lookup_cache"] = {"hits": lookup_cache.hits, "misses": lookup_cache.misses}
+            logger.info("Lookup cache: %s hits, %s misses", lookup_cache.hits, lookup_cache.misses)
+            lookup_cache.close()
+        if profile_cache:
+            summary["profile_cache"] = {"hits": profile_cache.hits, "misses": profile_cache.misses}
+            logger.info("Profile cache: %s hits, %s misses", profile_cache.hits, profile_cache.misses)
+            profile_cache.close()
         if matcher:
             matcher.close()
+            summary.update(matcher.stats())
+            # The readiness waits replaced a fixed 2 second sleep each
+            for label, timing in summary["readiness"].items():
+                logger.info("Readiness '%s': %s waits, mean %.2fs, %.1fs saved versus fixed sleeps",
+                            label, timing['count'], timing['mean'], 2 * timing['count'] - timing['total'])
+            for label, timing in summary["extraction"].items():
+                logger.info("Extraction '%s' (%s mode): %s pages, mean %.0fms per page",
+                            label, matcher.extraction_mode, timing['count'], timing['mean'] * 1000)
+            logger.info("Page loads: %s (%s profile visits skipped by candidate ranking)",
+                        matcher.page_loads, matcher.detail_visits_skipped)
+            if matcher.transfer_sizes:
+                logger.info("Transferred %.0f KB per page (%.1f MB total%s)",
+                            summary['transfer_bytes']['mean'] / 1024, summary['transfer_bytes']['total'] / 1024 / 1024,
+                            ', lean mode' if matcher.lean else '')
+
+def handle_termination(signum, frame):
+    """Turn SIGTERM into SystemExit so open files are flushed and the browser is closed."""
+    logger.info("Termination requested; closing the browser and flushing results")
+    raise SystemExit(128 + signum)
 
 if __name__ == "__main__":
     # Default file paths
     INPUT_FILE = "input_emails.csv"
     OUTPUT_FILE = "linkedin_results.csv"
     
+    parser = argparse.ArgumentParser(description="Match email addresses to LinkedIn profiles")
+    parser.add_argument("input_file", nargs="?", default=INPUT_FILE, help="CSV with Email and Name columns")
+    parser.add_argument("output_file", nargs="?", default=OUTPUT_FILE, help="Results CSV, appended to on resume")
+    parser.add_argument("--company-index", default=DEFAULT_COMPANY_INDEX_FILE,
+                        help="Company-to-domain table built with company_index.py")
+    parser.add_argument("--log-level", default="INFO", help="Log level for everything without a stage level")
+    parser.add_argument("--stage-log-level", action="append", default=[], metavar="STAGE=LEVEL",
+                        help="Log level for one stage, e.g. scoring=WARNING (repeatable)")
+    parser.add_argument("--log-file", default=DEFAULT_LOG_FILE, help="JSON-lines log file")
+    parser.add_argument("--trace", metavar="FILE", help="Write per-record spans as a Chrome trace (chrome://tracing, Perfetto)")
+    args = parser.parse_args()
+    
+    try:
+        stage_levels = parse_stage_levels(args.stage_log_level)
+    except ValueError as e:
+        parser.error(str(e))
+    configure_logging(args.log_level, stage_levels, args.log_file)
+    signal.signal(signal.SIGTERM, handle_termination)
+    use_company_index(args.company_index)
+    
     try:
-        process_linkedin_profiles(INPUT_FILE, OUTPUT_FILE)
+        process_linkedin_profiles(args.input_file, args.output_file, progress=ProgressReporter.from_environment(),
+                                  trace_file=args.trace)
     except Exception as e:
-        logger.error(f"Application failed: {str(e)}")
-        exit(1)
\ No newline at end of file
+        logger.error("Application failed: %s", e)
+        exit(1)
@@ -0,0 +1,128 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, Optional
+
+# Log file written by the matcher CLI, one JSON object per line
+DEFAULT_LOG_FILE = "linkedin_matcher.log"
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Loggers of the per-record stages whose verbosity can be set on their own
+STAGE_LOGGERS = {
+    "rate_limit": "rate_limit",
+    "search": "linkedin_matcher.search",
+    "profile": "linkedin_matcher.profile",
+    "extraction": "linkedin_matcher.extraction",
+    "scoring": "linkedin_matcher.scoring",
+    "output": "linkedin_matcher.output",
+    "progress": "linkedin_matcher.progress"
+}
+
+# LogRecord attributes that are not caller-supplied extra fields
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Render a record as one JSON object.
+
+        Fields passed via extra= are included alongside time, level, logger
+        and message.
+
+        Args:
+            record: Record to render
+
+        Returns:
+            JSON text without a trailing newline
+        """
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Enqueue the record untouched.
+
+        QueueHandler.prepare merges the message arguments in the calling
+        thread so records can be pickled; the queue here never leaves the
+        process, so formatting is left entirely to the listener thread.
+        """
+        return record
+
+
+def parse_stage_levels(values: Iterable[str]) -> Dict[str, str]:
+    """
+    Parse STAGE=LEVEL settings, e.g. from repeated --stage-log-level flags.
+
+    Args:
+        values: Settings such as "scoring=WARNING"
+
+    Returns:
+        Level name for each stage
+
+    Raises:
+        ValueError: If a setting is malformed or names an unknown stage
+    """
+    levels = {}
+    for value in values:
+        stage, separator, level = value.partition('=')
+        if not separator or stage not in STAGE_LOGGERS:
+            raise ValueError(f"Stage log levels must look like STAGE=LEVEL with STAGE one of {', '.join(STAGE_LOGGERS)}")
+        levels[stage] = level.upper()
+    return levels
+
+
+def configure_logging(level: str = "INFO", stage_levels: Optional[Dict[str, str]] = None,
+                      log_file: Optional[str] = DEFAULT_LOG_FILE) -> QueueListener:
+    """
+    Route all logging through a queue to a background listener thread.
+
+    Callers only put records on the queue; message formatting, JSON encoding
+    and file writes happen on the listener thread. The console keeps the
+    readable format while the log file gets one JSON object per line.
+    Replaces any handlers already on the root logger.
+
+    Args:
+        level: Root log level
+        stage_levels: Level per stage, overriding the root level (see STAGE_LOGGERS)
+        log_file: Path of the JSON log file, or None to log to the console only
+
+    Returns:
+        The started listener; it is stopped, flushing queued records, at exit
+    """
+    handlers = [logging.StreamHandler(sys.stderr)]
+    handlers[0].setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(level.upper())
+    for stage, stage_level in (stage_levels or {}).items():
+        logging.getLogger(STAGE_LOGGERS[stage]).setLevel(stage_level.upper())
+
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,479 @@
+import csv
+import os
+import logging
+import time
+import json
+import sqlite3
+from typing import List, Dict, Set, Optional, Tuple, Iterable, Iterator
+from checkpoint import ResumeCheckpoint
+from input_csv import validate_header, clean_row
+from metrics import MatcherMetrics
+from linkedin_cache import make_lookup_key
+
+# Input, output and progress handling of linkedin_matcher, free of browser
+# dependencies. Logs under linkedin_matcher so its log levels still apply.
+logger = logging.getLogger("linkedin_matcher")
+output_logger = logging.getLogger("linkedin_matcher.output")
+
+# Define the output CSV columns
+OUTPUT_COLUMNS = [
+    "Email", 
+    "Name", 
+    "LinkedIn_URL", 
+    "LinkedIn_Name", 
+    "Job_Title", 
+    "Company", 
+    "Confidence_Level", 
+    "Status"
+]
+
+# Output writer batching and durability defaults
+DEFAULT_WRITE_BATCH_SIZE = 10
+DEFAULT_FLUSH_INTERVAL = 30.0
+FSYNC_POLICIES = ("always", "batch", "never")
+
+# Environment variable naming an inherited file descriptor for JSON-lines progress events
+PROGRESS_FD_ENV = "LINKEDIN_PROGRESS_FD"
+
+class ProgressReporter:
+    def __init__(self, fd: Optional[int] = None):
+        """
+        Emit machine-readable progress events as JSON lines.
+        
+        Each event is one JSON object per line with an "event" name and a
+        "time" stamp. Without a file descriptor every call is a no-op.
+        
+        Args:
+            fd: File descriptor to write events to (usually a pipe from the parent)
+        """
+        self.stream = os.fdopen(fd, 'w', buffering=1, encoding='utf-8') if fd is not None else None
+    
+    @classmethod
+    def from_environment(cls) -> "ProgressReporter":
+        """Create a reporter for the descriptor named by LINKEDIN_PROGRESS_FD, if set."""
+        fd = os.environ.get(PROGRESS_FD_ENV)
+        return cls(int(fd) if fd and fd.isdigit() else None)
+    
+    def emit(self, event: str, **fields):
+        """
+        Write one progress event.
+        
+        Args:
+            event: Event name, e.g. "plan", "record" or "complete"
+            **fields: JSON-serializable event attributes
+        """
+        if not self.stream:
+            return
+        try:
+            self.stream.write(json.dumps({"event": event, "time": time.time(), **fields}) + "\n")
+        except (BrokenPipeError, OSError) as e:
+            # The consumer went away; keep processing without progress events
+            logger.warning("Progress channel closed: %s", e)
+            self.stream = None
+    
+    def close(self):
+        """Close the progress stream."""
+        if self.stream:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+            self.stream = None
+
+class InputReader:
+    def __init__(self, file_path: str, processed_emails=None, warn_empty: bool = True,
+                 start_offset: int = 0, start_row: int = 1):
+        """
+        Lazily read and validate the input CSV one row at a time.
+        
+        Memory use does not depend on the size of the input file. While
+        iterating, `offset` and `row_number` describe the position just past the
+        last yielded row, so a run can later resume from exactly that point.
+        
+        Args:
+            file_path: Path to the input CSV file
+            processed_emails: Container of emails to skip because they were already
+                processed (a set or a ResumeCheckpoint)
+            warn_empty: Whether to log a warning for rows with an empty email
+            start_offset: Byte offset to resume reading from (0 starts after the header)
+            start_row: Row number of the last row before start_offset (the header is row 1)
+        """
+        self.file_path = file_path
+        self.processed_emails = processed_emails
+        self.warn_empty = warn_empty
+        self.offset = start_offset
+        self.row_number = start_row
+    
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        """
+        Yield validated input rows.
+        
+        Yields:
+            Dictionaries with 'Email' and 'Name' keys
+            
+        Raises:
+            FileNotFoundError: If the input file doesn't exist
+            ValueError: If the CSV format is invalid
+        """
+        if not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"Input file not found: {self.file_path}")
+        
+        with open(self.file_path, 'rb') as file:
+            line_end = [0]
+            
+            def lines():
+                # Track the byte offset after every physical line handed to the CSV reader
+                for line in iter(file.readline, b''):
+                    line_end[0] = file.tell()
+                    yield line.decode('utf-8')
+            
+            reader = csv.reader(lines())
+            fieldnames = validate_header(next(reader, None))
+            
+            if self.offset > line_end[0]:
+                file.seek(self.offset)
+            
+            for values in reader:
+                self.offset = line_end[0]
+                if not values:
+                    continue
+                self.row_number += 1
+                record = clean_row(fieldnames, values)
+                
+                if record is None:
+                    if self.warn_empty:
+                        logger.warning("Empty email found in row %s, skipping", self.row_number)
+                    continue
+                
+                if self.processed_emails is not None and record['Email'] in self.processed_emails:
+                    continue
+                    
+                yield record
+
+def iter_input_csv(file_path: str, processed_emails=None, warn_empty: bool = True) -> Iterator[Dict[str, str]]:
+    """
+    Lazily read and validate the input CSV one row at a time.
+    
+    Args:
+        file_path: Path to the input CSV file
+        processed_emails: Emails to skip because they were already processed
+        warn_empty: Whether to log a warning for rows with an empty email
+        
+    Returns:
+        Iterator over dictionaries with 'Email' and 'Name' keys
+    """
+    return iter(InputReader(file_path, processed_emails, warn_empty))
+
+def read_input_csv(file_path: str) -> List[Dict[str, str]]:
+    """
+    Read the input CSV file containing email addresses and optional names.
+    
+    Args:
+        file_path: Path to the input CSV file
+        
+    Returns:
+        List of dictionaries representing each row in the CSV
+        
+    Raises:
+        FileNotFoundError: If the input file doesn't exist
+        ValueError: If the CSV format is invalid
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Input file not found: {file_path}")
+    
+    try:
+        data = list(iter_input_csv(file_path))
+        logger.info("Successfully read %s records from %s", len(data), file_path)
+        return data
+    
+    except Exception as e:
+        logger.error("Error reading input CSV: %s", e)
+        raise
+
+def get_processed_emails(output_file: str) -> Set[str]:
+    """
+    Get set of already processed emails from output file.
+    
+    Args:
+        output_file: Path to the output CSV file
+        
+    Returns:
+        Set of email addresses that have already been processed
+    """
+    if not os.path.exists(output_file):
+        return set()
+    
+    processed_emails = set()
+    try:
+        with open(output_file, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                if 'Email' in row and row['Email']:
+                    processed_emails.add(row['Email'].strip())
+                    
+        logger.info("Found %s already processed emails", len(processed_emails))
+        return processed_emails
+    
+    except Exception as e:
+        logger.error("Error reading output CSV for resume capability: %s", e)
+        return set()
+
+def initialize_output_file(output_file: str):
+    """
+    Create output CSV file with headers if it doesn't exist.
+    
+    Args:
+        output_file: Path to the output CSV file
+    """
+    if not os.path.exists(output_file):
+        try:
+            with open(output_file, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS)
+                writer.writeheader()
+            logger.info("Created new output file: %s", output_file)
+        except Exception as e:
+            logger.error("Error creating output file: %s", e)
+            raise
+
+def update_output_file(output_file: str, data: List[Dict[str, str]]):
+    """
+    Append data to the output CSV file.
+    
+    Args:
+        output_file: Path to the output CSV file
+        data: List of dictionaries to write to the file
+    """
+    try:
+        with open(output_file, 'a', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS)
+            writer.writerows(data)
+        output_logger.debug("Successfully wrote %s records to %s", len(data), output_file)
+    except Exception as e:
+        output_logger.error("Error writing to output file: %s", e)
+        raise
+
+class ResultWriter:
+    def __init__(self, output_file: str, checkpoint: Optional[ResumeCheckpoint] = None,
+                 batch_size: int = DEFAULT_WRITE_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 fsync_policy: str = "batch", metrics: Optional[MatcherMetrics] = None):
+        """
+        Buffered, crash-safe writer for output rows.
+        
+        Rows are appended in batches and flushed when the batch is full or the
+        flush interval has passed. After each flush the checkpoint is
+        committed with the new output size and a hash of the rows before it,
+        which act as the commit marker: a crash mid-batch leaves bytes past the marker, and the checkpoint
+        discards them on the next start.
+        
+        Args:
+            output_file: Path to the output CSV file (must already have a header)
+            checkpoint: Optional resume checkpoint to commit after every flush
+            batch_size: Number of rows buffered before a flush
+            flush_interval: Maximum seconds a buffered row waits before a flush
+            fsync_policy: "always" to flush and fsync every row, "batch" to fsync
+                every flush, or "never" to leave syncing to the OS
+            metrics: Optional metrics to record each flush in as the output_write stage
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {FSYNC_POLICIES}")
+        
+        self.output_file = output_file
+        self.checkpoint = checkpoint
+        self.batch_size = 1 if fsync_policy == "always" else max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.metrics = metrics
+        self.file = None
+        self.writer = None
+        self.buffer = []
+        self.position = None
+        self.last_flush_time = time.time()
+        self.rows_written = 0
+        self.flush_failed = False
+    
+    def __enter__(self) -> "ResultWriter":
+        self.file = open(self.output_file, 'a', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=OUTPUT_COLUMNS)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            # A batch whose flush failed is not retried: it may be partly written already
+            if not self.flush_failed:
+                self.flush()
+        finally:
+            self.file.close()
+            self.file = None
+    
+    def write(self, record: Dict[str, str], input_offset: Optional[int] = None, row_number: Optional[int] = None):
+        """
+        Buffer one output row.
+        
+        Args:
+            record: Output row with OUTPUT_COLUMNS keys
+            input_offset: Input byte offset just past the row that produced this record
+            row_number: Input row number of the row that produced this record
+        """
+        self.buffer.append(record)
+        if input_offset is not None:
+            self.position = (input_offset, row_number)
+        
+        if len(self.buffer) >= self.batch_size or time.time() - self.last_flush_time >= self.flush_interval:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered rows, sync them per the fsync policy and commit the checkpoint."""
+        self.last_flush_time = time.time()
+        if not self.buffer:
+            return
+        
+        # Take the batch first so it is never written twice. If this flush is
+        # interrupted, its rows stay past the commit marker, and the input
+        # offset still points before them, so the next run redoes them.
+        batch, self.buffer = self.buffer, []
+        start_time = time.perf_counter()
+        try:
+            self.writer.writerows(batch)
+            self.file.flush()
+            if self.fsync_policy != "never":
+                os.fsync(self.file.fileno())
+            
+            if self.checkpoint and self.position:
+                self.checkpoint.commit([row['Email'] for row in batch], self.position[0],
+                                       self.position[1], os.fstat(self.file.fileno()).st_size)
+        except BaseException as e:
+            self.flush_failed = True
+            if isinstance(e, Exception):
+                output_logger.error("Error writing to output file: %s", e)
+            raise
+        
+        if self.metrics:
+            self.metrics.observe("output_write", time.perf_counter() - start_time)
+        self.rows_written += len(batch)
+        output_logger.debug("Flushed %s records to %s", len(batch), self.output_file)
+
+class SearchPlan:
+    def __init__(self, records: Iterable[Dict[str, str]]):
+        """
+        Count the distinct searches in a stream of input rows.
+        
+        Rows are keyed with the same normalization as the lookup cache, so
+        differences in casing or whitespace do not cause extra searches. Keys
+        and fan-out results live in a temporary on-disk SQLite database, so
+        memory stays bounded however large the input is.
+        
+        Args:
+            records: Pending input rows with 'Email' and 'Name' keys
+        """
+        # An empty path gives a private temporary database that is deleted on close
+        self.connection = sqlite3.connect("")
+        self.connection.execute(
+            "CREATE TABLE plan ("
+            "key TEXT PRIMARY KEY, "
+            "rows INTEGER NOT NULL, "
+            "remaining INTEGER NOT NULL DEFAULT 0, "
+            "searched INTEGER NOT NULL DEFAULT 0, "
+            "result TEXT)"
+        )
+        self.total_rows = 0
+        
+        batch = []
+        for record in records:
+            batch.append((make_lookup_key(record['Email'], record['Name']),))
+            self.total_rows += 1
+            if len(batch) >= 10000:
+                self._add_keys(batch)
+                batch = []
+        self._add_keys(batch)
+        
+        self.search_count = self.connection.execute("SELECT COUNT(*) FROM plan").fetchone()[0]
+    
+    def _add_keys(self, batch: List[Tuple[str]]):
+        """Insert a batch of keys, counting repeated rows."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO plan (key, rows) VALUES (?, 1) "
+                "ON CONFLICT(key) DO UPDATE SET rows = rows + 1",
+                batch
+            )
+    
+    @property
+    def saved_searches(self) -> int:
+        """Number of searches avoided by fanning results out to duplicate rows."""
+        return self.total_rows - self.search_count
+    
+    def take_result(self, record: Dict[str, str]) -> Tuple[bool, Optional[Dict[str, str]]]:
+        """
+        Return the stored result for a duplicate row whose key was already searched.
+        
+        Args:
+            record: Input row with 'Email' and 'Name' keys
+            
+        Returns:
+            Tuple of (already searched, search result)
+        """
+        key = make_lookup_key(record['Email'], record['Name'])
+        row = self.connection.execute(
+            "SELECT searched, remaining, result FROM plan WHERE key = ?", (key,)
+        ).fetchone()
+        if not row or not row[0]:
+            return False, None
+        
+        # Drop the stored result once the last duplicate has been written
+        with self.connection:
+            if row[1] <= 1:
+                self.connection.execute("UPDATE plan SET remaining = 0, result = NULL WHERE key = ?", (key,))
+            else:
+                self.connection.execute("UPDATE plan SET remaining = remaining - 1 WHERE key = ?", (key,))
+        return True, json.loads(row[2]) if row[2] else None
+    
+    def store_result(self, record: Dict[str, str], profile_info: Optional[Dict[str, str]]):
+        """
+        Remember a search result for the duplicate rows that follow.
+        
+        Args:
+            record: Input row that was searched
+            profile_info: Result of the search, or None if the search failed
+        """
+        key = make_lookup_key(record['Email'], record['Name'])
+        with self.connection:
+            self.connection.execute(
+                "UPDATE plan SET searched = 1, remaining = rows - 1, "
+                "result = CASE WHEN rows > 1 THEN ? END WHERE key = ?",
+                (json.dumps(profile_info) if profile_info else None, key)
+            )
+    
+    def close(self):
+        """Close and delete the temporary plan database."""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+def build_output_record(record: Dict[str, str], profile_info: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Combine an input row with its search result into an output row.
+    
+    Args:
+        record: Input row with 'Email' and 'Name' keys
+        profile_info: Result of the search, or None if the search failed
+        
+    Returns:
+        Dictionary with all OUTPUT_COLUMNS
+    """
+    if profile_info:
+        return {
+            "Email": record['Email'],
+            "Name": record['Name'],
+            **profile_info
+        }
+    return {
+        "Email": record['Email'],
+        "Name": record['Name'],
+        "LinkedIn_URL": "",
+        "LinkedIn_Name": "",
+        "Job_Title": "",
+        "Company": "",
+        "Confidence_Level": "NO",
+        "Status": "Search Failed"
+    }
+
@@ -0,0 +1,287 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from fast script calls to long rate-limit waits
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Stages of processing one record, in pipeline order
+STAGES = ("rate_limit_wait", "navigation", "readiness", "extraction", "detail_visit", "scoring", "output_write")
+
+# Output row statuses used as metric labels; any other status (e.g. "Error: <message>") counts as "Error"
+RESULT_STATUSES = ("Found", "Not Found", "Timeout", "Search Failed", "Error")
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        """
+        Base for labelled metrics.
+
+        Args:
+            name: Metric name in Prometheus format
+            help_text: One-line description
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def snapshot(self) -> Dict:
+        """Return a JSON-serializable copy of the metric."""
+        with self.lock:
+            samples = [[list(key), value] for key, value in self.samples.items()]
+        return {"type": self.kind, "help": self.help, "labels": list(self.labelnames), "samples": samples}
+
+    def merge(self, samples: List):
+        """Combine samples from another process's snapshot into this metric."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Return the metric in Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            for key, value in sorted(self.samples.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        """Add to the counter."""
+        key = self._key(labels)
+        with self.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+    def merge(self, samples: List):
+        for key, value in samples:
+            self.inc(value, **dict(zip(self.labelnames, key)))
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        """Set the gauge."""
+        with self.lock:
+            self.samples[self._key(labels)] = value
+
+    def merge(self, samples: List):
+        for key, value in samples:
+            self.set(value, **dict(zip(self.labelnames, key)))
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Distribution of observed values in fixed buckets.
+
+        Each sample is [count per bucket plus one overflow slot, sum, count].
+
+        Args:
+            name: Metric name in Prometheus format
+            help_text: One-line description
+            labelnames: Names of the labels every sample carries
+            buckets: Upper bounds of the buckets, ascending
+        """
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = self.samples[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            sample[0][index] += 1
+            sample[1] += value
+            sample[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of a with-block."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start_time, **labels)
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            samples = [[list(key), [list(counts), total, count]] for key, (counts, total, count) in self.samples.items()]
+        return {"type": self.kind, "help": self.help, "labels": list(self.labelnames),
+                "buckets": list(self.buckets), "samples": samples}
+
+    def merge(self, samples: List):
+        with self.lock:
+            for key, (counts, total, count) in samples:
+                key = tuple(key)
+                sample = self.samples.get(key)
+                if sample is None:
+                    sample = self.samples[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                sample[0] = [mine + theirs for mine, theirs in zip(sample[0], counts)]
+                sample[1] += total
+                sample[2] += count
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        bounds = [_format_number(bound) for bound in self.buckets] + ["+Inf"]
+        with self.lock:
+            for key, (counts, total, count) in sorted(self.samples.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+METRIC_TYPES = {
+    "counter": Counter,
+    "gauge": Gauge,
+    "histogram": Histogram
+}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Named metrics that can be snapshotted, merged across processes and rendered."""
+        self.metrics: Dict[str, Metric] = {}
+        self.lock = threading.Lock()
+
+    def _get(self, kind: str, name: str, help_text: str, labelnames: Sequence[str], **options) -> Metric:
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = METRIC_TYPES[kind](name, help_text, labelnames, **options)
+            elif metric.kind != kind:
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get("counter", name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get("gauge", name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram."""
+        return self._get("histogram", name, help_text, labelnames, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return every metric as JSON-serializable data, e.g. to send to another process."""
+        with self.lock:
+            metrics = list(self.metrics.items())
+        return {name: metric.snapshot() for name, metric in metrics}
+
+    def merge(self, snapshot: Dict[str, Dict]):
+        """
+        Add a snapshot from another registry: counters and histograms are
+        summed, gauges take the snapshot's value.
+
+        Args:
+            snapshot: Output of snapshot()
+        """
+        for name, data in snapshot.items():
+            options = {"buckets": data["buckets"]} if data["type"] == "histogram" else {}
+            metric = self._get(data["type"], name, data["help"], data["labels"], **options)
+            metric.merge(data["samples"])
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format."""
+        with self.lock:
+            metrics = sorted(self.metrics.items())
+        lines = []
+        for _, metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MatcherMetrics:
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        Metrics recorded while matching: per-stage latency, page loads,
+        search sources, rate budgets and results.
+
+        Args:
+            registry: Registry to record into (a new one by default)
+        """
+        self.registry = registry or MetricsRegistry()
+        self.stage_seconds = self.registry.histogram(
+            "linkedin_matcher_stage_seconds", "Seconds spent in each processing stage", ("stage", "page"))
+        self.page_loads = self.registry.counter(
+            "linkedin_matcher_page_loads_total", "Browser navigations", ("page",))
+        self.searches = self.registry.counter(
+            "linkedin_matcher_searches_total", "Searches by where the result came from", ("source",))
+        self.detail_visits_skipped = self.registry.counter(
+            "linkedin_matcher_detail_visits_skipped_total", "Profile visits skipped by candidate ranking")
+        self.results = self.registry.counter(
+            "linkedin_matcher_results_total", "Output rows by status and confidence level", ("status", "confidence"))
+        self.rate_budget = self.registry.gauge(
+            "linkedin_matcher_rate_budget_per_hour", "Configured rate budget", ("kind",))
+
+    def observe(self, stage: str, seconds: float, page: str = ""):
+        """
+        Record the duration of one stage.
+
+        Args:
+            stage: One of STAGES
+            seconds: Duration
+            page: Page kind the stage ran on, e.g. "search" or "profile"
+        """
+        self.stage_seconds.observe(seconds, stage=stage, page=page)
+
+    def time(self, stage: str, page: str = ""):
+        """Context manager recording the duration of a with-block as a stage."""
+        return self.stage_seconds.time(stage=stage, page=page)
+
+    def record_result(self, status: str, confidence: str):
+        """
+        Count one output row.
+
+        Args:
+            status: Status column of the row; error messages are folded into
+                "Error" so each message does not become its own series
+            confidence: Confidence level of the row
+        """
+        self.results.inc(status=status if status in RESULT_STATUSES else "Error", confidence=confidence)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return the underlying registry's snapshot."""
+        return self.registry.snapshot()
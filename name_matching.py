@@ -0,0 +1,281 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Sequence
+
+# Name match strengths, from no match to the same name
+NO_MATCH = 0
+FIRST_NAME_MATCH = 1
+FULL_NAME_MATCH = 2
+EXACT_MATCH = 3
+
+# Common nicknames and spelling variants, keyed by the formal first name
+NICKNAMES = {
+    'abigail': ('abby', 'abbie', 'gail'),
+    'alexander': ('alex', 'alec', 'alexandre', 'alejandro', 'sasha', 'xander'),
+    'alexandra': ('alex', 'alexa', 'alexis', 'lexi', 'sasha', 'sandra'),
+    'andrew': ('andy', 'drew', 'andre', 'andres', 'andreas'),
+    'anthony': ('tony', 'antonio', 'anton'),
+    'benjamin': ('ben', 'benny', 'benji'),
+    'catherine': ('cathy', 'kate', 'katie', 'kathy', 'cat', 'katherine', 'kathryn', 'katharine', 'caitlin'),
+    'charles': ('charlie', 'chuck', 'chas', 'carlos', 'karl', 'carl'),
+    'christina': ('chris', 'christine', 'kristina', 'kristine', 'tina', 'chrissy'),
+    'christopher': ('chris', 'topher', 'kit', 'kris', 'cristobal'),
+    'daniel': ('dan', 'danny', 'dani'),
+    'david': ('dave', 'davey', 'davy'),
+    'deborah': ('deb', 'debbie', 'debra'),
+    'dominic': ('dom', 'nick', 'dominick'),
+    'edward': ('ed', 'eddie', 'ted', 'ned', 'eduardo'),
+    'elizabeth': ('liz', 'lizzie', 'beth', 'betsy', 'betty', 'eliza', 'libby', 'elisabeth', 'elise', 'isabel'),
+    'emily': ('em', 'emmy', 'emilie', 'emilia'),
+    'frederick': ('fred', 'freddie', 'fritz', 'federico'),
+    'gabriel': ('gabe', 'gabby'),
+    'gregory': ('greg', 'gregg'),
+    'henry': ('hank', 'harry', 'hal', 'enrique', 'henri'),
+    'jacob': ('jake', 'jaime', 'jacques', 'kuba'),
+    'james': ('jim', 'jimmy', 'jamie', 'jimbo', 'diego', 'santiago'),
+    'jennifer': ('jen', 'jenny', 'jenn', 'jenna'),
+    'jessica': ('jess', 'jessie', 'jessi'),
+    'john': ('jon', 'johnny', 'jack', 'juan', 'johan', 'johannes', 'giovanni'),
+    'jonathan': ('jon', 'jonny', 'jonty'),
+    'joseph': ('joe', 'joey', 'jose', 'giuseppe', 'josef'),
+    'joshua': ('josh',),
+    'katherine': ('kate', 'katie', 'kathy', 'kat', 'kay', 'kitty', 'catherine', 'kathryn', 'katarina'),
+    'kenneth': ('ken', 'kenny'),
+    'lawrence': ('larry', 'laurence', 'lorenzo'),
+    'leonard': ('leo', 'len', 'lenny', 'leon'),
+    'margaret': ('maggie', 'meg', 'peggy', 'marge', 'margie', 'greta', 'margarita', 'rita', 'marjorie'),
+    'matthew': ('matt', 'matty', 'mateo', 'matteo', 'mathieu', 'matthias'),
+    'michael': ('mike', 'mikey', 'mick', 'mickey', 'miguel', 'michel', 'mikhail', 'misha'),
+    'nathaniel': ('nate', 'nathan', 'nat'),
+    'nicholas': ('nick', 'nicky', 'nico', 'nicolas', 'nikolai', 'klaus'),
+    'patricia': ('pat', 'patty', 'trish', 'tricia', 'patsy'),
+    'patrick': ('pat', 'paddy', 'rick', 'patricio'),
+    'peter': ('pete', 'pedro', 'pierre', 'piotr'),
+    'rebecca': ('becky', 'becca', 'beck'),
+    'richard': ('rich', 'rick', 'ricky', 'dick', 'ricardo'),
+    'robert': ('rob', 'robbie', 'bob', 'bobby', 'bert', 'roberto'),
+    'ronald': ('ron', 'ronnie'),
+    'samantha': ('sam', 'sammy'),
+    'samuel': ('sam', 'sammy', 'samuele'),
+    'sarah': ('sara', 'sally', 'sadie'),
+    'stephanie': ('steph', 'stef', 'stefanie'),
+    'stephen': ('steve', 'steven', 'stevie', 'stefan', 'esteban', 'etienne'),
+    'susan': ('sue', 'susie', 'suzanne', 'susanne', 'suzy'),
+    'theodore': ('ted', 'teddy', 'theo'),
+    'thomas': ('tom', 'tommy', 'tomas', 'tomasz'),
+    'timothy': ('tim', 'timmy'),
+    'victoria': ('vicky', 'tori', 'vic'),
+    'william': ('will', 'bill', 'billy', 'willy', 'liam', 'guillermo', 'wilhelm'),
+    'zachary': ('zach', 'zack', 'zak'),
+}
+
+# Titles, suffixes and credentials that are not part of the name itself
+NAME_AFFIXES = frozenset({
+    'mr', 'mrs', 'ms', 'miss', 'dr', 'prof', 'sir', 'jr', 'sr', 'ii', 'iii', 'iv',
+    'phd', 'mba', 'cpa', 'pmp', 'csm', 'cspo', 'esq', 'msc', 'bsc'
+})
+
+# Soundex consonant classes; vowels and h, w, y carry no code
+PHONETIC_CODES = {letter: str(code) for code, letters in enumerate(
+    ('', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r')) for letter in letters}
+
+# Leading spellings that sound alike, e.g. Katherine and Catherine
+PHONETIC_PREFIXES = (('ph', 'f'), ('kn', 'n'), ('wr', 'r'), ('c', 'k'), ('q', 'k'), ('z', 's'))
+
+# Consonant codes a phonetic key needs before it is trusted; shorter keys collide too often
+MIN_PHONETIC_CODES = 2
+
+NON_NAME_PATTERN = re.compile(r"[^a-z\s]")
+APOSTROPHE_PATTERN = re.compile(r"['’]")
+
+
+def _build_alias_groups() -> Dict[str, FrozenSet[str]]:
+    groups: Dict[str, set] = {}
+    for formal, variants in NICKNAMES.items():
+        for name in (formal,) + variants:
+            groups.setdefault(name, set()).add(formal)
+    return {name: frozenset(formals) for name, formals in groups.items()}
+
+
+# Formal first names each name or nickname can stand for
+ALIAS_GROUPS = _build_alias_groups()
+
+
+def fold_name(name: str) -> str:
+    """
+    Reduce a name to lowercase ASCII letters and single spaces.
+
+    Accents are removed, apostrophes dropped and other punctuation, digits
+    and emoji turned into spaces, so "José O'Brien-Smith 🚀" becomes
+    "jose obrien smith".
+
+    Args:
+        name: Name as entered or shown on a profile
+
+    Returns:
+        Folded name
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    ascii_name = ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    ascii_name = APOSTROPHE_PATTERN.sub('', ascii_name)
+    return ' '.join(NON_NAME_PATTERN.sub(' ', ascii_name).split())
+
+
+def phonetic_key(token: str) -> str:
+    """
+    Soundex-style key for one name token.
+
+    Unlike classic Soundex the first letter is normalized too, so Smith and
+    Smyth or Kowalski and Cowalski share a key. Only used for surnames: on
+    first names it conflates different people, e.g. Michael and Michelle.
+
+    Args:
+        token: Folded name token
+
+    Returns:
+        First sound followed by consonant codes, or "" when the token is too
+        short for the key to be distinctive
+    """
+    for prefix, sound in PHONETIC_PREFIXES:
+        if token.startswith(prefix):
+            token = sound + token[len(prefix):]
+            break
+    if not token:
+        return ""
+    codes = []
+    previous = PHONETIC_CODES.get(token[0], '')
+    for letter in token[1:].replace('ph', 'f'):
+        code = PHONETIC_CODES.get(letter, '')
+        if code and code != previous:
+            codes.append(code)
+        # h and w do not separate repeated consonants; vowels do
+        if letter not in 'hw':
+            previous = code
+    if len(codes) < MIN_PHONETIC_CODES:
+        return ""
+    return token[0] + ''.join(codes)
+
+
+def _first_name_features(token: str) -> FrozenSet[str]:
+    return frozenset({'n:' + token} | {'a:' + formal for formal in ALIAS_GROUPS.get(token, ())})
+
+
+def _last_name_features(token: str) -> FrozenSet[str]:
+    key = phonetic_key(token)
+    return frozenset({'n:' + token, 'p:' + key} if key else {'n:' + token})
+
+
+class NameKey:
+    __slots__ = ("normalized", "folded", "tokens", "token_set", "first", "last", "first_features", "last_features")
+
+    def __init__(self, name: str):
+        """
+        Normalized forms of one name, computed once and shared via name_key().
+
+        Args:
+            name: Name as entered or shown on a profile
+        """
+        # Plain lowercased form, kept for the original containment rule
+        self.normalized = ' '.join(name.split()).lower()
+        tokens = [token for token in fold_name(name).split() if token not in NAME_AFFIXES]
+        self.folded = ' '.join(tokens)
+        self.tokens = tuple(tokens)
+        self.token_set = frozenset(tokens)
+        self.first = tokens[0] if tokens else ""
+        self.last = tokens[-1] if len(tokens) > 1 else ""
+        # First names match exactly or through nicknames; surnames exactly or through spelling
+        self.first_features = _first_name_features(self.first) if self.first else frozenset()
+        self.last_features = _last_name_features(self.last) if self.last else frozenset()
+
+
+@lru_cache(maxsize=65536)
+def name_key(name: str) -> NameKey:
+    """Return the memoized NameKey for a name."""
+    return NameKey(name)
+
+
+def _initial_matches(initial: str, token: str) -> bool:
+    return len(initial) == 1 and token.startswith(initial)
+
+
+class NameMatcher:
+    def __init__(self, search_name: str):
+        """
+        Score profile names against one input name.
+
+        Every form the input could take (the name, first-name nicknames,
+        surname phonetic keys) is computed once, so scoring a candidate is a handful of set lookups
+        on the candidate's own memoized key.
+
+        Args:
+            search_name: Name from the input row
+        """
+        self.search_name = search_name
+        self.key = name_key(search_name)
+
+    def score(self, profile_name: str) -> int:
+        """
+        Score one profile name against the input name.
+
+        Args:
+            profile_name: Name on the LinkedIn profile or search result
+
+        Returns:
+            EXACT_MATCH for the same name (in any order), FULL_NAME_MATCH when
+            first and last names correspond or one name contains the other,
+            FIRST_NAME_MATCH when only the first name (or an initial plus the
+            surname) corresponds, otherwise NO_MATCH
+        """
+        search = self.key
+        profile = name_key(profile_name) if profile_name else None
+        # Blank or punctuation-only names match nothing
+        if not search.tokens or profile is None or not profile.tokens:
+            return NO_MATCH
+
+        if search.token_set == profile.token_set:
+            return EXACT_MATCH
+
+        if profile.normalized and (search.normalized in profile.normalized or profile.normalized in search.normalized):
+            return FULL_NAME_MATCH
+        if search.folded and profile.folded and (search.folded in profile.folded or profile.folded in search.folded):
+            return FULL_NAME_MATCH
+
+        first_matches = not search.first_features.isdisjoint(profile.first_features)
+        last_matches = bool(search.last_features) and not search.last_features.isdisjoint(profile.last_features)
+        if first_matches and last_matches:
+            return FULL_NAME_MATCH
+        # "Doe Jane" against "Jane Doe"
+        if (not search.first_features.isdisjoint(profile.last_features)
+                and not search.last_features.isdisjoint(profile.first_features)):
+            return FULL_NAME_MATCH
+        if first_matches:
+            return FIRST_NAME_MATCH
+        # "J. Doe" against "Jane Doe"
+        if last_matches and (_initial_matches(profile.first, search.first) or _initial_matches(search.first, profile.first)):
+            return FIRST_NAME_MATCH
+        return NO_MATCH
+
+    def matches(self, profile_name: str) -> bool:
+        """Whether the names match reasonably well."""
+        return self.score(profile_name) > NO_MATCH
+
+    def score_all(self, profile_names: Sequence[str]) -> List[int]:
+        """
+        Score every candidate on a results page in one pass.
+
+        Args:
+            profile_names: Candidate names
+
+        Returns:
+            Match strength for each name, in input order
+        """
+        score = self.score
+        return [score(profile_name) for profile_name in profile_names]
+
+
+@lru_cache(maxsize=4096)
+def name_matcher(search_name: str) -> NameMatcher:
+    """Return the memoized NameMatcher for an input name."""
+    return NameMatcher(search_name)
+
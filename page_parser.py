@@ -0,0 +1,229 @@
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+# Base for resolving relative profile links found in saved pages
+DEFAULT_BASE_URL = "https://www.linkedin.com/"
+
+# Elements that never have children or an end tag
+VOID_ELEMENTS = frozenset([
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr"
+])
+
+# Elements whose text is never rendered
+HIDDEN_ELEMENTS = frozenset(["script", "style", "template", "noscript"])
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "classes", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["Node"]):
+        """
+        Minimal element node built by PageTreeBuilder.
+
+        Args:
+            tag: Lowercase tag name
+            attrs: Element attributes
+            parent: Parent node, or None for the document root
+        """
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = frozenset((attrs.get("class") or "").split())
+        self.children = []
+        self.parent = parent
+
+    def iter(self) -> Iterable["Node"]:
+        """Yield every descendant element in document order."""
+        stack = list(reversed([child for child in self.children if isinstance(child, Node)]))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed([child for child in node.children if isinstance(child, Node)]))
+
+    def find_all(self, predicate: Callable[["Node"], bool]) -> List["Node"]:
+        """Return every descendant matching the predicate."""
+        return [node for node in self.iter() if predicate(node)]
+
+    def find(self, predicate: Callable[["Node"], bool]) -> Optional["Node"]:
+        """Return the first descendant matching the predicate, or None."""
+        return next((node for node in self.iter() if predicate(node)), None)
+
+    def text(self) -> str:
+        """Return the element's text with whitespace collapsed, like Selenium's .text."""
+        parts = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif item.tag not in HIDDEN_ELEMENTS:
+                stack.extend(reversed(item.children))
+        return ' '.join(''.join(parts).split())
+
+
+class PageTreeBuilder(HTMLParser):
+    def __init__(self):
+        """Build a Node tree from HTML, tolerating unclosed and stray end tags."""
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {}, None)
+        self.current = self.root
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.current = node
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self.current.children.append(Node(tag, {name: value or "" for name, value in attrs}, self.current))
+
+    def handle_endtag(self, tag: str):
+        # Close the nearest open element with this tag; ignore end tags that match nothing
+        node = self.current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.current = node.parent
+
+    def handle_data(self, data: str):
+        self.current.children.append(data)
+
+
+def parse_html(page_source: Union[str, bytes]) -> Node:
+    """
+    Parse a page into a Node tree.
+
+    Args:
+        page_source: HTML as text or UTF-8 bytes
+
+    Returns:
+        Document root node
+    """
+    if isinstance(page_source, bytes):
+        page_source = page_source.decode('utf-8', errors='replace')
+    builder = PageTreeBuilder()
+    builder.feed(page_source)
+    builder.close()
+    return builder.root
+
+
+def has_class(name: str) -> Callable[[Node], bool]:
+    """Predicate matching elements with the given class."""
+    return lambda node: name in node.classes
+
+
+def split_subtitle(subtitle: str) -> Tuple[str, str]:
+    """
+    Split a search result subtitle such as "Product Manager at Acme" into title and company.
+
+    Args:
+        subtitle: Subtitle text from a search result
+
+    Returns:
+        Tuple of (job title, company)
+    """
+    title_parts = subtitle.split(' at ')
+    job_title = title_parts[0] if title_parts else ""
+    company = title_parts[1] if len(title_parts) > 1 else ""
+    return job_title, company
+
+
+def parse_search_results(page_source: Union[str, bytes], base_url: str = DEFAULT_BASE_URL) -> List[Dict[str, str]]:
+    """
+    Extract profile information from a people search results page.
+
+    Mirrors LinkedInMatcher.extract_search_results, including skipping
+    results that lack a link, name or subtitle.
+
+    Args:
+        page_source: HTML of the search results page
+        base_url: URL used to resolve relative profile links
+
+    Returns:
+        List of dictionaries with url, name, title and company
+    """
+    root = parse_html(page_source)
+    profiles = []
+
+    for result in root.find_all(has_class("entity-result__item")):
+        link = result.find(lambda node: node.tag == "a" and "app-aware-link" in node.classes)
+        title_container = result.find(has_class("entity-result__title-text"))
+        name = title_container.find(lambda node: node.tag == "a") if title_container else None
+        subtitle = result.find(has_class("entity-result__primary-subtitle"))
+        if link is None or name is None or subtitle is None:
+            continue
+
+        job_title, company = split_subtitle(subtitle.text())
+        profiles.append({
+            "url": urljoin(base_url, link.attrs.get("href", "")),
+            "name": name.text(),
+            "title": job_title,
+            "company": company
+        })
+
+    return profiles
+
+
+def parse_profile_page(page_source: Union[str, bytes]) -> Optional[Dict[str, str]]:
+    """
+    Extract the title and company from a profile page.
+
+    Mirrors LinkedInMatcher.extract_detailed_profile_info.
+
+    Args:
+        page_source: HTML of the profile page
+
+    Returns:
+        Dictionary with title and company, a private-profile marker, or None
+        if the page is neither a loaded profile nor a private one
+    """
+    root = parse_html(page_source)
+
+    if root.find(has_class("pv-top-card-profile-picture")) is None:
+        if root.find(has_class("profile-unavailable")) is not None:
+            return {"title": "Private Profile", "company": "Private", "status": "Private"}
+        return None
+
+    title = root.find(has_class("text-body-medium"))
+    panel = root.find(has_class("pv-text-details__right-panel"))
+    company = panel.find(has_class("inline-show-more-text")) if panel else None
+    return {
+        "title": title.text() if title else "",
+        "company": company.text() if company else ""
+    }
+
+
+PAGE_PARSERS = {
+    "search": parse_search_results,
+    "profile": parse_profile_page
+}
+
+
+def _parse_file(job: Tuple[str, str]):
+    kind, path = job
+    with open(path, 'rb') as file:
+        return PAGE_PARSERS[kind](file.read())
+
+
+def parse_saved_pages(paths: List[str], kind: str, workers: Optional[int] = None) -> list:
+    """
+    Parse saved pages in parallel, without a browser.
+
+    Args:
+        paths: Paths of saved HTML pages
+        kind: "search" or "profile"
+        workers: Number of worker processes (1 parses in this process)
+
+    Returns:
+        Parsed result for each path, in input order
+    """
+    if kind not in PAGE_PARSERS:
+        raise ValueError(f"kind must be one of {tuple(PAGE_PARSERS)}")
+
+    jobs = [(kind, path) for path in paths]
+    if workers == 1 or len(jobs) < 2:
+        return [_parse_file(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_parse_file, jobs, chunksize=16))
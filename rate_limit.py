@@ -0,0 +1,252 @@
+import logging
+import random
+from collections import deque
+from typing import Dict, Optional
+
+from clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+# Hourly budgets for each kind of page load
+DEFAULT_SEARCHES_PER_HOUR = 200
+DEFAULT_PROFILE_VIEWS_PER_HOUR = 200
+
+# Combined hourly budget for all page loads, so the account never sees more
+# than the original fixed 18-25s gap allowed (at most one load per 18s)
+DEFAULT_PAGE_LOADS_PER_HOUR = 200
+
+# Maximum random seconds added before each page load so requests are not
+# evenly spaced; with the combined budget this restores the 18-25s gap
+DEFAULT_JITTER_SECONDS = 7.0
+
+# Key of the combined budget among a scheduler's limiters
+TOTAL_BUDGET = "total"
+
+# Requests that may be spent back to back before the budget's pace applies
+DEFAULT_BURST = 1
+
+# Defaults used to estimate a run before it starts
+DEFAULT_DETAIL_VISIT_RATIO = 0.5
+DEFAULT_SECONDS_PER_PAGE = 3.0
+
+RATE_LIMIT_KINDS = ("search", "profile")
+
+
+class TokenBucket:
+    def __init__(self, per_hour: float, burst: int = DEFAULT_BURST, clock=None):
+        """
+        Token bucket refilled continuously at the hourly budget.
+
+        With a burst of 1 requests are spaced exactly 3600 / per_hour seconds
+        apart; a larger burst lets idle time be spent later in a quick run.
+
+        Args:
+            per_hour: Requests allowed per hour
+            burst: Bucket capacity
+            clock: Object with time() (defaults to the system clock)
+        """
+        if per_hour <= 0 or burst < 1:
+            raise ValueError("per_hour must be positive and burst at least 1")
+        self.per_hour = per_hour
+        self.rate = per_hour / 3600
+        self.capacity = burst
+        self.clock = clock or SystemClock()
+        self.tokens = float(burst)
+        self.updated = self.clock.time()
+
+    def _refill(self) -> float:
+        now = self.clock.time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def wait_time(self) -> float:
+        """Seconds until the next request is allowed."""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def record(self):
+        """Spend one token for a request made now."""
+        self._refill()
+        self.tokens -= 1
+
+    def time_for(self, count: int) -> float:
+        """Seconds from now until count more requests can have been made."""
+        self._refill()
+        return max(0.0, (count - self.tokens) / self.rate) if count else 0.0
+
+
+class SlidingWindow:
+    def __init__(self, per_hour: float, window: float = 3600, clock=None):
+        """
+        Sliding window allowing at most a fixed number of requests in any window.
+
+        Args:
+            per_hour: Requests allowed per hour
+            window: Window length in seconds; the limit scales with it
+            clock: Object with time() (defaults to the system clock)
+        """
+        if per_hour <= 0 or window <= 0:
+            raise ValueError("per_hour and window must be positive")
+        self.per_hour = per_hour
+        self.limit = max(1, int(per_hour * window / 3600))
+        self.window = window
+        self.clock = clock or SystemClock()
+        self.timestamps = deque()
+
+    def _prune(self) -> float:
+        now = self.clock.time()
+        while self.timestamps and self.timestamps[0] <= now - self.window:
+            self.timestamps.popleft()
+        return now
+
+    def wait_time(self) -> float:
+        """Seconds until the next request is allowed."""
+        now = self._prune()
+        if len(self.timestamps) < self.limit:
+            return 0.0
+        return self.timestamps[0] + self.window - now
+
+    def record(self):
+        """Record a request made now."""
+        self.timestamps.append(self._prune())
+
+    def time_for(self, count: int) -> float:
+        """Seconds from now until count more requests can have been made."""
+        if not count:
+            return 0.0
+        now = self._prune()
+        # Each request reuses the earliest free slot; slot i is free again one window after it was used
+        slots = [now] * (self.limit - len(self.timestamps)) + [stamp + self.window for stamp in self.timestamps]
+        last = count - 1
+        return max(0.0, slots[last % self.limit] + self.window * (last // self.limit) - now)
+
+
+LIMITER_STRATEGIES = {
+    "token_bucket": TokenBucket,
+    "sliding_window": SlidingWindow
+}
+
+
+class RateLimitScheduler:
+    def __init__(self, limiters: Dict[str, object], clock=None, jitter: float = 0.0,
+                 rng: Optional[random.Random] = None):
+        """
+        Apply a separate rate budget to each kind of page load.
+
+        A limiter under TOTAL_BUDGET, if present, is charged for every page
+        load on top of the load's own kind.
+
+        Args:
+            limiters: Limiter for each kind, e.g. {"search": TokenBucket(...)}
+            clock: Object with time() and sleep() (defaults to the system clock)
+            jitter: Maximum random seconds waited before each page load
+            rng: Random source for the jitter
+        """
+        self.limiters = limiters
+        self.clock = clock or SystemClock()
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.waits = {kind: [] for kind in limiters}
+
+    @classmethod
+    def from_budgets(cls, searches_per_hour: float = DEFAULT_SEARCHES_PER_HOUR,
+                     profile_views_per_hour: float = DEFAULT_PROFILE_VIEWS_PER_HOUR,
+                     strategy: str = "token_bucket", clock=None,
+                     page_loads_per_hour: Optional[float] = DEFAULT_PAGE_LOADS_PER_HOUR,
+                     jitter: float = DEFAULT_JITTER_SECONDS, **options) -> "RateLimitScheduler":
+        """
+        Build a scheduler with one limiter per kind from hourly budgets.
+
+        Args:
+            searches_per_hour: Budget for people searches
+            profile_views_per_hour: Budget for profile page visits
+            strategy: "token_bucket" or "sliding_window"
+            clock: Object with time() and sleep() shared by every limiter
+            page_loads_per_hour: Combined budget for searches and profile
+                views, or None for no combined limit
+            jitter: Maximum random seconds waited before each page load
+            options: Extra limiter arguments (burst or window)
+
+        Returns:
+            Configured scheduler
+        """
+        if strategy not in LIMITER_STRATEGIES:
+            raise ValueError(f"strategy must be one of {tuple(LIMITER_STRATEGIES)}")
+        clock = clock or SystemClock()
+        limiter = LIMITER_STRATEGIES[strategy]
+        limiters = {
+            "search": limiter(searches_per_hour, clock=clock, **options),
+            "profile": limiter(profile_views_per_hour, clock=clock, **options)
+        }
+        if page_loads_per_hour:
+            limiters[TOTAL_BUDGET] = limiter(page_loads_per_hour, clock=clock, **options)
+        return cls(limiters, clock, jitter)
+
+    def acquire(self, kind: str) -> float:
+        """
+        Block until a request of this kind fits its budget and the combined
+        budget, wait a random jitter, then record it.
+
+        Args:
+            kind: "search" or "profile"
+
+        Returns:
+            Seconds spent waiting
+        """
+        limiters = [self.limiters[kind]]
+        if TOTAL_BUDGET in self.limiters:
+            limiters.append(self.limiters[TOTAL_BUDGET])
+        waited = 0.0
+        delay = max(limiter.wait_time() for limiter in limiters)
+        while delay > 0:
+            logger.info("Rate limiting: Waiting %.1f seconds before next %s", delay, kind)
+            self.clock.sleep(delay)
+            waited += delay
+            delay = max(limiter.wait_time() for limiter in limiters)
+        if self.jitter:
+            delay = self.rng.uniform(0, self.jitter)
+            self.clock.sleep(delay)
+            waited += delay
+        for limiter in limiters:
+            limiter.record()
+        if waited:
+            self.waits[kind].append(waited)
+        return waited
+
+    def plan(self, searches: int, profile_views: Optional[int] = None,
+             seconds_per_page: float = DEFAULT_SECONDS_PER_PAGE,
+             detail_visit_ratio: float = DEFAULT_DETAIL_VISIT_RATIO) -> Dict:
+        """
+        Estimate how long the pending page loads will take under the budgets.
+
+        Budgets for different kinds are spent in parallel while waits for one
+        kind overlap page loads of the other, so the run takes as long as its
+        slowest budget (including the combined one) or its total page-load
+        time, whichever is longer, plus the average jitter per page load.
+
+        Args:
+            searches: Searches still to run
+            profile_views: Profile visits expected (defaults to detail_visit_ratio * searches)
+            seconds_per_page: Expected time to load and read one page
+            detail_visit_ratio: Expected profile visits per search
+
+        Returns:
+            Dictionary with the counts, estimated seconds, expected finish
+            time on the scheduler's clock and the limiting factor
+        """
+        if profile_views is None:
+            profile_views = int(round(searches * detail_visit_ratio))
+        counts = {"search": searches, "profile": profile_views, TOTAL_BUDGET: searches + profile_views}
+        durations = {kind: self.limiters[kind].time_for(count) for kind, count in counts.items()
+                     if kind in self.limiters}
+        durations["page_loads"] = (searches + profile_views) * seconds_per_page
+        bottleneck = max(durations, key=durations.get)
+        seconds = durations[bottleneck] + (searches + profile_views) * self.jitter / 2
+        return {
+            "searches": searches,
+            "profile_views": profile_views,
+            "seconds": seconds,
+            "finish_time": self.clock.time() + seconds,
+            "bottleneck": bottleneck
+        }
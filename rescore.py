@@ -0,0 +1,173 @@
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from checkpoint import discard_checkpoint, is_fully_committed, recommit_output
+from company_index import DEFAULT_COMPANY_INDEX_FILE, use_company_index
+from scoring import CONFIDENCE_LEVELS, SCORING_COLUMNS, score_batch
+
+logger = logging.getLogger(__name__)
+
+# Rows per batch handed to a worker process
+DEFAULT_CHUNK_SIZE = 20000
+
+
+def iter_chunks(reader: Iterator[List[str]], chunk_size: int) -> Iterator[List[List[str]]]:
+    """
+    Split a CSV reader into lists of at most chunk_size rows.
+
+    Args:
+        reader: Reader over the results file
+        chunk_size: Maximum rows per chunk
+
+    Yields:
+        Lists of result rows
+    """
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def scoring_tuples(chunk: List[List[str]], indices: List[int]) -> List[Tuple[str, ...]]:
+    """Reduce rows to the compact tuples score_batch expects (cheap to pickle)."""
+    select = itemgetter(*indices)
+    width = max(indices) + 1
+    return [select(row) if len(row) >= width else select(row + [""] * width) for row in chunk]
+
+
+def rescore_results_file(input_file: str, output_file: Optional[str] = None, workers: Optional[int] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         company_index_file: Optional[str] = DEFAULT_COMPANY_INDEX_FILE) -> Dict[str, int]:
+    """
+    Recompute Confidence_Level for every row of a results file without a browser.
+
+    Rows are streamed in chunks and scored in parallel across processes,
+    preserving order. The output is written to a temporary file and moved
+    into place, so rescoring in place is safe. A resume checkpoint of the
+    output file ('<output>.ckpt') is kept in step: when rescoring in place a
+    checkpoint that covered the whole file is moved to the rescored file,
+    and any other checkpoint is deleted so the next run rebuilds it.
+
+    Args:
+        input_file: Path to an existing results CSV
+        output_file: Path to write the rescored CSV (defaults to input_file)
+        workers: Number of worker processes (defaults to all cores; 1 disables the pool)
+        chunk_size: Rows per batch handed to a worker
+        company_index_file: Company-to-domain table for domain matching, see company_index
+
+    Returns:
+        Dictionary with "rows" and "changed" counts plus the new count per confidence level
+    """
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Results file not found: {input_file}")
+
+    output_file = output_file or input_file
+    in_place = os.path.abspath(output_file) == os.path.abspath(input_file)
+    keep_checkpoint = in_place and is_fully_committed(output_file)
+    temp_file = f"{output_file}.rescore.tmp"
+    workers = workers or os.cpu_count() or 1
+    stats = {"rows": 0, "changed": 0, **{level: 0 for level in CONFIDENCE_LEVELS}}
+    use_company_index(company_index_file)
+
+    try:
+        _write_rescored(input_file, temp_file, workers, chunk_size, company_index_file, stats)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        # Leave no partial output behind, whether from a bad file, a worker error or Ctrl-C
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    if keep_checkpoint:
+        # Same rows in the same order, so only the commit marker moves
+        recommit_output(output_file)
+    else:
+        discard_checkpoint(output_file)
+    return stats
+
+
+def _write_rescored(input_file: str, temp_file: str, workers: int, chunk_size: int,
+                    company_index_file: Optional[str], stats: Dict[str, int]):
+    """Write the rescored copy of input_file to temp_file, counting levels into stats."""
+    with open(input_file, 'r', newline='', encoding='utf-8') as source, \
+            open(temp_file, 'w', newline='', encoding='utf-8') as target:
+        # Plain lists instead of DictReader rows: parsing dominates the runtime
+        reader = csv.reader(source)
+        header = next(reader, [])
+        missing = [column for column in SCORING_COLUMNS + ("Confidence_Level",) if column not in header]
+        if missing:
+            raise ValueError(f"Results file is missing columns: {', '.join(missing)}")
+
+        writer = csv.writer(target)
+        writer.writerow(header)
+        indices = [header.index(column) for column in SCORING_COLUMNS]
+        level_index = header.index("Confidence_Level")
+
+        chunks = iter_chunks(reader, chunk_size)
+        # Each worker opens the same company index; lookups share the table's mapped pages
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=use_company_index,
+                                       initargs=(company_index_file,)) if workers > 1 else None
+        try:
+            if executor:
+                # Keep a bounded number of chunks in flight so memory stays flat
+                pending = []
+                for chunk in chunks:
+                    pending.append((chunk, executor.submit(score_batch, scoring_tuples(chunk, indices))))
+                    if len(pending) >= workers * 2:
+                        chunk, future = pending.pop(0)
+                        _write_chunk(writer, chunk, future.result(), level_index, stats)
+                for chunk, future in pending:
+                    _write_chunk(writer, chunk, future.result(), level_index, stats)
+            else:
+                for chunk in chunks:
+                    _write_chunk(writer, chunk, score_batch(scoring_tuples(chunk, indices)), level_index, stats)
+        finally:
+            if executor:
+                executor.shutdown()
+
+
+def _write_chunk(writer, chunk: List[List[str]], levels: List[str], level_index: int, stats: Dict[str, int]):
+    """Apply recomputed levels to a chunk, count changes and write it out."""
+    for row, level in zip(chunk, levels):
+        if len(row) <= level_index:
+            row.extend([""] * (level_index + 1 - len(row)))
+        if row[level_index] != level:
+            stats["changed"] += 1
+            row[level_index] = level
+        stats[level] += 1
+    stats["rows"] += len(chunk)
+    writer.writerows(chunk)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Recompute confidence levels in a results file offline")
+    parser.add_argument("input", nargs="?", default="linkedin_results.csv", help="Results CSV to rescore")
+    parser.add_argument("-o", "--output", help="Where to write the rescored CSV (default: in place)")
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per worker batch")
+    parser.add_argument("--company-index", default=DEFAULT_COMPANY_INDEX_FILE,
+                        help="Company-to-domain table built with company_index.py")
+    args = parser.parse_args()
+
+    try:
+        start_time = time.perf_counter()
+        result = rescore_results_file(args.input, args.output, args.workers, args.chunk_size, args.company_index)
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Rescored {result['rows']} rows in {elapsed:.2f}s "
+                    f"({result['rows'] / elapsed if elapsed else 0:.0f} rows/s), {result['changed']} changed")
+        logger.info("Levels: " + ", ".join(f"{level}={result[level]}" for level in CONFIDENCE_LEVELS))
+    except Exception as e:
+        logger.error(f"Rescoring failed: {str(e)}")
+        sys.exit(1)
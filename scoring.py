@@ -0,0 +1,288 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from company_index import company_key, get_company_index
+from name_matching import NO_MATCH, name_matcher
+
+# Confidence levels from strongest to weakest
+CONFIDENCE_LEVELS = ("HIGH", "MEDIUM", "LOW", "NO")
+
+PRODUCT_KEYWORDS = [
+    'product', 'pm', 'product manager', 'product owner',
+    'product lead', 'product director', 'head of product',
+    'vp product', 'product marketing', 'product management'
+]
+
+# One alternation over every keyword, longest first, replaces the per-keyword scan
+PRODUCT_ROLE_PATTERN = re.compile('|'.join(
+    re.escape(keyword) for keyword in sorted(PRODUCT_KEYWORDS, key=len, reverse=True)
+))
+
+# Columns of a results row needed to score it
+SCORING_COLUMNS = ("Email", "Name", "LinkedIn_Name", "Job_Title", "Company", "Status")
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name: str) -> str:
+    """
+    Normalize names for comparison by removing extra spaces and converting to lowercase.
+
+    Args:
+        name: Name to normalize
+
+    Returns:
+        Normalized name string
+    """
+    if not name:
+        return ""
+    # Remove extra spaces and convert to lowercase
+    return ' '.join(name.split()).lower()
+
+
+def extract_email_domain(email: str) -> str:
+    """
+    Extract domain from email address.
+
+    Args:
+        email: Email address
+
+    Returns:
+        Domain part of email (lowercase)
+    """
+    if '@' not in email:
+        return ""
+    return email.split('@')[1].lower()
+
+
+def extract_company_domain_hint(company: str) -> str:
+    """
+    Extract potential domain hint from company name.
+
+    Args:
+        company: Company name
+
+    Returns:
+        Potential domain hint (lowercase)
+    """
+    # Get first meaningful word of the normalized name as domain hint
+    words = company_key(company).split()
+    return words[0] if words else ""
+
+
+def is_product_role(job_title: str) -> bool:
+    """
+    Check if job title contains product-related terms.
+
+    Args:
+        job_title: Job title to check
+
+    Returns:
+        True if job title contains product-related terms
+    """
+    if not job_title:
+        return False
+    return PRODUCT_ROLE_PATTERN.search(job_title.lower()) is not None
+
+
+def names_match(search_name: str, profile_name: str) -> bool:
+    """
+    Check if names match reasonably well.
+
+    Besides exact, contained and same-first-name matches this accepts
+    nicknames, spelling variants, accents, reordered names and initials;
+    see name_matching.NameMatcher.
+
+    Args:
+        search_name: Name from search input
+        profile_name: Name from LinkedIn profile
+
+    Returns:
+        True if names match reasonably well
+    """
+    if not search_name or not profile_name:
+        return False
+    return name_matcher(search_name).matches(profile_name)
+
+
+def match_signals(email: str, search_name: str, profile_name: str, job_title: str,
+                  company: str, name_strength: Optional[int] = None) -> Tuple[bool, bool, bool]:
+    """
+    Evaluate the three matching criteria behind a confidence level.
+
+    Args:
+        email: Original email
+        search_name: Original name from search
+        profile_name: Name on the LinkedIn profile
+        job_title: Job title on the LinkedIn profile
+        company: Company on the LinkedIn profile
+        name_strength: Name match strength if already scored, see NameMatcher.score
+
+    Returns:
+        Tuple of (domain matches, name matches, has product role)
+    """
+    # Check domain match against known mappings, skipping free-mail domains
+    domain_matches = get_company_index().domain_matches(extract_email_domain(email), company)
+
+    # Check name match
+    if name_strength is None:
+        name_matches = names_match(search_name, profile_name)
+    else:
+        name_matches = name_strength > NO_MATCH
+
+    # Check product role
+    has_product_role = is_product_role(job_title)
+
+    return domain_matches, name_matches, has_product_role
+
+
+def confidence_from_signals(domain_matches: bool, name_matches: bool, has_product_role: bool) -> str:
+    """
+    Apply the confidence criteria to evaluated matching signals.
+
+    Args:
+        domain_matches: Email domain matches the company
+        name_matches: Names match reasonably well
+        has_product_role: Job title is a product role
+
+    Returns:
+        Confidence level: "HIGH", "MEDIUM", "LOW", or "NO"
+    """
+    if domain_matches and name_matches and has_product_role:
+        return "HIGH"
+    elif (name_matches and has_product_role) or domain_matches:
+        return "MEDIUM"
+    elif name_matches:
+        return "LOW"
+    return "NO"
+
+
+def score_confidence(email: str, search_name: str, profile_name: str, job_title: str, company: str) -> str:
+    """
+    Calculate confidence level based on matching criteria.
+
+    Confidence Criteria:
+    HIGH: Email domain matches company AND name matches AND job title contains "Product"
+    MEDIUM: Name matches AND job contains "Product" OR email domain matches company
+    LOW: Name matches only OR partial match with product role
+    NO: No reasonable match
+
+    Args:
+        email: Original email
+        search_name: Original name from search
+        profile_name: Name on the LinkedIn profile
+        job_title: Job title on the LinkedIn profile
+        company: Company on the LinkedIn profile
+
+    Returns:
+        Confidence level: "HIGH", "MEDIUM", "LOW", or "NO"
+    """
+    return confidence_from_signals(*match_signals(email, search_name, profile_name, job_title, company))
+
+
+def score_batch(rows: Sequence[Tuple[str, ...]]) -> List[str]:
+    """
+    Score a batch of results rows without any browser involvement.
+
+    Rows that were not found keep "NO", as the live matcher would assign.
+
+    Args:
+        rows: Tuples of values in SCORING_COLUMNS order
+
+    Returns:
+        Confidence level for each row, in input order
+    """
+    score = score_confidence
+    return [
+        score(email, name, profile_name, job_title, company) if status == "Found" else "NO"
+        for email, name, profile_name, job_title, company, status in rows
+    ]
+
+
+def score_row(row: Dict[str, str]) -> str:
+    """
+    Score a single results row.
+
+    Args:
+        row: Results row with SCORING_COLUMNS keys
+
+    Returns:
+        Confidence level for the row
+    """
+    return score_batch([tuple(row.get(column) or "" for column in SCORING_COLUMNS)])[0]
+
+
+def score_candidate(email: str, search_name: str, profile: Dict[str, str],
+                    name_strength: Optional[int] = None) -> Tuple[int, int, int]:
+    """
+    Score a search-result candidate from its snippet for ranking.
+
+    Args:
+        email: Original email
+        search_name: Original name from search
+        profile: Candidate with "name", "title" and "company" keys
+        name_strength: Name match strength if already scored for the whole page
+
+    Returns:
+        Tuple of (confidence rank where HIGH is 3 and NO is 0, number of matching
+        signals, name match strength)
+    """
+    if name_strength is None:
+        name_strength = name_matcher(search_name or "").score(profile.get("name", ""))
+    signals = match_signals(email, search_name, profile.get("name", ""),
+                            profile.get("title", ""), profile.get("company", ""), name_strength)
+    level = confidence_from_signals(*signals)
+    return len(CONFIDENCE_LEVELS) - 1 - CONFIDENCE_LEVELS.index(level), sum(signals), name_strength
+
+
+def rank_candidates(email: str, search_name: str,
+                    profiles: List[Dict[str, str]]) -> List[Tuple[Tuple[int, int, int], Dict[str, str]]]:
+    """
+    Rank every search-result candidate by its snippet score.
+
+    The input name's forms are prepared once and every candidate is scored
+    against them. Within a confidence tier a closer name ranks first; the
+    sort is stable, so LinkedIn's own ordering breaks remaining ties.
+
+    Args:
+        email: Original email
+        search_name: Original name from search
+        profiles: Candidates extracted from the search results page
+
+    Returns:
+        List of (score, profile) pairs, best first
+    """
+    name_strengths = name_matcher(search_name or "").score_all([profile.get("name", "") for profile in profiles])
+    scored = [(score_candidate(email, search_name, profile, strength), profile)
+              for profile, strength in zip(profiles, name_strengths)]
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return scored
+
+
+def needs_detail_visit(ranked: List[Tuple[Tuple[int, int, int], Dict[str, str]]]) -> bool:
+    """
+    Decide whether the best candidate's profile page is worth a page load.
+
+    The visit is skipped when the snippet already settles the confidence
+    tier: the best candidate is HIGH, or its snippet has both a title and a
+    company and no other candidate ties with it.
+
+    Args:
+        ranked: Output of rank_candidates
+
+    Returns:
+        True if the detail page could change the result
+    """
+    if not ranked:
+        return False
+
+    best_score, best_profile = ranked[0]
+    if best_score[0] == len(CONFIDENCE_LEVELS) - 1:
+        return False
+
+    # Missing snippet fields could still lift the tier once the full page is read
+    if not best_profile.get("title") or not best_profile.get("company"):
+        return True
+
+    # Ambiguous: another candidate scores the same on a tier worth confirming
+    return len(ranked) > 1 and best_score[0] > 0 and ranked[1][0] == best_score
@@ -1,119 +1,409 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-import subprocess
 import threading
+import queue
 import os
 import json
-from typing import Dict, Any
+import csv
+import io
+from typing import Dict, Any, List, Optional, Tuple
+from jobs import JobManager, JobQueueFull, Job
+from input_csv import copy_validated_rows, validate_header
+from metrics import MetricsRegistry
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for React frontend
-
-# Global variables to track processing status
-processing_status = {
-    "is_processing": False,
-    "progress": 0,
-    "total_records": 0,
-    "processed_records": 0,
-    "current_email": "",
-    "current_status": "idle"
+CORS(app, expose_headers=["X-Total-Count", "ETag"])  # Enable CORS for React frontend; let it read pagination headers
+
+# Input used by the legacy /api/start endpoint and by /api/jobs without an input_file
+INPUT_FILE = "input_emails.csv"
+
+# Directory holding the CSV files /api/jobs may name as input_file; other paths are refused
+INPUT_DIR = "inputs"
+
+# Created on first use so Flask's reloader parent does not start a second set of workers
+job_manager: Optional[JobManager] = None
+job_manager_lock = threading.Lock()
+
+# Queues of connected /api/events clients
+event_subscribers: List[queue.Queue] = []
+event_subscribers_lock = threading.Lock()
+
+# Results file written by linkedin_matcher.py when run by hand
+RESULTS_FILE = "linkedin_results.csv"
+
+# Parsed results, reused until the file's mtime or size changes
+results_cache = {
+    "key": None,
+    "rows": []
 }
+results_cache_lock = threading.Lock()
+
+def results_etag(stat_result: os.stat_result) -> str:
+    """Build an ETag value from a results file's mtime and size."""
+    return f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
 
-def run_linkedin_matcher():
-    """Run the LinkedIn matcher script and update status."""
-    global processing_status
+def load_results(file_path: str, stat_result: os.stat_result) -> List[Dict[str, str]]:
+    """
+    Parse the results CSV, reusing the previous parse if the file is unchanged.
     
-    try:
-        processing_status["is_processing"] = True
-        processing_status["status"] = "starting"
+    Args:
+        file_path: Path to the results CSV
+        stat_result: Current os.stat() of the file
+        
+    Returns:
+        List of result rows
+    """
+    key = (file_path, stat_result.st_mtime_ns, stat_result.st_size)
+    with results_cache_lock:
+        if results_cache["key"] == key:
+            return results_cache["rows"]
         
-        # Run the Python script
-        process = subprocess.Popen(
-            ["python", "linkedin_matcher.py"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
+        with open(file_path, 'r', newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
         
-        # Read output line by line and update status
-        for line in process.stdout:
-            print(line.strip())
-            
-            # Parse progress updates from the logs
-            if "Processing" in line and "/" in line:
-                parts = line.split()
-                for part in parts:
-                    if "/" in part:
-                        processed, total = part.split("/")
-                        processing_status["processed_records"] = int(processed)
-                        processing_status["total_records"] = int(total)
-                        processing_status["progress"] = (int(processed) / int(total)) * 100
-                        
-            elif "Progress:" in line:
-                progress_part = line.split("Progress:")[1].split("%")[0].strip()
-                processing_status["progress"] = float(progress_part)
-                
-            elif "Processing" in line and "@" in line:
-                email_part = line.split("Processing")[1].split(":")[1].strip()
-                processing_status["current_email"] = email_part
+        results_cache["key"] = key
+        results_cache["rows"] = rows
+        return rows
+
+def parse_pagination() -> Tuple[int, Optional[int]]:
+    """
+    Read ?offset= and ?limit= from the request.
+    
+    Returns:
+        Tuple of (offset, limit), where limit is None when not given
         
-        process.wait()
+    Raises:
+        ValueError: If either value is not a non-negative integer
+    """
+    offset = request.args.get("offset", "0")
+    limit = request.args.get("limit")
+    if not offset.isdigit() or (limit is not None and not limit.isdigit()):
+        raise ValueError("offset and limit must be non-negative integers")
+    return int(offset), int(limit) if limit is not None else None
+
+def check_input_file(file_path: str):
+    """
+    Check that an input CSV exists and has a valid header.
+    
+    Args:
+        file_path: Path to the input CSV
         
-        if process.returncode == 0:
-            processing_status["status"] = "completed"
-        else:
-            processing_status["status"] = "failed"
-            
-    except Exception as e:
-        processing_status["status"] = f"error: {str(e)}"
-    finally:
-        processing_status["is_processing"] = False
+    Raises:
+        ValueError: If the file is missing or its header is invalid
+    """
+    if not os.path.isfile(file_path):
+        raise ValueError(f"Input file {file_path} not found")
+    try:
+        with open(file_path, 'r', newline='', encoding='utf-8-sig') as file:
+            validate_header(next(csv.reader(file), None))
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid CSV: {str(e)}")
+
+def resolve_input_file(name: Optional[str]) -> str:
+    """
+    Map the input_file a client asked for onto a file the server may read.
+    
+    Args:
+        name: INPUT_FILE, a path relative to INPUT_DIR, or None for INPUT_FILE
+        
+    Returns:
+        Path to the input file
+        
+    Raises:
+        ValueError: If the path points outside INPUT_DIR
+    """
+    if not name or name == INPUT_FILE:
+        return INPUT_FILE
+    input_dir = os.path.realpath(INPUT_DIR)
+    file_path = os.path.realpath(os.path.join(input_dir, name))
+    if os.path.commonpath([input_dir, file_path]) != input_dir:
+        raise ValueError(f"input_file must be {INPUT_FILE} or a file inside {INPUT_DIR}/")
+    return file_path
+
+def publish_event(event: Dict[str, Any]):
+    """Push an event to every connected Server-Sent Events client."""
+    with event_subscribers_lock:
+        subscribers = list(event_subscribers)
+    for subscriber in subscribers:
+        try:
+            subscriber.put_nowait(event)
+        except queue.Full:
+            # Slow client: drop the event rather than block the matcher
+            pass
+
+def get_job_manager() -> JobManager:
+    """Return the job manager, starting it and recovering persisted jobs on first use."""
+    global job_manager
+    with job_manager_lock:
+        if job_manager is None:
+            job_manager = JobManager(on_event=lambda job, event: publish_event(event))
+        return job_manager
+
+def legacy_status(job: Optional[Job]) -> Dict[str, Any]:
+    """
+    Describe a job in the single-run shape /api/status has always returned.
+    
+    Args:
+        job: Current job, or None
+        
+    Returns:
+        Status dictionary
+    """
+    if job is None:
+        return {
+            "is_processing": False,
+            "progress": 0,
+            "total_records": 0,
+            "processed_records": 0,
+            "current_email": "",
+            "current_status": "idle",
+            "estimated_finish": None
+        }
+    return {
+        "is_processing": job.status in ("queued", "running"),
+        "progress": job.progress,
+        "total_records": job.total_records,
+        "processed_records": job.processed_records,
+        "current_email": job.current_email,
+        "current_status": job.status,
+        "status": job.status,
+        "estimated_finish": job.estimated_finish,
+        "error": job.error,
+        "job_id": job.id
+    }
+
+def results_response(file_path: str):
+    """
+    Serve a results CSV as JSON.
+    
+    Supports ?offset=&limit= pagination and comma-separated ?confidence= and
+    ?status= filters on Confidence_Level and Status. The total number of
+    matching rows is returned in the X-Total-Count header. Responses carry an
+    ETag derived from the file's mtime and size, so an unchanged file is
+    answered with 304 after a single stat call.
+    
+    Args:
+        file_path: Results CSV to serve
+    """
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
+        return jsonify({"error": "No results file found"})
+    
+    etag = results_etag(stat_result)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    
+    try:
+        offset, limit = parse_pagination()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    results = load_results(file_path, stat_result)
+    
+    confidence_filter = request.args.get("confidence")
+    status_filter = request.args.get("status")
+    if confidence_filter:
+        levels = {level.strip().upper() for level in confidence_filter.split(",")}
+        results = [row for row in results if row.get("Confidence_Level") in levels]
+    if status_filter:
+        statuses = {status.strip() for status in status_filter.split(",")}
+        results = [row for row in results if row.get("Status") in statuses]
+    
+    page = results[offset:offset + limit] if limit is not None else results[offset:]
+    
+    response = jsonify(page)
+    response.set_etag(etag)
+    response.headers["X-Total-Count"] = str(len(results))
+    return response
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
-    """Get current processing status."""
-    return jsonify(processing_status)
+    """Get the status of the current job (the running one, else the most recent)."""
+    return jsonify(legacy_status(get_job_manager().current()))
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """Push progress events to the client as Server-Sent Events."""
+    subscriber = queue.Queue(maxsize=1000)
+    with event_subscribers_lock:
+        event_subscribers.append(subscriber)
+    
+    def generate():
+        try:
+            # Start every stream with a snapshot so clients need not poll /api/status
+            snapshot = {"event": "status", **legacy_status(get_job_manager().current())}
+            yield f"event: status\ndata: {json.dumps(snapshot)}\n\n"
+            while True:
+                try:
+                    event = subscriber.get(timeout=15)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event.get('event', 'message')}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            with event_subscribers_lock:
+                event_subscribers.remove(subscriber)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.route('/api/start', methods=['POST'])
 def start_processing():
-    """Start the LinkedIn matching process."""
-    global processing_status
-    
-    if processing_status["is_processing"]:
+    """Start a job for the default input file."""
+    manager = get_job_manager()
+    if manager.active():
         return jsonify({"error": "Processing already in progress"}), 400
     
-    # Start processing in a separate thread
-    thread = threading.Thread(target=run_linkedin_matcher)
-    thread.daemon = True
-    thread.start()
+    try:
+        check_input_file(INPUT_FILE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    return jsonify({"message": "Processing started"})
+    try:
+        job = manager.submit(INPUT_FILE)
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 429
+    
+    return jsonify({"message": "Processing started", "job_id": job.id})
 
 @app.route('/api/stop', methods=['POST'])
 def stop_processing():
-    """Stop the processing (not implemented fully)."""
-    global processing_status
-    processing_status["is_processing"] = False
-    return jsonify({"message": "Stop signal sent"})
+    """Cancel the current job, terminating its worker."""
+    manager = get_job_manager()
+    job = manager.current()
+    if job is None or job.status not in ("queued", "running"):
+        return jsonify({"message": "No job is running"})
+    manager.cancel(job.id)
+    return jsonify({"message": "Stop signal sent", "job_id": job.id})
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """List every job, newest first."""
+    return jsonify([job.to_dict() for job in get_job_manager().list()])
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """
+    Queue a job.
+    
+    Takes an optional JSON body {"input_file": path}, where path is
+    relative to INPUT_DIR; the file is copied into the job's directory.
+    Defaults to the standard input file. Files from elsewhere are sent
+    through /api/jobs/upload instead.
+    """
+    body = request.get_json(silent=True) or {}
+    try:
+        input_file = resolve_input_file(body.get("input_file"))
+        check_input_file(input_file)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    try:
+        job = get_job_manager().submit(input_file)
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 429
+    
+    return jsonify(job.to_dict()), 202
+
+@app.route('/api/jobs/upload', methods=['POST'])
+def upload_job():
+    """
+    Create a job from a CSV streamed in the request body.
+    
+    The body is the raw CSV; chunked transfer encoding is supported. Rows
+    are validated as they arrive, with the same rules as input files, and
+    appended to the job's input file, so memory use does not depend on the
+    upload size. The job is queued once the whole body has been read.
+    """
+    manager = get_job_manager()
+    try:
+        job = manager.create()
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 429
+    
+    try:
+        # utf-8-sig drops the byte order mark spreadsheet exports often start with
+        text = io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline='')
+        with open(job.input_file, 'w', newline='', encoding='utf-8') as output:
+            report = copy_validated_rows(text, output)
+    except (ValueError, csv.Error) as e:
+        manager.discard(job)
+        return jsonify({"error": f"Invalid CSV: {str(e)}"}), 400
+    except Exception as e:
+        manager.discard(job)
+        return jsonify({"error": str(e)}), 500
+    
+    if not report["rows_accepted"]:
+        manager.discard(job)
+        return jsonify({"error": "No rows with an email address", **report}), 400
+    
+    manager.enqueue(job)
+    return jsonify({"job": job.to_dict(), **report}), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """Get one job's status."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def get_job_results(job_id: str):
+    """Get one job's results; takes the same parameters as /api/results."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    try:
+        return results_response(job.output_file)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Expose matcher metrics in Prometheus text format.
+    
+    Stage latencies, page loads, searches and results are summed over the
+    latest snapshot each job's worker reported; job counts are by status.
+    """
+    manager = get_job_manager()
+    registry = MetricsRegistry()
+    jobs_by_status = registry.gauge("linkedin_jobs", "Jobs known to the server by status", ("status",))
+    counts = {}
+    for job in manager.list():
+        counts[job.status] = counts.get(job.status, 0) + 1
+        if job.metrics:
+            registry.merge(job.metrics)
+    for status, count in counts.items():
+        jobs_by_status.set(count, status=status)
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
 
 @app.route('/api/results', methods=['GET'])
 def get_results():
-    """Get the results from the output CSV."""
+    """
+    Get the results of the current job, or of the hand-run results file
+    if no job has produced output. See results_response for parameters.
+    """
     try:
-        if not os.path.exists("linkedin_results.csv"):
-            return jsonify({"error": "No results file found"})
-        
-        import csv
-        results = []
-        with open("linkedin_results.csv", 'r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                results.append(row)
-        
-        return jsonify(results)
-    
+        job = get_job_manager().current()
+        if job and os.path.exists(job.output_file):
+            return results_response(job.output_file)
+        return results_response(RESULTS_FILE)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
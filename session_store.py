@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the Chrome profile, saved cookies and the cached driver path
+DEFAULT_SESSION_DIR = ".linkedin_session"
+
+# Re-resolve the driver after this many seconds so Chrome updates are picked up
+DEFAULT_DRIVER_CACHE_TTL = 24 * 60 * 60
+
+DRIVER_CACHE_FILE = "driver_path.json"
+COOKIE_FILE = "cookies.json"
+PROFILE_DIR = "chrome-profile"
+
+
+def _write_private(file_path: str, data):
+    """Atomically write JSON readable only by the current user."""
+    temp_path = f"{file_path}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(temp_path, file_path)
+
+
+class SessionStore:
+    def __init__(self, directory: str = DEFAULT_SESSION_DIR, driver_cache_ttl: float = DEFAULT_DRIVER_CACHE_TTL):
+        """
+        Local state that lets a run start without re-resolving the driver or logging in again.
+
+        Args:
+            directory: Directory for the browser profile, cookies and driver path
+            driver_cache_ttl: Seconds a resolved driver path is reused before resolving it again
+        """
+        self.directory = directory
+        self.driver_cache_ttl = driver_cache_ttl
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    @property
+    def profile_dir(self) -> str:
+        """Chrome user data directory reused between runs."""
+        return os.path.abspath(os.path.join(self.directory, PROFILE_DIR))
+
+    def driver_path(self) -> str:
+        """
+        Return the ChromeDriver path, resolving it with webdriver_manager only when the cached one is stale.
+
+        Returns:
+            Path to the ChromeDriver executable
+        """
+        cache_path = os.path.join(self.directory, DRIVER_CACHE_FILE)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as file:
+                cached = json.load(file)
+            if (os.access(cached["path"], os.X_OK) and
+                    time.time() - cached["resolved_at"] < self.driver_cache_ttl):
+                logger.info(f"Using cached ChromeDriver at {cached['path']}")
+                return cached["path"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+        _write_private(cache_path, {"path": path, "resolved_at": time.time()})
+        logger.info(f"Resolved ChromeDriver at {path}")
+        return path
+
+    def load_cookies(self) -> List[Dict]:
+        """Return the cookies saved by the last successful session, or an empty list."""
+        try:
+            with open(os.path.join(self.directory, COOKIE_FILE), 'r', encoding='utf-8') as file:
+                cookies = json.load(file)
+            return cookies if isinstance(cookies, list) else []
+        except (OSError, ValueError):
+            return []
+
+    def save_cookies(self, cookies: List[Dict]):
+        """Save session cookies with owner-only permissions."""
+        _write_private(os.path.join(self.directory, COOKIE_FILE), cookies)
+
+    def clear_cookies(self):
+        """Forget saved cookies, e.g. after they stopped authenticating."""
+        try:
+            os.remove(os.path.join(self.directory, COOKIE_FILE))
+        except FileNotFoundError:
+            pass
+
@@ -0,0 +1,170 @@
+import http.cookiejar
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from linkedin_browser import TRANSFER_SIZE_SCRIPT
+from page_parser import Node, parse_html
+
+XPATH_PATTERN = re.compile(r"^//(\w+)\[@([\w-]+)='([^']*)'\]$")
+COMPOUND_PATTERN = re.compile(r"([#.]?)([\w-]+)")
+
+
+def _compound_matcher(compound: str) -> Callable[[Node], bool]:
+    """Predicate for one compound CSS selector such as 'a.app-aware-link' or '#username'."""
+    tag = None
+    classes = []
+    element_id = None
+    for prefix, name in COMPOUND_PATTERN.findall(compound):
+        if prefix == '.':
+            classes.append(name)
+        elif prefix == '#':
+            element_id = name
+        else:
+            tag = name
+    return lambda node: ((tag is None or node.tag == tag) and all(name in node.classes for name in classes)
+                         and (element_id is None or node.attrs.get("id") == element_id))
+
+
+def select(root: Node, by: str, selector: str) -> List[Node]:
+    """Find the descendants of root matching a Selenium locator (simple CSS, id, class or attribute XPath)."""
+    if by == By.ID:
+        selector, by = f"#{selector}", By.CSS_SELECTOR
+    elif by == By.CLASS_NAME:
+        selector, by = f".{selector}", By.CSS_SELECTOR
+    elif by == By.XPATH:
+        tag, attribute, value = XPATH_PATTERN.match(selector).groups()
+        return root.find_all(lambda node: node.tag == tag and node.attrs.get(attribute) == value)
+
+    found = []
+    for alternative in selector.split(','):
+        matchers = [_compound_matcher(compound) for compound in alternative.split()]
+        for node in root.find_all(matchers[-1]):
+            # Walk up the ancestors, matching the remaining compounds right to left
+            remaining = matchers[:-1]
+            ancestor = node.parent
+            while remaining and ancestor is not None and ancestor is not root:
+                if remaining[-1](ancestor):
+                    remaining = remaining[:-1]
+                ancestor = ancestor.parent
+            if not remaining and node not in found:
+                found.append(node)
+    return found
+
+
+class FakeElement:
+    def __init__(self, driver: "FakeChrome", node: Node):
+        """WebElement stand-in over a parsed page node."""
+        self.driver = driver
+        self.node = node
+
+    @property
+    def text(self) -> str:
+        return self.node.text()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        value = self.node.attrs.get(name)
+        if name == "href" and value is not None:
+            # Selenium reports links resolved against the page URL
+            return urllib.parse.urljoin(self.driver.current_url, value)
+        return value
+
+    def find_elements(self, by: str, selector: str) -> List["FakeElement"]:
+        return [FakeElement(self.driver, node) for node in select(self.node, by, selector)]
+
+    def find_element(self, by: str, selector: str) -> "FakeElement":
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise NoSuchElementException(selector)
+        return elements[0]
+
+    def clear(self):
+        self.driver.form_values.pop(self.node.attrs.get("name"), None)
+
+    def send_keys(self, value: str):
+        name = self.node.attrs.get("name")
+        self.driver.form_values[name] = self.driver.form_values.get(name, "") + value
+
+    def click(self):
+        form = self.node
+        while form is not None and form.tag != "form":
+            form = form.parent
+        if form is not None:
+            data = urllib.parse.urlencode(self.driver.form_values).encode('utf-8')
+            self.driver.open(urllib.parse.urljoin(self.driver.current_url, form.attrs.get("action", "")), data)
+
+
+class FakeChrome:
+    """
+    Chrome WebDriver stand-in that fetches pages over HTTP without running scripts.
+
+    Enough of the WebDriver API for LinkedInMatcher to log in, keep cookies,
+    search and visit profiles against fixture_server in the "html" and
+    "elements" extraction modes.
+    """
+
+    instances: List["FakeChrome"] = []
+
+    def __init__(self, service=None, options=None):
+        self.options = options
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+        self.current_url = "about:blank"
+        self.page_source = ""
+        self.root = parse_html("")
+        self.form_values: Dict[str, str] = {}
+        self.cdp_commands = []
+        self.quit_called = False
+        FakeChrome.instances.append(self)
+
+    def open(self, url: str, data: Optional[bytes] = None):
+        try:
+            response = self.opener.open(url, data)
+        except urllib.error.HTTPError as error:
+            response = error
+        with response:
+            body = response.read()
+            self.current_url = response.geturl()
+        self.page_source = body.decode('utf-8', errors='replace')
+        self.root = parse_html(self.page_source)
+        self.form_values = {}
+
+    def get(self, url: str):
+        self.open(url)
+
+    def find_elements(self, by: str, selector: str) -> List[FakeElement]:
+        return [FakeElement(self, node) for node in select(self.root, by, selector)]
+
+    def find_element(self, by: str, selector: str) -> FakeElement:
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise NoSuchElementException(selector)
+        return elements[0]
+
+    def execute_script(self, script: str, *args):
+        if script == TRANSFER_SIZE_SCRIPT:
+            return len(self.page_source.encode('utf-8'))
+        return None
+
+    def execute_cdp_cmd(self, command: str, params: Dict):
+        self.cdp_commands.append((command, params))
+        return {}
+
+    def get_cookies(self) -> List[Dict]:
+        return [{"name": cookie.name, "value": cookie.value, "domain": cookie.domain, "path": cookie.path}
+                for cookie in self.cookies]
+
+    def add_cookie(self, cookie: Dict):
+        domain = cookie.get("domain") or urllib.parse.urlsplit(self.current_url).hostname
+        self.cookies.set_cookie(http.cookiejar.Cookie(
+            0, cookie["name"], cookie["value"], None, False, domain, False, domain.startswith('.'),
+            cookie.get("path", "/"), True, False, None, False, None, None, {}
+        ))
+
+    def quit(self):
+        self.quit_called = True
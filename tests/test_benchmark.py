@@ -0,0 +1,74 @@
+import csv
+import json
+import os
+
+import pytest
+from selenium import webdriver
+
+from benchmark import run_benchmark
+from fake_chrome import FakeChrome
+from fixture_server import FixtureConfig
+from session_store import SessionStore
+
+FIXTURE = FixtureConfig(latency=0, private_rate=0.25, empty_rate=0.2, seed=3)
+
+
+@pytest.fixture
+def fake_chrome(monkeypatch):
+    FakeChrome.instances = []
+    monkeypatch.setattr(webdriver, "Chrome", FakeChrome)
+    monkeypatch.setattr(SessionStore, "driver_path", lambda self: "chromedriver")
+    return FakeChrome
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.parametrize("mode", ["html", "elements"])
+def test_end_to_end_run_against_fixture_server(fake_chrome, tmp_path, mode):
+    summary = run_benchmark(records=8, fixture_config=FIXTURE, extraction_mode=mode, duplicate_rate=0.25,
+                            work_dir=str(tmp_path))
+
+    assert summary["rows_written"] == 8
+    # Duplicate rows are fanned out from one search
+    assert summary["searches"] == summary["server_requests"]["search"] == 6
+    assert summary["server_requests"]["login_submit"] == 1
+    assert summary["transfer_bytes"]["count"] == summary["page_loads"]
+
+    rows = read_rows(tmp_path / "benchmark_results.csv")
+    assert len(rows) == 8
+    assert all(row["Status"] for row in rows)
+    assert any(row["Confidence_Level"] != "NO" for row in rows)
+    assert fake_chrome.instances[-1].quit_called
+
+
+def test_lean_mode_blocks_subresources(fake_chrome, tmp_path):
+    run_benchmark(records=2, fixture_config=FIXTURE, extraction_mode="html", work_dir=str(tmp_path), lean=True)
+
+    driver = fake_chrome.instances[-1]
+    assert driver.options.page_load_strategy == "eager"
+    assert [command for command, _ in driver.cdp_commands] == ["Network.enable", "Network.setBlockedURLs"]
+
+
+def test_second_run_reuses_the_saved_session(fake_chrome, tmp_path):
+    session_dir = str(tmp_path / "session")
+    for run in ("first", "second"):
+        os.makedirs(tmp_path / run)
+        summary = run_benchmark(records=2, fixture_config=FIXTURE, extraction_mode="html",
+                                work_dir=str(tmp_path / run), session_dir=session_dir)
+    assert "login_submit" not in summary["server_requests"]
+
+
+def test_trace_export(fake_chrome, tmp_path):
+    trace_file = tmp_path / "trace.json"
+    run_benchmark(records=3, fixture_config=FIXTURE, extraction_mode="html", work_dir=str(tmp_path),
+                  trace_file=str(trace_file))
+
+    with open(trace_file, encoding='utf-8') as file:
+        events = json.load(file)["traceEvents"]
+    names = {event["name"] for event in events}
+    assert {"record", "driver.get", "extract_search_results"} <= names
+    # Emails are hashed before they reach the trace
+    assert not any("@" in json.dumps(event) for event in events)
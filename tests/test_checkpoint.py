@@ -0,0 +1,136 @@
+import csv
+
+from checkpoint import ResumeCheckpoint
+from matcher_io import OUTPUT_COLUMNS, ResultWriter, initialize_output_file
+
+
+def make_record(index: int, level: str = "NO") -> dict:
+    record = {column: "" for column in OUTPUT_COLUMNS}
+    record.update({"Email": f"user{index}@acme.com", "Name": f"User {index}", "Company": "Acme",
+                   "Confidence_Level": level})
+    return record
+
+
+def write_rows(output_file, input_file, indexes):
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    with ResultWriter(str(output_file), checkpoint=checkpoint, batch_size=100) as writer:
+        for index in indexes:
+            writer.write(make_record(index), input_offset=100 + index, row_number=index + 2)
+    checkpoint.close()
+
+
+def read_emails(output_file):
+    with open(output_file, newline='', encoding='utf-8') as file:
+        return [row["Email"] for row in csv.DictReader(file)]
+
+
+def setup_files(tmp_path):
+    input_file = tmp_path / "input.csv"
+    input_file.write_text("Email,Name,Company\n" + "".join(f"user{i}@acme.com,User {i},Acme\n" for i in range(10)))
+    output_file = tmp_path / "output.csv"
+    initialize_output_file(str(output_file))
+    return input_file, output_file
+
+
+def test_resume_position_and_processed_emails(tmp_path):
+    input_file, output_file = setup_files(tmp_path)
+    write_rows(output_file, input_file, range(5))
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    try:
+        assert (checkpoint.input_offset, checkpoint.row_number) == (104, 6)
+        assert "user3@acme.com" in checkpoint
+        assert "user7@acme.com" not in checkpoint
+        assert checkpoint.processed_count() == 5
+    finally:
+        checkpoint.close()
+
+
+def test_uncommitted_bytes_are_truncated(tmp_path):
+    input_file, output_file = setup_files(tmp_path)
+    write_rows(output_file, input_file, range(3))
+    committed = output_file.read_bytes()
+    with open(output_file, 'ab') as file:
+        file.write(b"user9@acme.com,User 9,Ac")
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    checkpoint.close()
+    assert output_file.read_bytes() == committed
+    assert checkpoint.input_offset == 102
+
+
+def test_rewritten_output_is_reindexed_not_truncated(tmp_path):
+    input_file, output_file = setup_files(tmp_path)
+    write_rows(output_file, input_file, range(5))
+    # Rewrite every row with a longer confidence level, as an in-place rescore would
+    rows = [make_record(index, "HIGH") for index in range(5)]
+    with open(output_file, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    rewritten = output_file.read_bytes()
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    try:
+        assert output_file.read_bytes() == rewritten
+        assert checkpoint.processed_count() == 5
+        assert "user4@acme.com" in checkpoint
+    finally:
+        checkpoint.close()
+
+
+def test_shrunk_output_is_reindexed(tmp_path):
+    input_file, output_file = setup_files(tmp_path)
+    write_rows(output_file, input_file, range(5))
+    with open(output_file, newline='', encoding='utf-8') as file:
+        lines = file.readlines()
+    output_file.write_text("".join(lines[:3]), encoding='utf-8')
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    try:
+        assert checkpoint.processed_count() == 2
+        assert "user4@acme.com" not in checkpoint
+    finally:
+        checkpoint.close()
+
+
+def test_torn_line_is_repaired_on_rebuild(tmp_path):
+    input_file, output_file = setup_files(tmp_path)
+    with open(output_file, 'a', newline='', encoding='utf-8') as file:
+        csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS).writerow(make_record(0))
+        file.write("user1@acme.com,Us")
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    checkpoint.close()
+    assert read_emails(output_file) == ["user0@acme.com"]
+
+
+def test_interrupted_flush_is_not_written_twice(tmp_path):
+    input_file, output_file = setup_files(tmp_path)
+    write_rows(output_file, input_file, range(2))
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    commit = checkpoint.commit
+
+    def interrupted_commit(*args):
+        # What the SIGTERM handler does when it fires mid-commit
+        raise SystemExit(143)
+
+    checkpoint.commit = interrupted_commit
+    try:
+        with ResultWriter(str(output_file), checkpoint=checkpoint, batch_size=2) as writer:
+            writer.write(make_record(2), input_offset=102, row_number=4)
+            writer.write(make_record(3), input_offset=103, row_number=5)
+    except SystemExit:
+        pass
+    checkpoint.commit = commit
+    checkpoint.close()
+    assert read_emails(output_file).count("user2@acme.com") == 1
+
+    # The uncommitted batch is dropped on reopen and its input rows are read again
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    try:
+        assert read_emails(output_file) == ["user0@acme.com", "user1@acme.com"]
+        assert (checkpoint.input_offset, checkpoint.row_number) == (101, 3)
+    finally:
+        checkpoint.close()
@@ -0,0 +1,43 @@
+from company_index import CompanyIndex, DomainTrie, company_key, import_mappings
+
+
+def test_company_key():
+    assert company_key("Acme Robotics, Inc.") == "acme robotics"
+    assert company_key("") == ""
+
+
+def test_domain_trie_finds_closest_parent():
+    trie = DomainTrie()
+    trie.add_company("acme.com", "acme")
+    trie.add_company("eu.acme.com", "acme europe")
+    trie.add_free_mail("gmail.com")
+
+    assert trie.lookup("acme.com") == (False, frozenset({"acme"}))
+    assert trie.lookup("mail.eu.acme.com") == (False, frozenset({"acme europe"}))
+    assert trie.lookup("us.acme.com") == (False, frozenset({"acme"}))
+    assert trie.lookup("other.com") == (False, frozenset())
+    assert trie.lookup("gmail.com") == (True, frozenset())
+
+
+def test_index_matches_mapped_domains(tmp_path):
+    path = str(tmp_path / "company_domains.db")
+    added = import_mappings(path, [("Initech LLC", "initrode.com"), ("Globex Corporation", "@Globex.co.uk"),
+                                   ("Initech LLC", "initrode.com")])
+    assert added == 2
+
+    index = CompanyIndex(path)
+    try:
+        assert index.domain_matches("initrode.com", "Initech")
+        assert index.domain_matches("mail.initrode.com", "Initech, LLC")
+        assert index.domain_matches("globex.co.uk", "Globex")
+        assert not index.domain_matches("initrode.com", "Globex")
+    finally:
+        index.close()
+
+
+def test_index_rejects_free_mail_and_falls_back_to_names():
+    index = CompanyIndex(None)
+    assert index.is_free_mail("gmail.com")
+    assert not index.domain_matches("gmail.com", "Gmail")
+    assert index.domain_matches("eu.acmerobotics.com", "Acme Robotics")
+    assert not index.domain_matches("initrode.com", "Initech")
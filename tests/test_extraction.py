@@ -0,0 +1,53 @@
+from fixture_server import FixtureConfig, render_search_page
+from linkedin_browser import LinkedInMatcher
+
+SEARCH_URL = "http://127.0.0.1:8000/search/results/people/?keywords=jane%20doe"
+
+
+class PageDriver:
+    """Driver stand-in serving one rendered search page."""
+
+    def __init__(self, page_source: str, script_results=None):
+        self.page_source = page_source
+        self.current_url = SEARCH_URL
+        self.script_results = script_results
+
+    def execute_script(self, script):
+        if isinstance(self.script_results, Exception):
+            raise self.script_results
+        return self.script_results
+
+    def find_elements(self, by, selector):
+        return []
+
+
+def matcher_for(mode: str, driver) -> LinkedInMatcher:
+    matcher = LinkedInMatcher(extraction_mode=mode, base_url="http://127.0.0.1:8000")
+    matcher.driver = driver
+    return matcher
+
+
+def search_page() -> str:
+    return render_search_page("Jane Doe jane@acme.com", FixtureConfig(empty_rate=0, failure_rate=0)).decode('utf-8')
+
+
+def test_html_and_script_modes_agree():
+    profiles = matcher_for("html", PageDriver(search_page())).extract_search_results()
+    assert len(profiles) == FixtureConfig().results_per_page
+    assert profiles[0]["name"] == "Jane Doe"
+
+    raw = [{"url": profile["url"], "name": profile["name"], "subtitle": f"{profile['title']} at {profile['company']}"}
+           for profile in profiles]
+    matcher = matcher_for("script", PageDriver(search_page(), raw))
+    assert matcher.extract_search_results() == profiles
+    assert len(matcher.extraction_timings["search_results"]) == 1
+
+
+def test_extraction_errors_yield_no_profiles():
+    matcher = matcher_for("script", PageDriver(search_page(), RuntimeError("script failed")))
+    assert matcher.extract_search_results() == []
+    assert len(matcher.extraction_timings["search_results"]) == 1
+
+
+def test_elements_mode_with_no_results():
+    assert matcher_for("elements", PageDriver(search_page())).extract_search_results() == []
@@ -0,0 +1,22 @@
+import io
+
+import pytest
+
+from input_csv import copy_validated_rows
+
+
+def test_copy_validated_rows_normalizes_and_reports_rejects():
+    source = io.StringIO("Name,Email,Extra\n Ann Lee ,ann@acme.com ,x\n\nNo Email,,y\nBob,bob@acme.com,z\n,  ,\n")
+    output = io.StringIO()
+
+    report = copy_validated_rows(source, output, max_reported=1)
+
+    assert output.getvalue().splitlines() == ["Email,Name", "ann@acme.com,Ann Lee", "bob@acme.com,Bob"]
+    assert report == {"rows_accepted": 2, "rows_rejected": 2, "rejects": [{"row": 3, "reason": "Empty email"}]}
+
+
+def test_copy_validated_rows_requires_email_column():
+    with pytest.raises(ValueError):
+        copy_validated_rows(io.StringIO("Name\nAnn\n"), io.StringIO())
+    with pytest.raises(ValueError):
+        copy_validated_rows(io.StringIO(""), io.StringIO())
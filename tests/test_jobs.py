@@ -0,0 +1,61 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import jobs
+from jobs import JOB_OUTPUT_FILE, Job, JobManager
+
+SLEEPER = "import signal, sys, time; signal.signal(signal.SIGTERM, signal.SIG_IGN) if sys.argv[1] == 'stubborn' else None; time.sleep(60)"
+
+
+def running_job(jobs_dir, job_id: str, pid: int) -> Job:
+    directory = os.path.join(str(jobs_dir), job_id)
+    os.makedirs(directory)
+    job = Job(job_id, directory, "running", pid=pid)
+    job.save()
+    return job
+
+
+def start_sleeper(*args) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, "-c", SLEEPER, *args])
+    # Give the interpreter time to install its signal handler
+    time.sleep(0.3)
+    return process
+
+
+def test_orphaned_worker_is_stopped_before_requeue(tmp_path):
+    job_id = "orphan"
+    process = start_sleeper("plain", os.path.join(str(tmp_path), job_id, JOB_OUTPUT_FILE))
+    running_job(tmp_path, job_id, process.pid)
+
+    manager = JobManager(jobs_dir=str(tmp_path), workers=0)
+    assert process.wait(timeout=5) == -signal.SIGTERM
+    job = manager.get(job_id)
+    assert job.status == "queued"
+    assert job.pid is None
+    assert list(manager.pending) == [job]
+
+
+def test_worker_ignoring_sigterm_is_killed(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "CANCEL_GRACE_SECONDS", 0.5)
+    job_id = "stubborn"
+    process = start_sleeper("stubborn", os.path.join(str(tmp_path), job_id, JOB_OUTPUT_FILE))
+    running_job(tmp_path, job_id, process.pid)
+
+    manager = JobManager(jobs_dir=str(tmp_path), workers=0)
+    assert process.wait(timeout=5) == -signal.SIGKILL
+    assert manager.get(job_id).status == "queued"
+
+
+def test_reused_pid_is_left_alone(tmp_path):
+    process = start_sleeper("plain", "unrelated")
+    try:
+        running_job(tmp_path, "reused", process.pid)
+        manager = JobManager(jobs_dir=str(tmp_path), workers=0)
+        assert process.poll() is None
+        assert manager.get("reused").status == "queued"
+    finally:
+        process.kill()
+        process.wait()
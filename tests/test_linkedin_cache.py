@@ -0,0 +1,48 @@
+import logging
+
+from linkedin_cache import LookupCache
+
+FOUND = {"Status": "Found", "LinkedIn_URL": "https://www.linkedin.com/in/someone/"}
+
+
+def count_rows(cache):
+    return cache.connection.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+
+
+def test_full_cache_evicts_in_batches(tmp_path, monkeypatch):
+    cache = LookupCache(str(tmp_path / "cache.db"), max_entries=10)
+    passes = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: passes.append(1) or evict())
+
+    for number in range(30):
+        cache.put(f"person{number}@example.com", "", FOUND)
+
+    # Each pass frees one slot below the limit (10% of 10), not one pass per put
+    assert count_rows(cache) == cache.entries <= 10
+    assert len(passes) < 30 - 10
+    # The most recently stored entries survive
+    assert cache.get("person29@example.com", "") == FOUND
+    assert cache.get("person0@example.com", "") is None
+    cache.close()
+
+
+def test_replacing_an_entry_keeps_the_count(tmp_path):
+    cache = LookupCache(str(tmp_path / "cache.db"), max_entries=10)
+    for _ in range(3):
+        cache.put("person@example.com", "Some One", FOUND)
+    assert cache.entries == count_rows(cache) == 1
+    cache.close()
+
+    reopened = LookupCache(str(tmp_path / "cache.db"), max_entries=10)
+    assert reopened.entries == 1
+    reopened.close()
+
+
+def test_eviction_logs_at_debug(tmp_path, caplog):
+    cache = LookupCache(str(tmp_path / "cache.db"), max_entries=2)
+    with caplog.at_level(logging.INFO, logger="linkedin_cache"):
+        for number in range(5):
+            cache.put(f"person{number}@example.com", "", FOUND)
+    assert not caplog.records
+    cache.close()
@@ -0,0 +1,58 @@
+from matcher_io import InputReader, SearchPlan
+
+
+def write_input(path, rows):
+    path.write_text("Email,Name\n" + "".join(rows), encoding='utf-8')
+    return str(path)
+
+
+def test_input_reader_resumes_from_offset(tmp_path):
+    input_file = write_input(tmp_path / "input.csv", [
+        "a@acme.com,Ann Lee\n",
+        'b@acme.com,"Bob\nJones"\n',
+        ",No Email\n",
+        "c@acme.com,Cy Young\n",
+        "d@acme.com,Di Prince\n",
+    ])
+
+    reader = InputReader(input_file, warn_empty=False)
+    records = iter(reader)
+    assert next(records)["Email"] == "a@acme.com"
+    assert next(records) == {"Email": "b@acme.com", "Name": "Bob\nJones"}
+    # Row 3 spans two physical lines; the offset points past both
+    offset, row_number = reader.offset, reader.row_number
+    assert row_number == 3
+
+    resumed = InputReader(input_file, warn_empty=False, start_offset=offset, start_row=row_number)
+    assert [record["Email"] for record in resumed] == ["c@acme.com", "d@acme.com"]
+    assert resumed.row_number == 6
+
+
+def test_input_reader_skips_processed_emails(tmp_path):
+    input_file = write_input(tmp_path / "input.csv", ["a@acme.com,Ann\n", "b@acme.com,Bob\n"])
+    assert [record["Email"] for record in InputReader(input_file, {"a@acme.com"})] == ["b@acme.com"]
+
+
+def test_search_plan_deduplicates_normalized_keys():
+    records = [
+        {"Email": "ann@acme.com", "Name": "Ann Lee"},
+        {"Email": " ANN@acme.com ", "Name": "ann  lee"},
+        {"Email": "bob@acme.com", "Name": "Bob Jones"},
+        {"Email": "ann@acme.com", "Name": "Ann Lee"},
+    ]
+    plan = SearchPlan(records)
+    try:
+        assert (plan.total_rows, plan.search_count, plan.saved_searches) == (4, 2, 2)
+
+        assert plan.take_result(records[0]) == (False, None)
+        result = {"LinkedIn_URL": "https://www.linkedin.com/in/ann-lee/", "Status": "Found"}
+        plan.store_result(records[0], result)
+        # Both duplicates get the stored result, then it is dropped
+        assert plan.take_result(records[1]) == (True, result)
+        assert plan.take_result(records[3]) == (True, result)
+        assert plan.connection.execute("SELECT result FROM plan WHERE result IS NOT NULL").fetchall() == []
+
+        plan.store_result(records[2], None)
+        assert plan.take_result(records[2]) == (True, None)
+    finally:
+        plan.close()
@@ -0,0 +1,55 @@
+from metrics import MatcherMetrics, MetricsRegistry
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter("pages_total", "Pages loaded", ("page",)).inc(page='se"arch')
+    registry.gauge("budget", "Budget").set(2.5)
+    histogram = registry.histogram("seconds", "Durations", ("stage",), buckets=(0.1, 1))
+    histogram.observe(0.05, stage="scoring")
+    histogram.observe(3, stage="scoring")
+
+    assert registry.render().splitlines() == [
+        "# HELP budget Budget",
+        "# TYPE budget gauge",
+        "budget 2.5",
+        "# HELP pages_total Pages loaded",
+        "# TYPE pages_total counter",
+        'pages_total{page="se\\"arch"} 1',
+        "# HELP seconds Durations",
+        "# TYPE seconds histogram",
+        'seconds_bucket{stage="scoring",le="0.1"} 1',
+        'seconds_bucket{stage="scoring",le="1"} 1',
+        'seconds_bucket{stage="scoring",le="+Inf"} 2',
+        'seconds_sum{stage="scoring"} 3.05',
+        'seconds_count{stage="scoring"} 2',
+    ]
+
+
+def test_snapshots_merge_across_processes():
+    worker = MatcherMetrics()
+    worker.observe("scoring", 0.02, page="search")
+    worker.page_loads.inc(page="search")
+    worker.rate_budget.set(60, kind="search")
+
+    server = MatcherMetrics()
+    server.page_loads.inc(page="search")
+    server.registry.merge(worker.snapshot())
+    server.registry.merge(worker.snapshot())
+
+    text = server.registry.render()
+    assert 'linkedin_matcher_page_loads_total{page="search"} 3' in text
+    assert 'linkedin_matcher_stage_seconds_count{stage="scoring",page="search"} 2' in text
+    assert 'linkedin_matcher_rate_budget_per_hour{kind="search"} 60' in text
+
+
+def test_error_statuses_share_one_series():
+    metrics = MatcherMetrics()
+    metrics.record_result("Found", "HIGH")
+    metrics.record_result("Error: Message: no such window\n  (Session info: chrome=120)", "NO")
+    metrics.record_result("Error: timeout at https://www.linkedin.com/search", "NO")
+
+    text = metrics.registry.render()
+    assert 'linkedin_matcher_results_total{status="Error",confidence="NO"} 2' in text
+    assert 'linkedin_matcher_results_total{status="Found",confidence="HIGH"} 1' in text
+    assert "no such window" not in text
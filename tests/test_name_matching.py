@@ -0,0 +1,55 @@
+import pytest
+
+from name_matching import (EXACT_MATCH, FIRST_NAME_MATCH, FULL_NAME_MATCH, NO_MATCH, NameMatcher,
+                           fold_name, phonetic_key)
+
+
+def test_fold_name():
+    assert fold_name("José O'Brien-Smith 🚀") == "jose obrien smith"
+
+
+def test_phonetic_key():
+    assert phonetic_key("smith") == phonetic_key("smyth")
+    assert phonetic_key("kowalski") == phonetic_key("cowalski")
+    # Too few consonants to be distinctive
+    assert phonetic_key("lee") == ""
+
+
+@pytest.mark.parametrize("search_name, profile_name, expected", [
+    ("Jane Doe", "Jane Doe", EXACT_MATCH),
+    ("Doe Jane", "Jane Doe", EXACT_MATCH),
+    ("Dr. Jane Doe, PhD", "Jane Doe", EXACT_MATCH),
+    ("Jane Doe", "Jane Q. Doe", FULL_NAME_MATCH),
+    ("José García", "Jose Garcia Lopez", FULL_NAME_MATCH),
+    ("Bob Jones", "Robert Jones", FULL_NAME_MATCH),
+    ("Katherine Doe", "Catherine Doe", FULL_NAME_MATCH),
+    ("Jane Smith", "Jane Smyth", FULL_NAME_MATCH),
+    ("Jane Doe", "Jane Roe", FIRST_NAME_MATCH),
+    ("J. Doe", "Jane Doe", FIRST_NAME_MATCH),
+    ("Jane Doe", "Mary Major", NO_MATCH),
+])
+def test_score(search_name, profile_name, expected):
+    assert NameMatcher(search_name).score(profile_name) == expected
+
+
+@pytest.mark.parametrize("search_name, profile_name", [
+    ("Michael Smith", "Michelle Smith"),
+    ("Patricia Lee", "Patrick Lee"),
+    ("Alexander Kim", "Alexandra Kim"),
+    ("Martin Lopez", "Morton Lopez"),
+    ("Jean Smith", "John Smith"),
+])
+def test_similar_sounding_first_names_do_not_match(search_name, profile_name):
+    assert NameMatcher(search_name).score(profile_name) == NO_MATCH
+
+
+@pytest.mark.parametrize("search_name", ["", "   ", "--", "🚀"])
+def test_blank_names_match_nothing(search_name):
+    matcher = NameMatcher(search_name)
+    assert matcher.score("John Smith") == NO_MATCH
+    assert NameMatcher("John Smith").score(search_name) == NO_MATCH
+
+
+def test_score_all_keeps_order():
+    assert NameMatcher("Jane Doe").score_all(["Mary Major", "Jane Doe", "Jane Roe"]) == \
+        [NO_MATCH, EXACT_MATCH, FIRST_NAME_MATCH]
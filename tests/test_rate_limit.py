@@ -0,0 +1,42 @@
+import random
+
+from clock import VirtualClock
+from rate_limit import DEFAULT_JITTER_SECONDS, TOTAL_BUDGET, RateLimitScheduler
+
+
+def page_load_times(scheduler, clock, kinds):
+    times = []
+    for kind in kinds:
+        scheduler.acquire(kind)
+        times.append(clock.time())
+    return times
+
+
+def test_default_budgets_keep_the_original_gap():
+    clock = VirtualClock()
+    scheduler = RateLimitScheduler.from_budgets(clock=clock)
+    scheduler.rng = random.Random(7)
+    times = page_load_times(scheduler, clock, ["search", "profile"] * 100)
+
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    # Searches and profile views share one 18-25s gap, as before the per-kind budgets
+    assert min(gaps) >= 18 - 0.5
+    assert max(gaps) <= 18 + DEFAULT_JITTER_SECONDS + 0.5
+    assert len(set(round(gap) for gap in gaps)) > 1
+    assert len(times) / ((times[-1] - times[0]) / 3600) <= 200
+
+
+def test_combined_budget_can_be_disabled():
+    clock = VirtualClock()
+    scheduler = RateLimitScheduler.from_budgets(360, 360, clock=clock, page_loads_per_hour=None, jitter=0)
+    assert TOTAL_BUDGET not in scheduler.limiters
+    times = page_load_times(scheduler, clock, ["search", "profile"] * 10)
+    # Each kind has its own 10s pace, so the two interleave freely
+    assert times[-1] - times[0] < 10 * 10 + 1
+
+
+def test_plan_accounts_for_combined_budget_and_jitter():
+    scheduler = RateLimitScheduler.from_budgets(clock=VirtualClock())
+    estimate = scheduler.plan(100, profile_views=100, seconds_per_page=0)
+    assert estimate["bottleneck"] == TOTAL_BUDGET
+    assert estimate["seconds"] >= 199 * 18 + 200 * DEFAULT_JITTER_SECONDS / 2
@@ -0,0 +1,49 @@
+import time
+
+from linkedin_browser import DEFAULT_READINESS_TIMEOUT, PROFILE_COMPANY_SELECTOR, PROFILE_TITLE_SELECTOR, PageReadiness
+
+
+class Element:
+    def __init__(self, text: str = ""):
+        self.text = text
+
+
+class StaticDriver:
+    """Driver stand-in whose page holds a fixed set of elements per selector."""
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def find_elements(self, by, selector):
+        return self.elements.get(selector, [])
+
+
+def test_readiness_cap_is_short():
+    assert PageReadiness(StaticDriver({})).timeout == DEFAULT_READINESS_TIMEOUT <= 3
+
+
+def test_profile_with_empty_headline_is_ready_at_once():
+    driver = StaticDriver({PROFILE_TITLE_SELECTOR: [Element("")], PROFILE_COMPANY_SELECTOR: [Element("")]})
+    readiness = PageReadiness(driver, poll_interval=0.01)
+    start_time = time.perf_counter()
+    assert readiness.wait("profile_top_card", PageReadiness.profile_ready)
+    assert time.perf_counter() - start_time < 0.5
+
+
+def test_profile_waits_for_top_card():
+    assert not PageReadiness.profile_ready(StaticDriver({}))
+    assert PageReadiness.profile_ready(StaticDriver({PROFILE_TITLE_SELECTOR: [Element("Engineer at Acme")]}))
+
+
+def test_search_results_settle_after_stable_count():
+    driver = StaticDriver({".entity-result__item": [Element(), Element()]})
+    readiness = PageReadiness(driver, poll_interval=0.01)
+    assert readiness.wait("search_results", readiness.search_results_ready())
+    assert readiness.summary()["search_results"]["count"] == 1
+
+
+def test_unrecognized_empty_page_gives_up_after_the_cap():
+    readiness = PageReadiness(StaticDriver({}), timeout=0.2, poll_interval=0.01)
+    start_time = time.perf_counter()
+    assert not readiness.wait("search_results", readiness.search_results_ready())
+    assert time.perf_counter() - start_time < 1
@@ -0,0 +1,135 @@
+import csv
+
+import pytest
+
+from checkpoint import ResumeCheckpoint
+from matcher_io import OUTPUT_COLUMNS, ResultWriter, initialize_output_file
+import rescore
+from rescore import rescore_results_file
+from scoring import score_row
+
+NAMES = ["Jane Doe", "John Smith", "Ann Lee", "Mark Brown", "Lisa Wong"]
+
+
+def found_record(index: int) -> dict:
+    name = NAMES[index % len(NAMES)]
+    return {
+        "Email": f"{name.split()[0].lower()}{index}@acme.com",
+        "Name": name,
+        "LinkedIn_URL": f"https://www.linkedin.com/in/profile-{index}/",
+        "LinkedIn_Name": name,
+        "Job_Title": "Engineer at Acme",
+        "Company": "Acme",
+        "Confidence_Level": "NO",
+        "Status": "Found"
+    }
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+def test_resume_after_in_place_rescore(tmp_path):
+    input_file = tmp_path / "input.csv"
+    input_file.write_text("Email,Name,Company\n" + "".join(
+        f"{record['Email']},{record['Name']},Acme\n" for record in map(found_record, range(8))))
+    output_file = tmp_path / "results.csv"
+    initialize_output_file(str(output_file))
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    with ResultWriter(str(output_file), checkpoint=checkpoint) as writer:
+        for index in range(5):
+            writer.write(found_record(index), input_offset=200 + index, row_number=index + 2)
+    checkpoint.close()
+
+    stats = rescore_results_file(str(output_file), workers=1, company_index_file=None)
+    assert stats["changed"] == 5
+    rescored = output_file.read_bytes()
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    try:
+        # The rescored rows stay intact and the input position survives
+        assert output_file.read_bytes() == rescored
+        assert (checkpoint.input_offset, checkpoint.row_number) == (204, 6)
+        assert found_record(4)["Email"] in checkpoint
+    finally:
+        checkpoint.close()
+    assert all(row["Confidence_Level"] != "NO" for row in read_rows(output_file))
+
+
+def test_rescore_with_uncommitted_rows_drops_checkpoint(tmp_path):
+    input_file = tmp_path / "input.csv"
+    input_file.write_text("Email,Name,Company\n")
+    output_file = tmp_path / "results.csv"
+    initialize_output_file(str(output_file))
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    with ResultWriter(str(output_file), checkpoint=checkpoint) as writer:
+        writer.write(found_record(0), input_offset=50, row_number=2)
+    checkpoint.close()
+    with open(output_file, 'a', newline='', encoding='utf-8') as file:
+        csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS).writerow(found_record(1))
+
+    rescore_results_file(str(output_file), workers=1, company_index_file=None)
+    assert not (tmp_path / "results.csv.ckpt").exists()
+
+    checkpoint = ResumeCheckpoint(str(output_file), str(input_file))
+    try:
+        # Rebuilt from the rescored file: both rows count as processed
+        assert checkpoint.processed_count() == 2
+        assert len(read_rows(output_file)) == 2
+    finally:
+        checkpoint.close()
+
+
+def test_parallel_rescore_matches_row_by_row_scoring(tmp_path):
+    results_file = tmp_path / "results.csv"
+    records = []
+    for index in range(60):
+        record = found_record(index)
+        if index % 3 == 0:
+            record["LinkedIn_Name"] = "Someone Else"
+        if index % 4 == 0:
+            record["Company"] = "Globex"
+        if index % 5 == 0:
+            record["Status"] = "Not Found"
+        records.append(record)
+    with open(results_file, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(records)
+
+    serial_file = tmp_path / "serial.csv"
+    parallel_file = tmp_path / "parallel.csv"
+    serial = rescore_results_file(str(results_file), str(serial_file), workers=1, company_index_file=None)
+    parallel = rescore_results_file(str(results_file), str(parallel_file), workers=2, chunk_size=7,
+                                    company_index_file=None)
+
+    assert serial == parallel
+    assert serial_file.read_bytes() == parallel_file.read_bytes()
+    assert [row["Confidence_Level"] for row in read_rows(parallel_file)] == [score_row(record) for record in records]
+    assert len({row["Confidence_Level"] for row in read_rows(parallel_file)}) > 1
+
+
+def test_failed_rescore_leaves_no_temp_file(tmp_path, monkeypatch):
+    bad_file = tmp_path / "bad.csv"
+    bad_file.write_text("Email,Name\nann@acme.com,Ann Lee\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        rescore_results_file(str(bad_file), workers=1, company_index_file=None)
+    assert not (tmp_path / "bad.csv.rescore.tmp").exists()
+
+    results_file = tmp_path / "results.csv"
+    with open(results_file, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=OUTPUT_COLUMNS)
+        writer.writeheader()
+        writer.writerow(found_record(0))
+    original = results_file.read_bytes()
+
+    def interrupted(rows):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(rescore, "score_batch", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        rescore_results_file(str(results_file), workers=1, company_index_file=None)
+    assert not (tmp_path / "results.csv.rescore.tmp").exists()
+    assert results_file.read_bytes() == original
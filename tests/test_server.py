@@ -0,0 +1,46 @@
+import pytest
+
+import server
+from jobs import JobManager
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / server.INPUT_DIR).mkdir()
+    monkeypatch.setattr(server, "job_manager", JobManager(jobs_dir=str(tmp_path / "jobs"), workers=0))
+    return server.app.test_client()
+
+
+@pytest.mark.parametrize("input_file", ["/etc/hostname", "../input_emails.csv", "inputs/../../secret.csv"])
+def test_create_job_refuses_paths_outside_input_dir(client, input_file):
+    response = client.post("/api/jobs", json={"input_file": input_file})
+    assert response.status_code == 400
+    assert server.job_manager.list() == []
+
+
+def test_create_job_validates_the_header(client, tmp_path):
+    (tmp_path / server.INPUT_DIR / "names.csv").write_text("Name\nAnn Lee\n")
+    response = client.post("/api/jobs", json={"input_file": "names.csv"})
+    assert response.status_code == 400
+    assert "Email" in response.get_json()["error"]
+    assert server.job_manager.list() == []
+
+
+def test_create_job_from_input_dir(client, tmp_path):
+    (tmp_path / server.INPUT_DIR / "leads.csv").write_text("Email,Name\nann@acme.com,Ann Lee\n")
+    response = client.post("/api/jobs", json={"input_file": "leads.csv"})
+    assert response.status_code == 202
+    assert response.get_json()["status"] == "queued"
+
+
+def test_default_input_file(client, tmp_path):
+    assert client.post("/api/jobs", json={}).status_code == 400
+    (tmp_path / server.INPUT_FILE).write_text("Email,Name\nann@acme.com,Ann Lee\n")
+    assert client.post("/api/jobs", json={}).status_code == 202
+
+
+def test_pagination_headers_are_exposed(client):
+    response = client.get("/api/jobs", headers={"Origin": "http://localhost:5173"})
+    exposed = response.headers["Access-Control-Expose-Headers"]
+    assert "X-Total-Count" in exposed and "ETag" in exposed
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Spans kept in memory before further spans are dropped (about 200 bytes each)
+DEFAULT_MAX_SPANS = 1_000_000
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attributes", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict):
+        """
+        One timed operation; use as a context manager via Tracer.span.
+
+        Args:
+            tracer: Tracer the span is recorded in when it ends
+            name: Operation name
+            attributes: Initial attributes
+        """
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.start = 0.0
+
+    def set(self, **attributes):
+        """Add attributes, e.g. results known only once the operation ran."""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.start = self.tracer.time_source()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.tracer.record(self, self.tracer.time_source())
+        return False
+
+
+class NullSpan:
+    """Span that records nothing; shared by every call when tracing is off."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class NullTracer:
+    """Tracer used when tracing is off: span() returns a shared no-op span."""
+
+    enabled = False
+
+    def span(self, name: str, **attributes) -> NullSpan:
+        return NULL_SPAN
+
+    def export(self, file_path: str):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    enabled = True
+
+    def __init__(self, time_source: Callable[[], float] = time.perf_counter, max_spans: int = DEFAULT_MAX_SPANS):
+        """
+        Record nested spans and export them as a Chrome trace.
+
+        Nesting follows from timing: a span that starts and ends inside
+        another on the same thread is drawn beneath it by chrome://tracing
+        and Perfetto, so no parent bookkeeping is needed.
+
+        Args:
+            time_source: Seconds clock; pass a virtual clock's time() so
+                skipped rate-limit waits keep their length in the trace
+            max_spans: Spans kept before further spans are dropped
+        """
+        self.time_source = time_source
+        self.max_spans = max_spans
+        self.origin = time_source()
+        self.events: List[Dict] = []
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def span(self, name: str, **attributes) -> Span:
+        """
+        Start a span.
+
+        Args:
+            name: Operation name
+            **attributes: JSON-serializable attributes shown with the span
+
+        Returns:
+            Context manager timing the with-block
+        """
+        return Span(self, name, attributes)
+
+    def record(self, span: Span, end: float):
+        """Store a finished span as a complete ("X") trace event."""
+        event = {
+            "name": span.name,
+            "cat": "matcher",
+            "ph": "X",
+            "ts": round((span.start - self.origin) * 1e6, 1),
+            "dur": round((end - span.start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": span.attributes
+        }
+        with self.lock:
+            if len(self.events) < self.max_spans:
+                self.events.append(event)
+            else:
+                self.dropped += 1
+
+    def export(self, file_path: str):
+        """
+        Write the recorded spans as Chrome trace JSON, loadable in
+        chrome://tracing or ui.perfetto.dev.
+
+        Args:
+            file_path: Path of the trace file to write
+        """
+        with self.lock:
+            events = list(self.events)
+            dropped = self.dropped
+        metadata = {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "linkedin_matcher"}}
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                "traceEvents": [metadata] + events,
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_spans": dropped}
+            }, file)
+
+
+def make_tracer(enabled: bool, time_source: Optional[Callable[[], float]] = None):
+    """
+    Return a recording tracer, or the shared no-op tracer when disabled.
+
+    Args:
+        enabled: Whether to record spans
+        time_source: Seconds clock for a recording tracer (perf_counter by default)
+    """
+    if not enabled:
+        return NULL_TRACER
+    return Tracer(time_source or time.perf_counter)